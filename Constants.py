@@ -12,4 +12,8 @@ FAILURE_COLOR = "\033[91m"
 RESET_COLOR = "\x1b[0m"
 
 # constant for links to the paper
-arxive_link = "https://doi.org/10.48550/arXiv.2505.23233"
\ No newline at end of file
+arxive_link = "https://doi.org/10.48550/arXiv.2505.23233"
+
+# constants for the artificial start and end nodes of directly follows relations
+start_marker = "▷"
+end_marker = "□"
@@ -0,0 +1,27 @@
+import sys # for the table of imported modules
+import importlib.util # for loading modules when they are used for the first time
+
+
+def lazy_module(name: str):
+    """
+    Returns a module that is only imported when one of its attributes is accessed for the first time. Libraries like
+    pm4py, pandas, or networkx take a long time to import, so importing them lazily lets the program greet the user
+    without waiting for libraries that the chosen mode might not need.
+    :param name: the name of the module, for example "networkx"
+    :return: the module, which is imported on first use
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError("No module named '" + name + "'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    if "." in name:
+        # make the module available as an attribute of its package, like a regular import does
+        package_name, _, module_name = name.rpartition(".")
+        setattr(sys.modules[package_name], module_name, module)
+    return module
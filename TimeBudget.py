@@ -0,0 +1,94 @@
+import time # for measuring the time of measures on platforms without timer signals
+import signal # for interrupting measures that exceed their budget
+import threading # for checking whether signals can be handled
+
+
+class TimedOut:
+    """
+    The result of a complexity measure whose calculation exceeded its time budget. If the measure reported bounds
+    while it was running, like the longest path found so far, these bounds are kept. Relation tables treat timed out
+    results like None, i.e., as if the measure was not evaluated.
+    """
+    def __init__(self, measure_name: str, time_limit: float, lower_bound=None, upper_bound=None):
+        """
+        Creates the result of a measure that timed out.
+        :param measure_name: the abbreviation of the measure
+        :param time_limit: the budget of the measure in seconds
+        :param lower_bound: the best lower bound of the score found before the budget was exceeded, or None
+        :param upper_bound: the best upper bound of the score found before the budget was exceeded, or None
+        """
+        self.measure_name = measure_name
+        self.time_limit = time_limit
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+
+    def __str__(self):
+        bounds = ""
+        if self.lower_bound is not None or self.upper_bound is not None:
+            bounds = " (between " + str(self.lower_bound) + " and " + str(self.upper_bound) + ")"
+        return "timed out after " + str(self.time_limit) + "s" + bounds
+
+    def __repr__(self):
+        return "TimedOut(" + repr(self.measure_name) + ", " + repr(self.time_limit) + ", " + repr(self.lower_bound) + ", " + repr(self.upper_bound) + ")"
+
+class BudgetExceeded(Exception):
+    pass
+
+
+# the bounds reported by the measure that is currently calculated within a budget
+reported_bounds = (None, None)
+# the time at which the budget of the current measure is exceeded, if it cannot be interrupted by a signal
+deadline = None
+
+
+def raise_budget_exceeded(signal_number, frame):
+    raise BudgetExceeded()
+
+def report_bounds(lower_bound=None, upper_bound=None):
+    """
+    Reports the best bounds of its score that a measure found so far, such that they can be returned if the measure
+    exceeds its budget. Measures that enumerate paths or cycles should call this function regularly, since it also
+    checks the budget if the measure cannot be interrupted by a signal.
+    :param lower_bound: a value that the score is known to be at least, or None
+    :param upper_bound: a value that the score is known to be at most, or None
+    :return: None
+    """
+    global reported_bounds
+    reported_bounds = (lower_bound, upper_bound)
+    if deadline is not None and time.monotonic() > deadline:
+        raise BudgetExceeded()
+
+def calculate_within_budget(measure_name: str, calculate, time_limit=None):
+    """
+    Calculates a complexity score, but stops the calculation once it used more than the passed CPU time. On Unix, the
+    calculation is interrupted by a timer signal in the main thread; otherwise, the budget is only checked whenever
+    the measure reports its bounds.
+    :param measure_name: the abbreviation of the measure
+    :param calculate: a function without arguments that returns the score
+    :param time_limit: the budget in seconds, or None if the calculation may take arbitrarily long
+    :return: the score, or a TimedOut result if the budget was exceeded
+    """
+    global reported_bounds, deadline
+    if time_limit is None:
+        return calculate()
+    reported_bounds = (None, None)
+    use_signal = hasattr(signal, "SIGPROF") and threading.current_thread() is threading.main_thread()
+    if use_signal:
+        # the profiling timer counts the CPU time of this process, and does not interfere with alarms
+        previous_handler = signal.signal(signal.SIGPROF, raise_budget_exceeded)
+        signal.setitimer(signal.ITIMER_PROF, time_limit)
+    else:
+        deadline = time.monotonic() + time_limit
+    try:
+        try:
+            return calculate()
+        finally:
+            # stop the timer first, such that the signal cannot arrive after the budget was caught
+            if use_signal:
+                signal.setitimer(signal.ITIMER_PROF, 0)
+            deadline = None
+    except BudgetExceeded:
+        return TimedOut(measure_name, time_limit, reported_bounds[0], reported_bounds[1])
+    finally:
+        if use_signal:
+            signal.signal(signal.SIGPROF, previous_handler)
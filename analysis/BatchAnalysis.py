@@ -0,0 +1,332 @@
+import os # for finding the event logs in a folder
+import csv # for writing the summary of a batch as a table
+import glob # for finding the event logs matching a pattern
+import json # for writing the summary of a batch
+import time # for measuring how long each analysis takes
+import signal # for stopping analyses that exceed their time limit
+import multiprocessing # for spawning the processes of a batch
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED # for analyzing several event logs at the same time
+from concurrent.futures.process import BrokenProcessPool # for noticing processes that were killed
+from tqdm import tqdm # for showing a progress bar
+
+import Constants # (internal) for the path of the output folder
+from logcomplexity import LogComplexityMeasures # (internal) for looking up log complexity measures by their abbreviation
+from modelcomplexity import ModelComplexityMeasures # (internal) for looking up model complexity measures by their abbreviation
+from discovery import DiscoveryAlgorithms # (internal) for looking up discovery algorithms by their abbreviation
+from logcomplexity import LogCache # (internal) for importing event logs without parsing them again
+from analysis import RealLiveLogs # (internal) for finding the relations in the event log
+from analysis import Checkpoint # (internal) for resuming analyses that were interrupted
+
+# the file extensions of event logs that are picked up when a folder is analyzed
+EVENT_LOG_EXTENSIONS = [".xes", ".xes.gz"]
+# the path of the summary of a batch, to which .json and .csv are appended
+SUMMARY_PATH = Constants.OUTPUT_PATH + "batch-summary"
+# how often an event log is analyzed again after its process was killed, before it is reported as killed
+RETRIES_OF_KILLED_PROCESSES = 1
+
+
+def miner_of(miner):
+    """
+    Returns the discovery algorithm with the passed abbreviation, like "alpha" or "dfg".
+    :param miner: the abbreviation of the discovery algorithm, or the discovery algorithm itself
+    :return: the discovery algorithm
+    """
+    if type(miner) != str:
+        return miner
+    for discovery_algorithm in DiscoveryAlgorithms.all_discovery_algorithms:
+        if discovery_algorithm.abbreviation == miner:
+            return discovery_algorithm
+    known_miners = ", ".join(discovery_algorithm.abbreviation for discovery_algorithm in DiscoveryAlgorithms.all_discovery_algorithms)
+    raise ValueError("Unknown discovery algorithm '" + miner + "', choose one of: " + known_miners)
+
+def model_measures_for(miner):
+    # only some model complexity measures are defined for directly follows graphs
+    if type(miner) == DiscoveryAlgorithms.DirectlyFollowsGraphMiner:
+        return ModelComplexityMeasures.dfg_model_complexity_measures
+    return ModelComplexityMeasures.all_model_complexity_measures
+
+def measures_of(measures, available_measures: list, kind: str):
+    """
+    Returns the complexity measures with the passed abbreviations, like "mag" or "CFC".
+    :param measures: a list of abbreviations or complexity measures, or None for all available measures
+    :param available_measures: the complexity measures that can be chosen
+    :param kind: "log" or "model", for the error message
+    :return: the list of complexity measures, in the passed order
+    """
+    if measures is None:
+        return list(available_measures)
+    measures_by_abbreviation = {measure.abbreviation: measure for measure in available_measures}
+    chosen_measures = []
+    for measure in measures:
+        if type(measure) != str:
+            chosen_measures += [measure]
+        elif measure in measures_by_abbreviation:
+            chosen_measures += [measures_by_abbreviation[measure]]
+        else:
+            raise ValueError("Unknown " + kind + " complexity measure '" + measure + "', choose from: " + ", ".join(measures_by_abbreviation.keys()))
+    if len(chosen_measures) == 0:
+        raise ValueError("At least one " + kind + " complexity measure must be chosen.")
+    return chosen_measures
+
+def model_measures_of(model_measures, miner):
+    """
+    Returns the model complexity measures that are analyzed for the models of the passed discovery algorithm. If the
+    measures were chosen explicitly, measures that are not defined for the models of the miner are left out.
+    :param model_measures: a list of abbreviations or model complexity measures, or None for all available measures
+    :param miner: the discovery algorithm
+    :return: the list of model complexity measures
+    """
+    if model_measures is None:
+        return list(model_measures_for(miner))
+    chosen_measures = measures_of(model_measures, ModelComplexityMeasures.all_model_complexity_measures, "model")
+    available_abbreviations = [measure.abbreviation for measure in model_measures_for(miner)]
+    return [measure for measure in chosen_measures if measure.abbreviation in available_abbreviations]
+
+def event_log_files(patterns: list):
+    """
+    Returns the event logs in the passed folders or matching the passed patterns, each of them once.
+    :param patterns: a list of folders (whose .xes- and .xes.gz-files are analyzed), files, or patterns like "logs/*.xes"
+    :return: the list of file-paths
+    """
+    filenames = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [os.path.join(pattern, filename) for filename in os.listdir(pattern)
+                       if any(filename.endswith(extension) for extension in EVENT_LOG_EXTENSIONS)]
+        else:
+            matches = glob.glob(pattern)
+        for filename in sorted(matches):
+            if os.path.isfile(filename) and filename not in filenames:
+                filenames += [filename]
+    return filenames
+
+def import_event_log(filename: str, threshold=None):
+    """
+    Imports the traces of an event log that are needed to analyze the passed number of prefixes.
+    :param filename: the file-path to the .xes-file
+    :param threshold: the number of prefixes that should be compared, or None to include all traces
+    :return: the ColumnarLog of the event log, and the number of prefixes that can be compared
+    """
+    if threshold is not None and threshold < 1:
+        raise ValueError("The threshold must be greater than 0.")
+    # the last step compares the prefix of the threshold to the prefix with one more trace
+    maximum_number_of_traces = None if threshold is None else threshold + 1
+    columnar_log = LogCache.import_cached_columnar_log(filename, maximum_number_of_traces)
+    if threshold is None:
+        return columnar_log, len(columnar_log)
+    return columnar_log, min(threshold, len(columnar_log))
+
+def relations_of(columnar_log, threshold: int, miners: list, log_measures: list, model_measures: list, workers=1, stop_when_saturated=False, show_progress=False, resume=False, measure_time_limit=None):
+    # all miners are analyzed in a single pass, where model_measures contains the model complexity measures of each miner
+    found_relations = RealLiveLogs.create_relation_tables(log_measures, model_measures)
+    skipped_evaluations = 0
+    if len(columnar_log) > 0:
+        # the progress is stored in a checkpoint, such that analyses that were stopped can be resumed
+        checkpoint_filename = Checkpoint.checkpoint_path_for(columnar_log, threshold, log_measures, model_measures, miners, workers > 1, measure_time_limit)
+        skipped_evaluations = RealLiveLogs.find_relations(found_relations, columnar_log, threshold, log_measures, model_measures, miners, workers, stop_when_saturated, show_progress, checkpoint_filename, resume, measure_time_limit)
+    return found_relations, skipped_evaluations
+
+def analyze_event_log(filename: str, miner, log_measures=None, model_measures=None, threshold=None, workers=1, stop_when_saturated=False, show_progress=False, resume=False, measure_time_limit=None):
+    """
+    Finds the relations between log and model complexity in an event log without asking any questions, such that
+    analyses can be run from scripts. This is the same analysis as the one of the option "Check what relations can
+    be found in my event log" in main.py.
+    :param filename: the file-path to the .xes-file
+    :param miner: the abbreviation of the discovery algorithm (for example "alpha"), or the discovery algorithm itself
+    :param log_measures: the abbreviations of the log complexity measures (for example ["mag", "var"]), or None for all
+    :param model_measures: the abbreviations of the model complexity measures (for example ["size", "CFC"]), or None
+                           for all measures that are defined for the models of the discovery algorithm
+    :param threshold: the number of prefixes that should be compared, or None to include all traces
+    :param workers: the number of processes
+    :param stop_when_saturated: a boolean indicating whether the analysis stops as soon as the table only contains X
+    :param show_progress: a boolean indicating whether a progress bar should be shown
+    :param resume: a boolean indicating whether the analysis continues from the checkpoint of the same analysis
+    :param measure_time_limit: the CPU time in seconds each measure may take for a prefix, or None
+    :return: a dictionary containing the settings of the analysis and the relation table (see RelationTable.to_dict)
+    """
+    miner = miner_of(miner)
+    log_measures = measures_of(log_measures, LogComplexityMeasures.all_log_complexity_measures, "log")
+    model_measures = measures_of(model_measures, model_measures_for(miner), "model")
+    columnar_log, threshold = import_event_log(filename, threshold)
+    found_relations, skipped_evaluations = relations_of(columnar_log, threshold, [miner], log_measures, [model_measures], workers, stop_when_saturated, show_progress, resume, measure_time_limit)
+    return {"log": filename,
+            "miner": miner.abbreviation,
+            "number of traces": len(columnar_log),
+            "threshold": threshold,
+            "skipped evaluations": skipped_evaluations,
+            "relation table": found_relations[0].to_dict()}
+
+def raise_timeout(signal_number, frame):
+    raise TimeoutError()
+
+def limit_resources(memory_limit=None, time_limit=None):
+    """
+    Limits the memory and the time available to the current process. Since the limits cannot be lifted afterwards,
+    this is only called in processes that analyze a single event log.
+    :param memory_limit: the maximum size of the address space in megabytes, or None
+    :param time_limit: the maximum time in seconds, after which a TimeoutError is raised, or None
+    :return: None
+    """
+    if memory_limit is not None:
+        import resource # only available on Unix
+        _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit * 1024 * 1024, hard_limit))
+    if time_limit is not None:
+        signal.signal(signal.SIGALRM, raise_timeout)
+        signal.alarm(time_limit)
+
+def analyze_event_log_within_limits(filename: str, miners: list, log_measures: list, model_measures, threshold=None, stop_when_saturated=False, memory_limit=None, time_limit=None, resume=False, measure_time_limit=None):
+    """
+    Imports an event log once and finds the relations between log and model complexity for all miners in a single
+    pass, such that the log complexity scores of each prefix are calculated once. Analyses that exceed the memory or time limit, or fail otherwise, are reported in the result instead of raising.
+    :param filename: the file-path to the .xes-file
+    :param miners: the discovery algorithms
+    :param log_measures: the log complexity measures
+    :param model_measures: the abbreviations of the model complexity measures, or None for all measures of each miner
+    :param threshold: the number of prefixes that should be compared, or None to include all traces
+    :param stop_when_saturated: a boolean indicating whether the analysis stops as soon as the table only contains X
+    :param memory_limit: the maximum size of the address space of the process in megabytes, or None
+    :param time_limit: the maximum time in seconds for the event log and all of its miners, or None
+    :param resume: a boolean indicating whether the analysis continues from its checkpoint, for example after it
+                   exceeded the time limit before
+    :param measure_time_limit: the CPU time in seconds each measure may take for a prefix, or None
+    :return: a dictionary containing the status, the timings, and the relation table of each miner
+    """
+    start_time = time.perf_counter()
+    result = {"log": filename, "status": "done", "number of traces": None, "threshold": None,
+              "import seconds": None, "seconds": None, "skipped evaluations": None, "analyses": []}
+    try:
+        limit_resources(memory_limit, time_limit)
+        columnar_log, threshold = import_event_log(filename, threshold)
+        result["number of traces"] = len(columnar_log)
+        result["threshold"] = threshold
+        result["import seconds"] = time.perf_counter() - start_time
+        model_measures = [model_measures_of(model_measures, miner) for miner in miners]
+        found_relations, skipped_evaluations = relations_of(columnar_log, threshold, miners, log_measures, model_measures, stop_when_saturated=stop_when_saturated, resume=resume, measure_time_limit=measure_time_limit)
+        result["skipped evaluations"] = skipped_evaluations
+        result["analyses"] = [{"miner": miner.abbreviation, "relation table": relation_table.to_dict()}
+                              for miner, relation_table in zip(miners, found_relations)]
+    except TimeoutError:
+        result["status"] = "time limit exceeded"
+    except MemoryError:
+        result["status"] = "memory limit exceeded"
+    except Exception as error:
+        result["status"] = "failed: " + type(error).__name__ + ": " + str(error)
+    finally:
+        if time_limit is not None:
+            signal.alarm(0)
+    result["seconds"] = time.perf_counter() - start_time
+    return result
+
+def run_in_separate_processes(job, arguments_of: dict, workers: int, show_progress=False, description=None):
+    """
+    Calls a job once for each key in a fresh process, where at most the passed number of processes run at the same
+    time. Each call gets a process pool of its own, since a pool whose process is killed fails all calls it still has,
+    so that a killed process only affects its own call. A call whose process was killed is made again, and only if
+    its process is killed again (see RETRIES_OF_KILLED_PROCESSES), its result is None. The processes are spawned,
+    which means that they import the modules instead of copying the memory of this process.
+    :param job: a function at the top level of a module, such that it can be called in other processes
+    :param arguments_of: a dictionary mapping each key to the tuple of arguments of its call
+    :param workers: the maximum number of processes at the same time
+    :param show_progress: a boolean indicating whether a progress bar should be shown
+    :param description: the description shown next to the progress bar
+    :return: a dictionary mapping each key to the result of its call, or to None if its process was killed
+    """
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    waiting = list(arguments_of.keys())
+    kills = {key: 0 for key in waiting}
+    running = {}
+    progress_bar = tqdm(total=len(waiting), desc=description, disable=not show_progress)
+    try:
+        while len(waiting) > 0 or len(running) > 0:
+            while len(waiting) > 0 and len(running) < workers:
+                key = waiting.pop(0)
+                executor = ProcessPoolExecutor(max_workers=1, mp_context=context)
+                running[executor.submit(job, *arguments_of[key])] = (key, executor)
+            finished_futures, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished_futures:
+                key, executor = running.pop(future)
+                executor.shutdown()
+                try:
+                    results[key] = future.result()
+                except BrokenProcessPool:
+                    # the process was killed, for example by the operating system because it ran out of memory
+                    kills[key] += 1
+                    if kills[key] <= RETRIES_OF_KILLED_PROCESSES:
+                        waiting.append(key)
+                        continue
+                    results[key] = None
+                progress_bar.update()
+    finally:
+        for key, executor in running.values():
+            executor.shutdown(cancel_futures=True)
+        progress_bar.close()
+    return results
+
+def analyze_event_logs(filenames: list, miners: list, log_measures=None, model_measures=None, threshold=None, log_workers=1, stop_when_saturated=False, memory_limit=None, time_limit=None, show_progress=True, resume=False, measure_time_limit=None):
+    """
+    Analyzes many event logs, where each event log is analyzed by a fresh process, such that the memory and time limits
+    apply to each event log separately, and a process that is killed only affects its own event log. The prefixes of
+    each event log are analyzed one after the other by its process.
+    :param filenames: the file-paths to the .xes-files
+    :param miners: the abbreviations of the discovery algorithms, or the discovery algorithms themselves
+    :param log_measures: the abbreviations of the log complexity measures, or None for all
+    :param model_measures: the abbreviations of the model complexity measures, or None for all measures of each miner
+    :param threshold: the number of prefixes that should be compared in each event log, or None to include all traces
+    :param log_workers: the number of event logs that are analyzed at the same time
+    :param stop_when_saturated: a boolean indicating whether the analysis stops as soon as the table only contains X
+    :param memory_limit: the maximum size of the address space of each process in megabytes, or None
+    :param time_limit: the maximum time in seconds for each event log, or None
+    :param show_progress: a boolean indicating whether a progress bar should be shown
+    :param resume: a boolean indicating whether the analyses continue from their checkpoints, if there are any
+    :param measure_time_limit: the CPU time in seconds each measure may take for a prefix, or None
+    :return: a list containing the result of each event log (see analyze_event_log_within_limits), in the passed order
+    """
+    miners = [miner_of(miner) for miner in miners]
+    log_measures = measures_of(log_measures, LogComplexityMeasures.all_log_complexity_measures, "log")
+    if model_measures is not None:
+        # check the abbreviations before any process is started
+        measures_of(model_measures, ModelComplexityMeasures.all_model_complexity_measures, "model")
+    arguments_of = {filename: (filename, miners, log_measures, model_measures, threshold, stop_when_saturated,
+                               memory_limit, time_limit, resume, measure_time_limit)
+                    for filename in filenames}
+    results = run_in_separate_processes(analyze_event_log_within_limits, arguments_of, log_workers, show_progress, "analyzing event logs")
+    for filename in filenames:
+        if results[filename] is None:
+            results[filename] = {"log": filename, "status": "process was killed", "number of traces": None,
+                                 "threshold": None, "import seconds": None, "seconds": None,
+                                 "skipped evaluations": None, "analyses": []}
+    return [results[filename] for filename in filenames]
+
+def write_summary(results: list, summary_path=SUMMARY_PATH):
+    """
+    Writes the results of a batch to a .json-file and to a .csv-file with one row per event log, miner, log complexity
+    measure and model complexity measure.
+    :param results: the results returned by analyze_event_logs
+    :param summary_path: the path of the summary, to which .json and .csv are appended
+    :return: the file-paths of the .json-file and the .csv-file
+    """
+    directory = os.path.dirname(summary_path)
+    if directory != "":
+        os.makedirs(directory, exist_ok=True)
+    json_filename = summary_path + ".json"
+    with open(json_filename, "w") as json_file:
+        json.dump(results, json_file, indent=2, ensure_ascii=False)
+    csv_filename = summary_path + ".csv"
+    with open(csv_filename, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["log", "status", "number of traces", "threshold", "import seconds", "seconds",
+                         "skipped evaluations", "miner", "log measure", "model measure", "relation"])
+        for result in results:
+            log_columns = [result["log"], result["status"], result["number of traces"], result["threshold"],
+                           result["import seconds"], result["seconds"], result["skipped evaluations"]]
+            if len(result["analyses"]) == 0:
+                writer.writerow(log_columns + [None] * 4)
+            for analysis in result["analyses"]:
+                relation_table = analysis["relation table"]
+                for i, log_measure in enumerate(relation_table["log measures"]):
+                    for j, model_measure in enumerate(relation_table["model measures"]):
+                        writer.writerow(log_columns + [analysis["miner"], log_measure, model_measure,
+                                                       relation_table["symbols"][i][j]])
+    return json_filename, csv_filename
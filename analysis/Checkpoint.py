@@ -0,0 +1,63 @@
+import os # for creating the folder of the checkpoints and replacing checkpoints atomically
+import pickle # for storing the state of an analysis
+import hashlib # for naming checkpoints after the analysis they belong to
+
+import numpy # for reading the arrays of columnar logs
+
+import Constants # (internal) for the path of the output folder
+from logcomplexity import ColumnarLog # (internal) for identifying event logs by their integer-encoded events
+
+# the folder in which the checkpoints of running analyses are stored
+CHECKPOINT_PATH = Constants.OUTPUT_PATH + "checkpoints/"
+# the number of seconds between two checkpoints of an analysis running in a single process
+CHECKPOINT_INTERVAL = 60
+
+
+def checkpoint_path_for(event_log, log_threshold: int, log_measures: list, model_measures: list, mining_algorithms: list, parallel: bool, measure_time_limit=None, checkpoint_path=CHECKPOINT_PATH):
+    """
+    Returns the file-path of the checkpoint of an analysis. The file is named after the events of the log and the
+    settings of the analysis, so an analysis only resumes from checkpoints of exactly the same analysis.
+    :param event_log: the event log in pm4py-format, or a ColumnarLog
+    :param log_threshold: the number of steps that should be analyzed
+    :param log_measures: the log complexity measures
+    :param model_measures: a list containing the list of model complexity measures of each miner
+    :param mining_algorithms: the miners used to discover models for the prefixes
+    :param parallel: a boolean indicating whether the analysis uses a pool of processes, whose checkpoints differ
+    :param measure_time_limit: the CPU time in seconds each measure may take for a prefix, or None, since the limit
+                               decides which evaluations are skipped
+    :param checkpoint_path: the folder containing the checkpoints
+    :return: the file-path of the checkpoint
+    """
+    columnar_log = ColumnarLog.columnar_log_of(event_log)
+    settings_hash = hashlib.blake2b(digest_size=16)
+    settings_hash.update(numpy.ascontiguousarray(columnar_log.activities).tobytes())
+    settings_hash.update(numpy.ascontiguousarray(columnar_log.offsets).tobytes())
+    settings = [columnar_log.activity_names, log_threshold, parallel, measure_time_limit,
+                [measure.abbreviation for measure in log_measures],
+                [[measure.abbreviation for measure in measures] for measures in model_measures],
+                [str(mining_algorithm) for mining_algorithm in mining_algorithms]]
+    settings_hash.update(repr(settings).encode())
+    return os.path.join(checkpoint_path, settings_hash.hexdigest() + ".pkl")
+
+def save_checkpoint(filename: str, state: dict):
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    # write the checkpoint under a temporary name first, such that an interruption never leaves a broken checkpoint
+    temporary_filename = filename + "." + str(os.getpid()) + ".tmp"
+    with open(temporary_filename, "wb") as checkpoint_file:
+        pickle.dump(state, checkpoint_file)
+    os.replace(temporary_filename, filename)
+
+def load_checkpoint(filename: str):
+    """
+    Loads the state of an analysis from its checkpoint.
+    :param filename: the file-path of the checkpoint
+    :return: the state stored by save_checkpoint, or None if there is no checkpoint
+    """
+    if filename is None or not os.path.exists(filename):
+        return None
+    with open(filename, "rb") as checkpoint_file:
+        return pickle.load(checkpoint_file)
+
+def remove_checkpoint(filename: str):
+    if filename is not None and os.path.exists(filename):
+        os.remove(filename)
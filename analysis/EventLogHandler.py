@@ -1,35 +1,40 @@
-import pm4py # for exporting the event log as an .xes file
-import pandas # for internal representations of event logs
-from datetime import datetime # for including artificial timestamps
-from tabulate import tabulate # for pretty printing tables
+import numpy # for building the columns of event logs at once
 
 import Constants # (internal) for color-codes and event log specifier names
-from logcomplexity import Complexity as LogComplexity # (internal) for generating event logs in pm4py format
+import LazyImport # (internal) for importing pm4py and pandas on first use
+from logcomplexity.LogArtifacts import LogArtifacts # (internal) for sharing information about a log between measures
 
+pm4py = LazyImport.lazy_module("pm4py") # for exporting the event log as an .xes file and converting it into pm4py-format
+pandas = LazyImport.lazy_module("pandas") # for internal representations of event logs
+
+# the artificial timestamp of the first event of an event log, where each further event happens one second later
+FIRST_TIMESTAMP = "2000-01-01T00:00:00Z"
 
 def convert_language_to_dataframe(language):
     """
     Converts a list of words into a panda dataframe, adding a timestamp and a case identifier to each letter.
+    The timestamps are deterministic and strictly increasing in the order of the letters.
     :param language: a list of strings
     :return: a panda dataframe resembling an event log for the input language
     """
-    data = []
-    current_case = 1
-    for word in language:
-        for symbol in word:
-            data += [(symbol, datetime.now(), str(current_case))]
-        current_case += 1
-    column_names = [Constants.activity_specifier, Constants.timestamp_specifier, Constants.case_specifier]
-    result = pandas.DataFrame(data, columns=column_names)
-    return result
+    word_lengths = [len(word) for word in language]
+    number_of_events = sum(word_lengths)
+    case_identifiers = numpy.arange(1, len(language) + 1).astype(str)
+    data = {
+        Constants.activity_specifier: list("".join(language)),
+        Constants.timestamp_specifier: pandas.Timestamp(FIRST_TIMESTAMP) + pandas.to_timedelta(numpy.arange(number_of_events), unit="s"),
+        Constants.case_specifier: numpy.repeat(case_identifiers, word_lengths),
+    }
+    return pandas.DataFrame(data)
 
-def import_pm4py_log(filename: str):
+def convert_language_to_event_log(language):
     """
-    Uses the builtin function by Maxim Vidgof to generate an event log in pm4py format.
-    :param filename: the file-path to the .xes-file
-    :return: a panda dataframe containing the information of the .xes-file
+    Converts a list of words into an event log in pm4py-format, without storing it on disk.
+    :param language: a list of strings
+    :return: the event log in pm4py-format
     """
-    return LogComplexity.generate_pm4py_log(filename)
+    dataframe = convert_language_to_dataframe(language)
+    return pm4py.convert_to_event_log(dataframe, case_id_key=Constants.case_specifier)
 
 def print_language(language: list, name="L"):
     """
@@ -57,14 +62,19 @@ def print_language(language: list, name="L"):
             print(", ", end='')
     print("]")
 
-def handle_event_logs(event_logs: list, logname_prefix=""):
+def store_event_logs(pm4py_logs: list, filenames: list):
+    for pm4py_log, filename in zip(pm4py_logs, filenames):
+        pm4py.write_xes(pm4py_log, filename, show_progress_bar=False)
+
+def handle_event_logs(event_logs: list, logname_prefix="", store=True):
     """
     Handles a list of event logs by:
     1. Printing the event logs on the command line,
-    2. Storing the event logs as .xes-files in the output folder,
-    3. Converting them to EventLog format of pm4py.
+    2. Converting them to EventLog format of pm4py,
+    3. Storing the event logs as .xes-files in the output folder.
     :param event_logs: a list of languages, for example ["abcd", "abcd", "acbd"]
     :param logname_prefix: a prefix that should appear in front of the L in the filename
+    :param store: a boolean indicating whether the event logs should be stored in the output folder
     :return: a list of pm4py-EventLogs with the same data as in the languages passed
     """
     # print the event logs on the command line
@@ -72,20 +82,16 @@ def handle_event_logs(event_logs: list, logname_prefix=""):
     for i in range(len(event_logs)):
         log = event_logs[i]
         print_language(log, "L" + str(i + 1))
-    # store the event logs as .xes-files in the output folder
-    print("I will store them for you in the output folder, so you can look at them later.")
-    print()
-    print("I will also convert these event logs into pm4py format, so we can start the analysis.")
-    filename_prefix = Constants.OUTPUT_PATH + logname_prefix + "L"
-    for i in range(len(event_logs)):
-        filename = filename_prefix + str(i + 1) + ".xes"
-        pm4py.write_xes(convert_language_to_dataframe(event_logs[i]), filename)
+    print("I will convert these event logs into pm4py format, so we can start the analysis.")
+    pm4py_logs = [convert_language_to_event_log(event_log) for event_log in event_logs]
+    # store the event logs as .xes-files in the output folder, before the analysis uses them
+    if store:
+        print("I will also store them for you in the output folder, so you can look at them later.")
+        filename_prefix = Constants.OUTPUT_PATH + logname_prefix + "L"
+        filenames = [filename_prefix + str(i + 1) + ".xes" for i in range(len(event_logs))]
+        store_event_logs(pm4py_logs, filenames)
     print("Done!")
     print()
-    # import the .xes files to receive pm4py-typed event logs
-    pm4py_logs = []
-    for i in range(len(event_logs)):
-        pm4py_logs += [import_pm4py_log(filename_prefix + str(i + 1) + ".xes")]
     return pm4py_logs
 
 def calculate_log_complexity_scores(event_log, measures: list):
@@ -96,8 +102,10 @@ def calculate_log_complexity_scores(event_log, measures: list):
     :return: a list of complexity scores, where the i-th entry is the score received by evaluating measure[i]
     """
     complexity_scores = []
+    # share the plain log, the EPA, the variants, etc. between all measures, so each of them is built only once
+    artifacts = LogArtifacts(event_log)
     for measure in measures:
-        complexity_scores += [measure.calculate_for(event_log)]
+        complexity_scores += [measure.calculate_for(artifacts)]
     return complexity_scores
 
 def highlight_strictly_increasing_scores(complexity_scores: list):
@@ -156,6 +164,7 @@ def print_log_complexity_scores(pm4py_logs: list, measures: list, highlight_incr
         complexity_scores[i] = ["log " + str(i+1)] + complexity_scores[i]
     complexity_scores = [header] + complexity_scores
     # print the table in a pretty way
+    from tabulate import tabulate
     print(tabulate(complexity_scores, headers='firstrow', tablefmt='fancy_grid'))
 
 def show_event_log_comparison(event_logs: list, measures: list, logname_prefix=""):
@@ -1,10 +1,10 @@
-import pm4py # for exporting pictures of Petri nets
-from tabulate import tabulate # for pretty printing tables
-
 import Constants # (internal) for the path of the output folder and color codes on command line
+import LazyImport # (internal) for importing pm4py on first use
 from discovery import DiscoveryAlgorithms # (internal) for executing discovery algorithms
 from modelcomplexity import ModelComplexityMeasures # (internal) for calculating the complexity of models
 
+pm4py = LazyImport.lazy_module("pm4py") # for exporting pictures of Petri nets
+
 def calculate_models(miner, pm4py_logs, filename_prefix="", silent=False):
     """
     Calculates the models for the passed event logs by using the specified mining algorithm
@@ -38,11 +38,10 @@ def calculate_model_complexity_scores(model, measures: list):
     """
     complexity_scores = []
     net, im, fm = model
+    # compile the model once, so that all measures share the same representation
+    prepared_model = ModelComplexityMeasures.prepare_model(net, im, fm)
     for measure in measures:
-        if type(measure) in [ModelComplexityMeasures.Depth, ModelComplexityMeasures.Diameter]:
-            complexity_scores += [measure.calculate_for(net, im, fm)]
-        else:
-            complexity_scores += [measure.calculate_for(net)]
+        complexity_scores += [measure.calculate_for(prepared_model)]
     return complexity_scores
 
 def highlight_norel_scores(complexity_scores: list):
@@ -104,6 +103,7 @@ def print_model_complexity_scores(models: list, measures: list, highlight_norel=
         complexity_scores[i] = ["model " + str(i+1)] + complexity_scores[i]
     complexity_scores = [header] + complexity_scores
     # print the table in a pretty way
+    from tabulate import tabulate
     print(tabulate(complexity_scores, headers='firstrow', tablefmt='fancy_grid'))
 
 def show_model_comparison(miner, measures: list, pm4py_logs, filename_prefix="", colored=True, just_table=False):
@@ -1,90 +1,375 @@
-from tabulate import tabulate # for pretty printing of tables
+from concurrent.futures import ProcessPoolExecutor, as_completed # for analyzing chunks of prefixes in several processes
+import os # for checking whether there is a checkpoint
+import time # for writing checkpoints in regular intervals
+import signal # for finishing the current step before an interrupted analysis stops
+import threading # for checking whether signals can be handled
+import numpy # for combining the saturated rows of several relation tables
 from tqdm import tqdm # for showing a progress bar
 
+import TimeBudget # (internal) for stopping measures that take too long on a prefix
 from modelcomplexity import ModelComplexityMeasures # (internal) for calculating model complexity scores
+from logcomplexity.IncrementalLog import IncrementalLog # (internal) for updating information about prefixes of the log
+from logcomplexity import ColumnarLog # (internal) for integer-encoded event logs that can be sent to other processes cheaply
+from logcomplexity.LogArtifacts import LogArtifacts # (internal) for sharing information about a log between measures
+from analysis.RelationTable import RelationTable, from_dict # (internal) for keeping the relations found in the event log
+from analysis import Checkpoint # (internal) for storing the progress of long analyses
 
 
-def calculate_log_complexity_scores(event_log, measures: list):
+def calculate_log_complexity_scores(event_log, measures: list, measure_time_limit=None):
+    """
+    Calculates the log complexity scores of an event log.
+    :param event_log: the event log in pm4py-format, or a ColumnarLog
+    :param measures: the log complexity measures
+    :param measure_time_limit: the CPU time in seconds each measure may take before its score is TimedOut, or None
+    :return: the list of scores, in the order of the measures
+    """
     complexity_scores = []
+    # share the plain log, the EPA, the variants, etc. between all measures
+    artifacts = LogArtifacts(event_log)
     for measure in measures:
-        complexity_scores += [measure.calculate_for(event_log)]
+        complexity_scores += [TimeBudget.calculate_within_budget(measure.abbreviation, lambda: measure.calculate_for(artifacts), measure_time_limit)]
     return complexity_scores
 
-def calculate_model_complexity_scores(event_log, miner, measures: list):
+def calculate_incremental_log_complexity_scores(incremental_log: IncrementalLog, measures: list, measure_time_limit=None):
     complexity_scores = []
-    net, im, fm = miner.discover_for(event_log)
+    artifacts = None
     for measure in measures:
-        if type(measure) in [ModelComplexityMeasures.Depth, ModelComplexityMeasures.Diameter]:
-            complexity_scores += [measure.calculate_for(net, im, fm)]
+        if hasattr(measure, "calculate_incrementally"):
+            complexity_scores += [TimeBudget.calculate_within_budget(measure.abbreviation, lambda: measure.calculate_incrementally(incremental_log), measure_time_limit)]
         else:
-            complexity_scores += [measure.calculate_for(net)]
+            # measures that cannot be updated incrementally are calculated from scratch for the current prefix
+            if artifacts is None:
+                artifacts = incremental_log.artifacts()
+            complexity_scores += [TimeBudget.calculate_within_budget(measure.abbreviation, lambda: measure.calculate_for(artifacts), measure_time_limit)]
     return complexity_scores
 
-def update_relation_table(relation_table, row_index, column_index, score1, score2):
-    less = "\033[92m" + '<' + "\x1b[0m"
-    leq = "\033[93m" + '≤' + "\x1b[0m"
-    equal = "\033[94m" + '=' + "\x1b[0m"
-    geq = "\033[93m" + '≥' + "\x1b[0m"
-    greater = "\033[92m" + '>' + "\x1b[0m"
-    norel = "\033[91m" + 'X' + "\x1b[0m"
-    if score1 is not None and score2 is not None:
-        # model complexity has strictly increased
-        if score1 < score2:
-            if relation_table[row_index][column_index] == '':
-                relation_table[row_index][column_index] = less
-            elif relation_table[row_index][column_index] == greater:
-                relation_table[row_index][column_index] = norel
-            elif relation_table[row_index][column_index] == equal:
-                relation_table[row_index][column_index] = leq
-        # model complexity stayed the same as before
-        elif score1 == score2:
-            if relation_table[row_index][column_index] == '':
-                relation_table[row_index][column_index] = equal
-            elif relation_table[row_index][column_index] == greater:
-                relation_table[row_index][column_index] = geq
-            elif relation_table[row_index][column_index] == less:
-                relation_table[row_index][column_index] = leq
-        # model complexity has strictly decreased
-        else: # score1 > score2:
-            if relation_table[row_index][column_index] == '':
-                relation_table[row_index][column_index] = greater
-            elif relation_table[row_index][column_index] == less:
-                relation_table[row_index][column_index] = norel
-            elif relation_table[row_index][column_index] == equal:
-                relation_table[row_index][column_index] = geq
-
-
-def investigate_real_life_log(event_log, log_threshold: int, log_measures: list, model_measures: list, mining_algorithm):
-    log_column_names = [measure.abbreviation for measure in log_measures]
-    model_column_names = [measure.abbreviation for measure in model_measures]
-    # initialize the table for the relations found in the event log
-    found_relations = [model_column_names]
-    for i in range(len(log_column_names)):
-        row = [log_column_names[i]]
-        for j in range(len(model_column_names)):
-            row += [''] # use empty string as initial placeholder
-        found_relations += [row]
-    previous_log_complexity_scores = calculate_log_complexity_scores(event_log[:1], log_measures)
-    previous_model_complexity_scores = calculate_model_complexity_scores(event_log[:1], mining_algorithm, model_measures)
+def calculate_model_complexity_scores(event_log, miner, measures: list, measure_time_limit=None):
+    """
+    Discovers a model for the event log and calculates its model complexity scores.
+    :param event_log: the event log in pm4py-format, or a ColumnarLog
+    :param miner: the miner used to discover the model
+    :param measures: the model complexity measures
+    :param measure_time_limit: the CPU time in seconds each measure may take before its score is TimedOut, or None
+    :return: the list of scores, in the order of the measures
+    """
+    net, im, fm = miner.discover_for(event_log)
+    return calculate_model_complexity_scores_for(net, im, fm, measures, measure_time_limit)
+
+def calculate_incremental_model_complexity_scores(incremental_log: IncrementalLog, miner, measures: list, measure_time_limit=None):
+    if hasattr(miner, "discover_incrementally"):
+        net, im, fm = miner.discover_incrementally(incremental_log)
+    else:
+        # miners that cannot use the information of the incremental log discover the model from scratch
+        net, im, fm = miner.discover_for(incremental_log.prefix())
+    return calculate_model_complexity_scores_for(net, im, fm, measures, measure_time_limit)
+
+def scores_with_skipped_measures(scores: list, evaluated: list):
+    # put the scores of the evaluated measures at their positions, and None at the positions of the skipped measures
+    all_scores = [None] * len(evaluated)
+    evaluated_indices = [index for index in range(len(evaluated)) if evaluated[index]]
+    for index, score in zip(evaluated_indices, scores):
+        all_scores[index] = score
+    return all_scores
+
+def abstraction_key_of(incremental_log: IncrementalLog, miner):
+    # miners without an abstraction key discover a new model for each prefix
+    if hasattr(miner, "abstraction_key"):
+        return miner.abstraction_key(incremental_log)
+    return None
+
+def calculate_model_complexity_scores_for(net, im, fm, measures: list, measure_time_limit=None):
+    complexity_scores = []
+    # compile the model once, so that all measures share the same representation
+    prepared_model = ModelComplexityMeasures.prepare_model(net, im, fm)
+    for measure in measures:
+        complexity_scores += [TimeBudget.calculate_within_budget(measure.abbreviation, lambda: measure.calculate_for(prepared_model), measure_time_limit)]
+    return complexity_scores
+
+def create_relation_table(log_measures: list, model_measures: list):
+    log_measure_names = [measure.abbreviation for measure in log_measures]
+    model_measure_names = [measure.abbreviation for measure in model_measures]
+    return RelationTable(log_measure_names, model_measure_names)
+
+def create_relation_tables(log_measures: list, model_measures: list):
+    # one relation table for each miner, where model_measures contains the model complexity measures of each miner
+    return [create_relation_table(log_measures, measures) for measures in model_measures]
+
+def are_saturated(relation_tables: list):
+    return all(relation_table.is_saturated() for relation_table in relation_tables)
+
+def number_of_measures(log_measures: list, model_measures: list):
+    # the number of evaluations of complexity measures in each step, where the log measures are shared by all miners
+    return len(log_measures) + sum(len(measures) for measures in model_measures)
+
+def restore_relation_tables(relation_tables: list, dictionaries: list):
+    for relation_table, dictionary in zip(relation_tables, dictionaries):
+        relation_table.merge(from_dict(dictionary))
+
+def collect_relations(relation_tables: list, event_log, first_step: int, last_step: int, log_measures: list, model_measures: list, mining_algorithms: list, show_progress=False, stop_when_saturated=False, checkpoint_filename=None, resume=False, measure_time_limit=None):
+    """
+    Adds the relations found between prefixes of the event log to the relation tables of the miners. In step i, the
+    prefix containing the first i traces is compared to the prefix containing the first i+1 traces, as long as the
+    event log has enough traces. All miners are analyzed in the same pass, so the log complexity scores of each prefix
+    are calculated once. Measures whose row or column of the relation table only contains X cannot change the table
+    anymore, so they are not evaluated for further prefixes.
+    :param relation_tables: the relation table of each miner, which are updated
+    :param event_log: the event log in pm4py-format, or a ColumnarLog
+    :param first_step: the first step that should be analyzed
+    :param last_step: the last step that should be analyzed
+    :param log_measures: the log complexity measures
+    :param model_measures: a list containing the list of model complexity measures of each miner
+    :param mining_algorithms: the miners used to discover models for the prefixes
+    :param show_progress: a boolean indicating whether a progress bar should be shown
+    :param stop_when_saturated: a boolean indicating whether the analysis stops as soon as all tables only contain X
+    :param checkpoint_filename: the file-path of a checkpoint that is written regularly and when the analysis is
+                                interrupted, or None if no checkpoints should be written
+    :param resume: a boolean indicating whether the analysis continues from the checkpoint, if there is one
+    :param measure_time_limit: the CPU time in seconds each measure may take before its score is TimedOut, or None
+    :return: the number of evaluations of complexity measures that were skipped
+    """
+    skipped_evaluations = 0
+    # instead of slicing the event log for each prefix, append one trace after another to an incremental log
+    incremental_log = IncrementalLog(event_log)
+    for measure in log_measures:
+        if hasattr(measure, "register_incremental_update"):
+            measure.register_incremental_update(incremental_log)
+    miners = range(len(mining_algorithms))
+    checkpoint = Checkpoint.load_checkpoint(checkpoint_filename) if resume else None
+    if checkpoint is not None:
+        # continue with the step after the last step stored in the checkpoint
+        incremental_log.restore(checkpoint["incremental log"])
+        restore_relation_tables(relation_tables, checkpoint["relation tables"])
+        previous_log_complexity_scores = checkpoint["previous log complexity scores"]
+        previous_model_complexity_scores = checkpoint["previous model complexity scores"]
+        previous_abstraction_keys = checkpoint["previous abstraction keys"]
+        skipped_evaluations = checkpoint["skipped evaluations"]
+        first_step = checkpoint["next step"]
+    else:
+        while incremental_log.number_of_traces < first_step and incremental_log.has_next_trace():
+            incremental_log.append_next_trace()
+        previous_log_complexity_scores = calculate_incremental_log_complexity_scores(incremental_log, log_measures, measure_time_limit)
+        previous_model_complexity_scores = [calculate_incremental_model_complexity_scores(incremental_log, mining_algorithms[miner], model_measures[miner], measure_time_limit) for miner in miners]
+        previous_abstraction_keys = [abstraction_key_of(incremental_log, mining_algorithm) for mining_algorithm in mining_algorithms]
+    steps = range(first_step, last_step + 1)
+    if show_progress:
+        steps = tqdm(steps, desc="calculating relations in the event log", initial=first_step - 1, total=last_step)
+    # when a checkpoint is written, an interruption only stops the analysis after the current step, such that the
+    # checkpoint contains the state after this step; interrupting a second time stops the analysis immediately
+    interruptions = []
+    def defer_interruption(signal_number, frame):
+        if len(interruptions) > 0:
+            raise KeyboardInterrupt()
+        interruptions.append(signal_number)
+    previous_handler = None
+    if checkpoint_filename is not None and threading.current_thread() is threading.main_thread():
+        previous_handler = signal.signal(signal.SIGINT, defer_interruption)
+    try:
+        skipped_evaluations = collect_relations_for_steps(relation_tables, incremental_log, steps, last_step, log_measures, model_measures, mining_algorithms, stop_when_saturated, previous_log_complexity_scores, previous_model_complexity_scores, previous_abstraction_keys, skipped_evaluations, checkpoint_filename, interruptions, measure_time_limit)
+    finally:
+        if previous_handler is not None:
+            signal.signal(signal.SIGINT, previous_handler)
+    return skipped_evaluations
+
+def collect_relations_for_steps(relation_tables: list, incremental_log: IncrementalLog, steps, last_step: int, log_measures: list, model_measures: list, mining_algorithms: list, stop_when_saturated: bool, previous_log_complexity_scores: list, previous_model_complexity_scores: list, previous_abstraction_keys: list, skipped_evaluations: int, checkpoint_filename, interruptions: list, measure_time_limit):
+    miners = range(len(mining_algorithms))
+    last_checkpoint_time = time.monotonic()
+    for i in steps:
+        if stop_when_saturated and are_saturated(relation_tables):
+            skipped_evaluations += (last_step - i + 1) * number_of_measures(log_measures, model_measures)
+            break
+        if incremental_log.has_next_trace():
+            incremental_log.append_next_trace()
+        # only evaluate the log measures whose rows can still change in the table of some miner
+        evaluated_log_measures = ~numpy.logical_and.reduce([relation_table.saturated_rows() for relation_table in relation_tables])
+        measures = [log_measures[index] for index in range(len(log_measures)) if evaluated_log_measures[index]]
+        log_complexity_scores = calculate_incremental_log_complexity_scores(incremental_log, measures, measure_time_limit)
+        log_complexity_scores = scores_with_skipped_measures(log_complexity_scores, evaluated_log_measures)
+        skipped_evaluations += len(log_measures) - len(measures)
+        for miner in miners:
+            relation_table = relation_tables[miner]
+            mining_algorithm = mining_algorithms[miner]
+            # skip the discovery if the abstraction of the log the miner depends on did not change
+            abstraction_key = abstraction_key_of(incremental_log, mining_algorithm)
+            if abstraction_key is not None and abstraction_key == previous_abstraction_keys[miner]:
+                model_complexity_scores = previous_model_complexity_scores[miner]
+            else:
+                # only evaluate the model measures whose columns can still change
+                evaluated_model_measures = ~relation_table.saturated_columns()
+                measures = [model_measures[miner][index] for index in range(len(model_measures[miner])) if evaluated_model_measures[index]]
+                model_complexity_scores = calculate_incremental_model_complexity_scores(incremental_log, mining_algorithm, measures, measure_time_limit)
+                model_complexity_scores = scores_with_skipped_measures(model_complexity_scores, evaluated_model_measures)
+                skipped_evaluations += len(model_measures[miner]) - len(measures)
+            previous_abstraction_keys[miner] = abstraction_key
+            # add the changes of model complexity to all rows whose log complexity score increased
+            relation_table.update(previous_log_complexity_scores, log_complexity_scores, previous_model_complexity_scores[miner], model_complexity_scores)
+            previous_model_complexity_scores[miner] = model_complexity_scores
+        previous_log_complexity_scores = log_complexity_scores
+        if checkpoint_filename is not None and (len(interruptions) > 0 or time.monotonic() - last_checkpoint_time >= Checkpoint.CHECKPOINT_INTERVAL):
+            Checkpoint.save_checkpoint(checkpoint_filename, {
+                "next step": i + 1,
+                "incremental log": incremental_log.state(),
+                "relation tables": [relation_table.to_dict() for relation_table in relation_tables],
+                "previous log complexity scores": previous_log_complexity_scores,
+                "previous model complexity scores": previous_model_complexity_scores,
+                "previous abstraction keys": previous_abstraction_keys,
+                "skipped evaluations": skipped_evaluations})
+            last_checkpoint_time = time.monotonic()
+        if len(interruptions) > 0:
+            raise KeyboardInterrupt()
+    return skipped_evaluations
+
+# the event log and the settings used by the processes of a process pool, set once per process by initialize_worker
+worker_log = None
+worker_settings = None
+
+def initialize_worker(activity_names: list, activities, offsets, log_measures: list, model_measures: list, mining_algorithms: list, stop_when_saturated: bool, measure_time_limit):
+    global worker_log, worker_settings
+    worker_log = ColumnarLog.from_arrays(activity_names, activities, offsets)
+    worker_settings = (log_measures, model_measures, mining_algorithms, stop_when_saturated, measure_time_limit)
+
+def collect_relations_in_worker(steps: tuple):
+    log_measures, model_measures, mining_algorithms, stop_when_saturated, measure_time_limit = worker_settings
+    relation_tables = create_relation_tables(log_measures, model_measures)
+    skipped_evaluations = collect_relations(relation_tables, worker_log, steps[0], steps[1], log_measures, model_measures, mining_algorithms, stop_when_saturated=stop_when_saturated, measure_time_limit=measure_time_limit)
+    return steps, relation_tables, skipped_evaluations
+
+def collect_relations_in_parallel(relation_tables: list, event_log, log_threshold: int, log_measures: list, model_measures: list, mining_algorithms: list, workers: int, stop_when_saturated=False, show_progress=True, checkpoint_filename=None, resume=False, measure_time_limit=None):
+    """
+    Adds the relations found in the event log to the relation tables of the miners, where the steps are split into
+    chunks that are analyzed by a pool of processes. Each process receives an integer-encoded copy of the event log
+    once, and the relation tables of all chunks are merged into the passed relation tables.
+    :param relation_tables: the relation table of each miner, which are updated
+    :param event_log: the event log in pm4py-format, or a ColumnarLog
+    :param log_threshold: the number of steps that should be analyzed
+    :param log_measures: the log complexity measures
+    :param model_measures: a list containing the list of model complexity measures of each miner
+    :param mining_algorithms: the miners used to discover models for the prefixes
+    :param workers: the number of processes
+    :param stop_when_saturated: a boolean indicating whether the analysis stops as soon as all tables only contain X
+    :param show_progress: a boolean indicating whether a progress bar should be shown
+    :param checkpoint_filename: the file-path of a checkpoint that is written whenever a chunk is finished, or None
+    :param resume: a boolean indicating whether the analysis continues from the checkpoint, if there is one
+    :param measure_time_limit: the CPU time in seconds each measure may take before its score is TimedOut, or None
+    :return: the number of evaluations of complexity measures that were skipped
+    """
+    # steps comparing the whole event log to itself cannot find any relations
+    last_step = min(log_threshold, len(event_log) - 1)
+    if last_step < 1:
+        return 0
+    columnar_log = ColumnarLog.columnar_log_of(event_log).prefix(last_step + 1)
+    checkpoint = Checkpoint.load_checkpoint(checkpoint_filename) if resume else None
+    if checkpoint is not None:
+        # only analyze the chunks that were not finished before, even if the number of processes changed
+        chunks = checkpoint["chunks"]
+        finished_chunks = checkpoint["finished chunks"]
+        restore_relation_tables(relation_tables, checkpoint["relation tables"])
+        skipped_evaluations = checkpoint["skipped evaluations"]
+    else:
+        # use more chunks than processes, since chunks of later steps take longer to analyze
+        number_of_chunks = min(last_step, 4 * workers)
+        boundaries = [1 + (last_step * chunk) // number_of_chunks for chunk in range(number_of_chunks + 1)]
+        chunks = [(boundaries[chunk], boundaries[chunk + 1] - 1) for chunk in range(number_of_chunks)]
+        finished_chunks = []
+        skipped_evaluations = 0
+    initial_arguments = (columnar_log.activity_names, columnar_log.activities, columnar_log.offsets, log_measures, model_measures, mining_algorithms, stop_when_saturated, measure_time_limit)
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=initialize_worker, initargs=initial_arguments)
+    try:
+        finished_steps = sum(chunk[1] - chunk[0] + 1 for chunk in finished_chunks)
+        with tqdm(total=last_step, initial=finished_steps, desc="calculating relations in the event log", disable=not show_progress) as progress:
+            futures = {executor.submit(collect_relations_in_worker, chunk): chunk for chunk in chunks if chunk not in finished_chunks}
+            for future in as_completed(futures):
+                steps, chunk_relation_tables, chunk_skipped_evaluations = future.result()
+                for relation_table, chunk_relation_table in zip(relation_tables, chunk_relation_tables):
+                    relation_table.merge(chunk_relation_table)
+                skipped_evaluations += chunk_skipped_evaluations
+                finished_chunks += [steps]
+                if checkpoint_filename is not None:
+                    Checkpoint.save_checkpoint(checkpoint_filename, {
+                        "chunks": chunks,
+                        "finished chunks": finished_chunks,
+                        "relation tables": [relation_table.to_dict() for relation_table in relation_tables],
+                        "skipped evaluations": skipped_evaluations})
+                progress.update(steps[1] - steps[0] + 1)
+                if stop_when_saturated and are_saturated(relation_tables):
+                    # the chunks that did not finish yet cannot change the tables anymore
+                    for other_future, (first_step, last_chunk_step) in futures.items():
+                        if not other_future.done():
+                            skipped_evaluations += (last_chunk_step - first_step + 1) * number_of_measures(log_measures, model_measures)
+                    break
+    finally:
+        executor.shutdown(cancel_futures=True)
+    return skipped_evaluations
+
+def find_relations(relation_tables: list, event_log, log_threshold: int, log_measures: list, model_measures: list, mining_algorithms: list, workers=1, stop_when_saturated=False, show_progress=True, checkpoint_filename=None, resume=False, measure_time_limit=None):
+    """
+    Adds the relations found between the prefixes of the event log to the relation tables of the miners, using a pool
+    of processes if more than one worker is requested.
+    :param relation_tables: the relation table of each miner, which are updated
+    :param event_log: the event log in pm4py-format, or a ColumnarLog
+    :param log_threshold: the number of steps that should be analyzed
+    :param log_measures: the log complexity measures
+    :param model_measures: a list containing the list of model complexity measures of each miner
+    :param mining_algorithms: the miners used to discover models for the prefixes
+    :param workers: the number of processes
+    :param stop_when_saturated: a boolean indicating whether the analysis stops as soon as all tables only contain X
+    :param show_progress: a boolean indicating whether a progress bar should be shown
+    :param checkpoint_filename: the file-path of the checkpoint of the analysis (see Checkpoint.checkpoint_path_for),
+                                which is removed once the analysis is finished, or None if no checkpoints should be written
+    :param resume: a boolean indicating whether the analysis continues from the checkpoint, if there is one
+    :param measure_time_limit: the CPU time in seconds each measure may take before its score is TimedOut, or None
+    :return: the number of evaluations of complexity measures that were skipped
+    """
+    if workers > 1:
+        skipped_evaluations = collect_relations_in_parallel(relation_tables, event_log, log_threshold, log_measures, model_measures, mining_algorithms, workers, stop_when_saturated, show_progress, checkpoint_filename, resume, measure_time_limit)
+    else:
+        skipped_evaluations = collect_relations(relation_tables, event_log, 1, log_threshold, log_measures, model_measures, mining_algorithms, show_progress, stop_when_saturated, checkpoint_filename, resume, measure_time_limit)
+    Checkpoint.remove_checkpoint(checkpoint_filename)
+    return skipped_evaluations
+
+def print_relations(relation_tables: list, mining_algorithms: list):
+    for relation_table, mining_algorithm in zip(relation_tables, mining_algorithms):
+        if len(mining_algorithms) > 1:
+            print(str(mining_algorithm) + ":")
+        relation_table.print()
+
+def investigate_real_life_log(event_log, log_threshold: int, log_measures: list, model_measures: list, mining_algorithms, workers=1, stop_when_saturated=False, resume=False, measure_time_limit=None):
+    """
+    Finds and prints the relations between log and model complexity in the event log. Several miners are analyzed in
+    a single pass over the prefixes, which yields one relation table per miner. The progress of the analysis is
+    stored in a checkpoint in the output folder, so an interrupted analysis can be resumed later.
+    :param event_log: the event log in pm4py-format, or a ColumnarLog
+    :param log_threshold: the number of steps that should be analyzed
+    :param log_measures: the log complexity measures
+    :param model_measures: the model complexity measures, which are evaluated for the models of all miners
+    :param mining_algorithms: a miner, or a list of miners
+    :param workers: the number of processes
+    :param stop_when_saturated: a boolean indicating whether the analysis stops as soon as all tables only contain X
+    :param resume: a boolean indicating whether the analysis continues from the checkpoint of the same analysis
+    :param measure_time_limit: the CPU time in seconds each measure may take for a prefix, after which the measure is
+                               treated as if it was not evaluated for this prefix, or None
+    :return: the relation table of the miner, or the list of relation tables if a list of miners was passed
+    """
+    single_miner = type(mining_algorithms) != list
+    if single_miner:
+        mining_algorithms = [mining_algorithms]
+    model_measures = [model_measures] * len(mining_algorithms)
+    # initialize the tables for the relations found in the event log
+    found_relations = create_relation_tables(log_measures, model_measures)
+    checkpoint_filename = Checkpoint.checkpoint_path_for(event_log, log_threshold, log_measures, model_measures, mining_algorithms, workers > 1, measure_time_limit)
+    if resume and os.path.exists(checkpoint_filename):
+        print("I found a checkpoint of this analysis and continue where it stopped.")
     try:
-        for i in tqdm(range(1, log_threshold + 1), desc="calculating relations in the event log"):
-            prefix_log = event_log[:i+1]
-            log_complexity_scores = calculate_log_complexity_scores(prefix_log, log_measures)
-            model_complexity_scores = calculate_model_complexity_scores(prefix_log, mining_algorithm, model_measures)
-            # if some log complexity score increased, update the relation table
-            for log_complexity_index in range(len(log_column_names)):
-                if previous_log_complexity_scores[log_complexity_index] < log_complexity_scores[log_complexity_index]:
-                    # go through all model complexity measures and add new information to the relation table
-                    for model_complexity_index in range(len(model_column_names)):
-                        pre = previous_model_complexity_scores[model_complexity_index]
-                        now = model_complexity_scores[model_complexity_index]
-                        update_relation_table(found_relations, log_complexity_index + 1, model_complexity_index + 1, pre, now)
-            previous_log_complexity_scores = log_complexity_scores
-            previous_model_complexity_scores = model_complexity_scores
+        skipped_evaluations = find_relations(found_relations, event_log, log_threshold, log_measures, model_measures, mining_algorithms, workers, stop_when_saturated, True, checkpoint_filename, resume, measure_time_limit)
         print("I found the following relations of model complexity in your event log if log complexity increases:")
-        print(tabulate(found_relations, headers='firstrow', tablefmt='fancy_grid'))
+        print_relations(found_relations, mining_algorithms)
+        if skipped_evaluations > 0:
+            print("I skipped " + str(skipped_evaluations) + " evaluations of complexity measures that could not change these relations anymore.")
     except KeyboardInterrupt:
         print("Keyboard Interrupt detected!")
         print("Up until now, I found the following relaitons of model complexity in your event log if log complexity increases:")
-        print(tabulate(found_relations, headers='firstrow', tablefmt='fancy_grid'))
+        print_relations(found_relations, mining_algorithms)
+        if os.path.exists(checkpoint_filename):
+            print("I saved my progress in " + checkpoint_filename + ". Run the same analysis with --resume to continue.")
+    if single_miner:
+        return found_relations[0]
     return found_relations
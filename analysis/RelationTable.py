@@ -0,0 +1,140 @@
+import numpy # for storing the relations of all pairs of measures in one array
+
+from TimeBudget import TimedOut # (internal) for ignoring scores of measures that exceeded their time budget
+
+# the bits of a relation, each standing for a change of model complexity observed when log complexity increased
+LESS = 1 # model complexity strictly increased
+EQUAL = 2 # model complexity stayed the same
+GREATER = 4 # model complexity strictly decreased
+
+# the symbols of the relations, as they are printed on command line
+symbols = {
+    0: '', # no change observed yet
+    LESS: "\033[92m" + '<' + "\x1b[0m",
+    EQUAL: "\033[94m" + '=' + "\x1b[0m",
+    GREATER: "\033[92m" + '>' + "\x1b[0m",
+    LESS | EQUAL: "\033[93m" + '≤' + "\x1b[0m",
+    GREATER | EQUAL: "\033[93m" + '≥' + "\x1b[0m",
+    LESS | GREATER: "\033[91m" + 'X' + "\x1b[0m",
+    LESS | EQUAL | GREATER: "\033[91m" + 'X' + "\x1b[0m",
+}
+
+# the symbols of the relations without colors, as they are written to files
+plain_symbols = {0: '', LESS: '<', EQUAL: '=', GREATER: '>', LESS | EQUAL: '≤', GREATER | EQUAL: '≥',
+                 LESS | GREATER: 'X', LESS | EQUAL | GREATER: 'X'}
+
+
+def change_of(score1, score2):
+    """
+    Returns the bit of the change from one complexity score to another.
+    :param score1: the previous complexity score
+    :param score2: the current complexity score
+    :return: LESS, EQUAL, or GREATER, or 0 if one of the scores is None or timed out
+    """
+    if score1 is None or score2 is None or isinstance(score1, TimedOut) or isinstance(score2, TimedOut):
+        return 0
+    if score1 < score2:
+        return LESS
+    if score1 == score2:
+        return EQUAL
+    return GREATER
+
+
+class RelationTable:
+    """
+    Keeps the relations between log complexity measures (rows) and model complexity measures (columns) found in an
+    event log. Each entry is a bitmask of the changes of model complexity observed whenever log complexity increased,
+    so updating an entry is a bitwise or. Since or is associative and commutative, relation tables that were built
+    for different parts of an event log can be merged afterwards.
+    """
+    def __init__(self, log_measure_names: list, model_measure_names: list):
+        """
+        Creates a relation table where no changes were observed yet.
+        :param log_measure_names: the names of the log complexity measures, one for each row
+        :param model_measure_names: the names of the model complexity measures, one for each column
+        """
+        self.log_measure_names = list(log_measure_names)
+        self.model_measure_names = list(model_measure_names)
+        self.relations = numpy.zeros((len(self.log_measure_names), len(self.model_measure_names)), dtype=numpy.uint8)
+
+    def update(self, previous_log_scores: list, log_scores: list, previous_model_scores: list, model_scores: list):
+        """
+        Adds the changes of model complexity to all rows whose log complexity strictly increased.
+        :param previous_log_scores: the log complexity scores of the previous event log
+        :param log_scores: the log complexity scores of the current event log
+        :param previous_model_scores: the model complexity scores of the model of the previous event log
+        :param model_scores: the model complexity scores of the model of the current event log
+        :return: None
+        """
+        increased = numpy.array([change_of(previous, current) == LESS for previous, current in zip(previous_log_scores, log_scores)], dtype=bool)
+        if not increased.any():
+            return
+        changes = numpy.array([change_of(previous, current) for previous, current in zip(previous_model_scores, model_scores)], dtype=numpy.uint8)
+        self.relations[increased] |= changes
+        self.normalize()
+
+    def saturated_rows(self):
+        """
+        Returns which rows only contain X, such that their log complexity measures cannot change the table anymore.
+        :return: a boolean array with one entry per log complexity measure
+        """
+        return self.saturated_entries().all(axis=1)
+
+    def saturated_columns(self):
+        """
+        Returns which columns only contain X, such that their model complexity measures cannot change the table anymore.
+        :return: a boolean array with one entry per model complexity measure
+        """
+        return self.saturated_entries().all(axis=0)
+
+    def is_saturated(self):
+        return bool(self.saturated_rows().all())
+
+    def merge(self, other):
+        """
+        Adds the relations of another relation table with the same measures to this table.
+        :param other: a RelationTable
+        :return: None
+        """
+        self.relations |= other.relations
+        self.normalize()
+
+    def normalize(self):
+        # once model complexity both increased and decreased, the entry is X no matter whether it also stayed the
+        # same, so all such entries are stored as the same bitmask, even if saturated measures were skipped
+        self.relations[self.saturated_entries()] = LESS | EQUAL | GREATER
+
+    def saturated_entries(self):
+        return (self.relations & (LESS | GREATER)) == (LESS | GREATER)
+
+    def rows(self):
+        """
+        Renders the relation table as a list of rows, where the first row contains the names of the model complexity
+        measures, and each other row starts with the name of a log complexity measure.
+        :return: a list of lists of strings
+        """
+        rows = [list(self.model_measure_names)]
+        for i in range(len(self.log_measure_names)):
+            rows += [[self.log_measure_names[i]] + [symbols[int(relation)] for relation in self.relations[i]]]
+        return rows
+
+    def print(self):
+        from tabulate import tabulate
+        print(tabulate(self.rows(), headers='firstrow', tablefmt='fancy_grid'))
+
+    def to_dict(self):
+        return {"log measures": self.log_measure_names,
+                "model measures": self.model_measure_names,
+                "relations": self.relations.tolist(),
+                "symbols": [[plain_symbols[int(relation)] for relation in row] for row in self.relations]}
+
+
+def from_dict(dictionary: dict):
+    """
+    Restores a relation table from the output of RelationTable.to_dict.
+    :param dictionary: a dictionary containing the measure names and the relations
+    :return: the RelationTable
+    """
+    relation_table = RelationTable(dictionary["log measures"], dictionary["model measures"])
+    relation_table.relations[:, :] = numpy.array(dictionary["relations"], dtype=numpy.uint8).reshape(relation_table.relations.shape)
+    return relation_table
@@ -0,0 +1,69 @@
+import os # for the path of the repository
+import sys # for importing the modules of the repository
+import time # for measuring the construction of directly follows graphs
+import argparse # for parsing command-line options
+
+import numpy # for generating large event logs quickly
+
+# the root folder of the repository, which contains the packages of anaLOG
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_PATH)
+
+from discovery import DirectlyFollowsGraph # (internal) for the construction that is measured
+from logcomplexity import ColumnarLog # (internal) for building event logs from generated arrays
+
+
+def generate_event_log(number_of_events: int, number_of_activities: int, number_of_variants: int, seed=0):
+    """
+    Generates an event log with roughly the passed number of events, whose traces follow a fixed set of variants.
+    The frequencies of the variants follow a Zipf distribution, like in real-life event logs where few variants
+    cover most traces.
+    :param number_of_events: the approximate number of events of the log
+    :param number_of_activities: the number of distinct activities
+    :param number_of_variants: the number of distinct variants
+    :param seed: the seed of the random number generator
+    :return: the ColumnarLog of the generated event log
+    """
+    generator = numpy.random.default_rng(seed)
+    variants = [generator.integers(0, number_of_activities, generator.integers(5, 20)) for _ in range(number_of_variants)]
+    frequencies = 1 / numpy.arange(1, number_of_variants + 1)
+    average_length = sum(len(variant) * frequency for variant, frequency in zip(variants, frequencies)) / frequencies.sum()
+    number_of_traces = int(numpy.ceil(number_of_events / average_length))
+    variant_ids = generator.choice(number_of_variants, number_of_traces, p=frequencies / frequencies.sum())
+    trace_lengths = numpy.array([len(variants[variant_id]) for variant_id in variant_ids], dtype=numpy.int64)
+    offsets = numpy.concatenate([[0], numpy.cumsum(trace_lengths)])
+    activities = numpy.concatenate([variants[variant_id] for variant_id in variant_ids])
+    activity_names = ["activity " + str(activity) for activity in range(number_of_activities)]
+    return ColumnarLog.from_arrays(activity_names, activities, offsets)
+
+def measure_construction(event_log, runs: int):
+    """
+    Builds the directly follows graph of an event log several times.
+    :param event_log: the event log in pm4py-format, or a ColumnarLog
+    :param runs: the number of constructions, of which the fastest counts
+    :return: the fastest construction time in seconds
+    """
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        DirectlyFollowsGraph.DirectlyFollowsGraph(event_log)
+        timings += [time.perf_counter() - start_time]
+    return min(timings)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures how the construction of directly follows graphs scales with the size of event logs.")
+    parser.add_argument("--events", type=int, nargs="+", default=[10000, 100000, 1000000], help="the numbers of events of the generated event logs")
+    parser.add_argument("--activities", type=int, default=50, help="the number of distinct activities")
+    parser.add_argument("--variants", type=int, default=1000, help="the number of distinct variants")
+    parser.add_argument("--runs", type=int, default=3, help="the number of constructions per event log, of which the fastest counts")
+    parser.add_argument("--formats", nargs="+", choices=["columnar", "pm4py"], default=["columnar", "pm4py"], help="the formats of the event logs passed to the construction")
+    arguments = parser.parse_args()
+    print("events".rjust(10) + "traces".rjust(10) + "format".rjust(10) + "seconds".rjust(10) + "events/s".rjust(14))
+    for number_of_events in arguments.events:
+        columnar_log = generate_event_log(number_of_events, arguments.activities, arguments.variants)
+        for log_format in arguments.formats:
+            # the graph of a pm4py log is built from the traces, since its variants are not known in advance
+            event_log = columnar_log if log_format == "columnar" else columnar_log.to_event_log()
+            seconds = measure_construction(event_log, arguments.runs)
+            print(str(columnar_log.number_of_events).rjust(10) + str(len(columnar_log)).rjust(10) + log_format.rjust(10)
+                  + str(round(seconds, 3)).rjust(10) + str(int(columnar_log.number_of_events / seconds)).rjust(14))
@@ -0,0 +1,56 @@
+import os # for the path of the repository
+import sys # for the python interpreter and the exit code
+import argparse # for parsing command-line options
+import statistics # for the median of several measurements
+import subprocess # for importing main.py in a fresh interpreter
+
+# the root folder of the repository, which contains main.py
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# libraries that take long to import and must not be imported before the first prompt is shown
+HEAVY_MODULES = ["pm4py", "pandas", "matplotlib", "networkx", "tabulate"]
+
+
+def measure_import_of_main():
+    """
+    Imports main.py in a fresh interpreter with -X importtime. Since main.py shows its first prompt right after its
+    imports, the cumulative import time of main is the time until the user is greeted.
+    :return: the import time of main.py in seconds, and the set of all modules imported on the way
+    """
+    command = [sys.executable, "-X", "importtime", "-c", "import main"]
+    result = subprocess.run(command, cwd=REPOSITORY_PATH, capture_output=True, text=True, check=True)
+    imported_modules = set()
+    main_import_time = None
+    for line in result.stderr.splitlines():
+        # lines have the form "import time: <self [us]> | <cumulative [us]> | <indented module name>"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        module = module.strip()
+        imported_modules.add(module)
+        if module == "main":
+            main_import_time = int(cumulative) / 1000000
+    return main_import_time, imported_modules
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checks how long it takes until anaLOG shows its first prompt.")
+    parser.add_argument("--budget", type=float, default=1.0, help="the maximum time to the first prompt in seconds")
+    parser.add_argument("--runs", type=int, default=5, help="the number of measurements, of which the median counts")
+    arguments = parser.parse_args()
+    measurements = []
+    heavy_imports = set()
+    for _ in range(arguments.runs):
+        import_time, imported_modules = measure_import_of_main()
+        measurements += [import_time]
+        heavy_imports |= {module for module in imported_modules if module.split(".")[0] in HEAVY_MODULES}
+    median_time = statistics.median(measurements)
+    print("time to first prompt: " + str(round(median_time, 3)) + "s (median of " + str(arguments.runs) + " runs, budget: " + str(arguments.budget) + "s)")
+    failed = False
+    if len(heavy_imports) > 0:
+        print("These modules are imported before the first prompt: " + ", ".join(sorted(heavy_imports)))
+        failed = True
+    if median_time > arguments.budget:
+        print("The time to the first prompt exceeds the budget.")
+        failed = True
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,19 @@
+from logcomplexity import DirectlyFollowsMatrix # (internal) for the directly follows relation shared with the number of ties
+
+
+def alpha_miner(pm4py_log):
+    directly_follows_matrix = DirectlyFollowsMatrix.directly_follows_matrix_of(pm4py_log)
+    return alpha_model_for(directly_follows_matrix)
+
+def alpha_model_for(directly_follows_matrix):
+    """
+    Discovers a Petri net with the classic alpha miner of pm4py from a directly follows matrix. The alpha miner only
+    depends on the directly follows relation and the start and end activities, which are the rows and columns of the
+    markers, so this yields the same model as pm4py.discover_petri_net_alpha on the event log.
+    :param directly_follows_matrix: the DirectlyFollowsMatrix of the event log
+    :return: the Petri net, its initial marking, and its final marking
+    """
+    from pm4py.algo.discovery.alpha.variants import classic as alpha_classic # for discovering the net from the footprint
+    return alpha_classic.apply_dfg_sa_ea(directly_follows_matrix.directly_follows_counts(),
+                                         directly_follows_matrix.start_activities(),
+                                         directly_follows_matrix.end_activities())
@@ -1,10 +1,20 @@
-from pm4py.objects.petri_net.obj import PetriNet, Marking # for creating marked Petri nets
-from pm4py.objects.petri_net.utils import petri_utils # for adding edges between places and transitions in a Petri net
+from logcomplexity.ColumnarLog import ColumnarLog # (internal) for reading the variants of columnar logs
+
+def variants_of(pm4py_log):
+    # columnar logs already know their variants, in the order of their first occurrence
+    if type(pm4py_log) == ColumnarLog:
+        return list(pm4py_log.variant_counts().keys())
+    from pm4py.algo.filtering.log.variants import variants_filter
+    return list(variants_filter.get_variants(pm4py_log).keys())
 
 def trace_net_miner(pm4py_log):
+    trace_variants = variants_of(pm4py_log)
+    return trace_net_for_variants(trace_variants)
+
+def trace_net_for_variants(trace_variants):
+    from pm4py.objects.petri_net.obj import PetriNet, Marking # for creating marked Petri nets
+    from pm4py.objects.petri_net.utils import petri_utils # for adding edges between places and transitions in a Petri net
     net = PetriNet("trace-net")
-    from pm4py.algo.filtering.log.variants import variants_filter
-    trace_variants = list(variants_filter.get_variants(pm4py_log).keys())
     # initialize the source and sink of the trace net
     source = PetriNet.Place("source")
     net.places.add(source)
@@ -36,6 +46,20 @@ def trace_net_miner(pm4py_log):
     return net, initial_marking, final_marking
 
 def flower_miner(pm4py_log):
+    trace_variants = variants_of(pm4py_log)
+    # collect the events in the order of their first occurrence
+    events = []
+    encountered_events = set()
+    for trace in trace_variants:
+        for event in trace:
+            if event not in encountered_events:
+                events += [event]
+                encountered_events.add(event)
+    return flower_model_for_events(events)
+
+def flower_model_for_events(events):
+    from pm4py.objects.petri_net.obj import PetriNet, Marking # for creating marked Petri nets
+    from pm4py.objects.petri_net.utils import petri_utils # for adding edges between places and transitions in a Petri net
     net = PetriNet("flower-model")
     source = PetriNet.Place("source")
     net.places.add(source)
@@ -51,20 +75,13 @@ def flower_miner(pm4py_log):
     sink = PetriNet.Place("sink")
     net.places.add(sink)
     petri_utils.add_arc_from_to(tau2, sink, net)
-    events = set()
-    from pm4py.algo.filtering.log.variants import variants_filter
-    trace_variants = list(variants_filter.get_variants(pm4py_log).keys())
     transition_number = 1
-    for trace in trace_variants:
-        for i in range(len(trace)):
-            event = trace[i]
-            if event not in events:
-                t = PetriNet.Transition("t-" + str(transition_number), event)
-                net.transitions.add(t)
-                petri_utils.add_arc_from_to(t, middle, net)
-                petri_utils.add_arc_from_to(middle, t, net)
-                events.add(event)
-                transition_number += 1
+    for event in events:
+        t = PetriNet.Transition("t-" + str(transition_number), event)
+        net.transitions.add(t)
+        petri_utils.add_arc_from_to(t, middle, net)
+        petri_utils.add_arc_from_to(middle, t, net)
+        transition_number += 1
     # define the initial and final marking of the flower model
     initial_marking = Marking()
     initial_marking[source] = 1
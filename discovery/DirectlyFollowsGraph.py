@@ -1,59 +1,45 @@
-import networkx # for storing directly follows graph internally
-import matplotlib.pyplot as plt # for displaying directly follows graphs and storing them on disk
 import math # infinite values for maximum and minimum search
-from tabulate import tabulate # for printing the connection values for cross-connectivity, if enabled
 
-from logcomplexity import Complexity as LogComplexity # (internal) for getting the set of events in an event log
-import Constants # (internal) for picking attributes in event logs
+import LazyImport # (internal) for importing networkx on first use
+from logcomplexity.LogArtifacts import artifacts_of # (internal) for the directly follows matrix of event logs
+from modelcomplexity import GraphAlgorithms, ModelComplexity # (internal) for finding paths with the highest weight
+import Constants # (internal) for the markers of the start and the end of traces
+
+networkx = LazyImport.lazy_module("networkx") # for storing directly follows graph internally
 
 
 class DirectlyFollowsGraph:
-    def __init__(self, pm4py_log):
+    def __init__(self, pm4py_log=None):
         # we use a networkx directed graph internally to unlock a wide variety of useful graph-algorithms
         self.graph = networkx.DiGraph()
         # create two special nodes marking the start and the end of the traces
-        self.start = "▷"
-        self.end = "□"
+        self.start = Constants.start_marker
+        self.end = Constants.end_marker
         self.graph.add_node(self.start)
         self.graph.add_node(self.end)
-        # calculate the set of events
-        events = set()
-        events_per_case = LogComplexity.aux_event_classes(pm4py_log)
-        for case in events_per_case.keys():
-            events = events.union(events_per_case[case])
-        # calculate the edge weights, i.e., how often events follow each other in the log
-        edge_weights = {}
-        for trace in pm4py_log:
-            previous_event = self.start
-            for i in range(len(trace) + 1):
-                if i < len(trace):
-                    current_event = trace[i][Constants.activity_specifier]
-                else:
-                    current_event = self.end
-                if previous_event not in edge_weights.keys():
-                    edge_weights[previous_event] = {}
-                if current_event not in edge_weights[previous_event].keys():
-                    edge_weights[previous_event][current_event] = 0
-                edge_weights[previous_event][current_event] += 1
-                previous_event = current_event
-        # create a node for each event
-        for event in events:
-            self.graph.add_node(event)
-        # add edges between nodes if the respective events are direct neighbors in some trace
-        for trace in pm4py_log:
-            # add an edge from the start node to the start event of this trace
-            self.graph.add_edge(self.start, trace[0][Constants.activity_specifier], weight=edge_weights[self.start][trace[0][Constants.activity_specifier]])
-            for i in range(len(trace)-1):
-                current_event = trace[i][Constants.activity_specifier]
-                next_event = trace[i+1][Constants.activity_specifier]
-                self.graph.add_edge(current_event, next_event, weight=edge_weights[current_event][next_event])
-            # add an edge from the end event of this trace to the end node
-            self.graph.add_edge(trace[-1][Constants.activity_specifier], self.end, weight=edge_weights[trace[-1][Constants.activity_specifier]][self.end])
+        if pm4py_log is not None:
+            self.add_traces(pm4py_log)
+
+    def add_traces(self, pm4py_log):
+        # the graph is built from the directly follows matrix of the log, which is counted once and shared with the
+        # measures and miners that use the directly follows relation, like the number of ties and the alpha miner
+        self.add_directly_follows_matrix(artifacts_of(pm4py_log).directly_follows_matrix())
+
+    def add_directly_follows_matrix(self, directly_follows_matrix):
+        # the nodes and edges are added in the order of their first occurrence in the log, such that the graph depends
+        # neither on hashing nor on the ids of the activities
+        nodes = list(directly_follows_matrix.activity_names) + [self.start, self.end]
+        self.graph.add_nodes_from(nodes[activity] for activity in directly_follows_matrix.activities_in_order().tolist())
+        # add an edge for each pair of directly following events, weighted by how often the pair occurs
+        sources, targets = directly_follows_matrix.pairs_in_order()
+        counts = directly_follows_matrix.counts[sources, targets]
+        self.graph.add_weighted_edges_from((nodes[source], nodes[target], count) for source, target, count in zip(sources.tolist(), targets.tolist(), counts.tolist()))
 
     def is_connector_node(self, node):
         return self.graph.in_degree(node) > 1 or self.graph.out_degree(node) > 1
 
     def visualize(self, filename="DFG", show_picture=False):
+        import matplotlib.pyplot as plt # for displaying directly follows graphs and storing them on disk
         plt.clf()
         positions = networkx.bfs_layout(self.graph, self.start)
         networkx.draw_networkx_nodes(self.graph, positions, node_size=500)
@@ -82,7 +68,7 @@ class DirectlyFollowsGraph:
                 xor_mismatch -= in_degree
         return abs(xor_mismatch)
 
-    def cross_connectivity(self, detailed=False):
+    def cross_connectivity(self, detailed=False, reference=False, workers=1):
         # calculate the node weights in the directly follows graph
         node_weights = {}
         for node in self.graph.nodes:
@@ -95,56 +81,29 @@ class DirectlyFollowsGraph:
         edge_weights = {}
         for edge in self.graph.edges:
             edge_weights[edge] = node_weights[edge[0]] * node_weights[edge[1]]
-        # define a method for calculating path weights
-        def path_weight(simple_path):
-            weight = 1
-            for i in range(len(simple_path)-1):
-                current_edge = (simple_path[i], simple_path[i+1])
-                weight *= edge_weights[current_edge]
-            return weight
-        # define a method for calculating paths starting and ending at the same node
-        def get_all_cyclic_paths(start):
-            # calculate all simple paths from start to any other node
-            all_simple_paths_to_other_nodes = []
-            for end in self.graph.nodes:
-                all_simple_paths_to_other_nodes += list(networkx.all_simple_paths(self.graph, start, end))
-            # find single loop iterations based on the simple paths
-            single_loop_iterations = []
-            for path in all_simple_paths_to_other_nodes:
-                first_node = path[0]
-                last_node = path[-1]
-                if self.graph.has_edge(last_node, first_node):
-                    single_loop_iterations += [path + [first_node]]
-            return single_loop_iterations
-        # define a method for calculating all paths
-        def get_all_paths(start, end):
-            # calculate all simple paths from start to end, as Dijkstra and Bellman-Ford are not applicable here
-            all_simple_paths = list(networkx.all_simple_paths(self.graph, start, end))
-            # remove path that consist of only a single node
-            all_simple_paths = [path for path in all_simple_paths if len(path) > 1]
-            if start == end:
-                all_simple_paths += get_all_cyclic_paths(start)
-            return all_simple_paths
+        # find the highest weight of a path between any two nodes, either by enumerating all simple paths as a
+        # reference, or by running Dijkstra's algorithm for each node, which is possible since all weights are <= 1
+        if reference:
+            weighted_graph = self.graph.copy()
+            networkx.set_edge_attributes(weighted_graph, edge_weights, 'weight')
+            highest_path_weights = ModelComplexity.reference_highest_path_weights(weighted_graph)
+        else:
+            highest_path_weights = GraphAlgorithms.maximum_path_weights(list(self.graph.nodes), edge_weights, workers)
         # sum the maximum weights of each path
         sum_of_path_weights = 0
         values = [["V(u,v)"] + [str(u) for u in self.graph.nodes]]
-        for u in self.graph.nodes:
+        for i, u in enumerate(self.graph.nodes):
             u_val = [str(u)]
-            for v in self.graph.nodes:
-                if u != v:
-                    # calculate all simple paths from u to v, as Dijkstra and Bellman-Ford are not applicable here
-                    all_paths = get_all_paths(u, v)
-                    # find the longest path of the ones found
-                    if len(all_paths) > 0:
-                        highest_path_weight = max([path_weight(path) for path in all_paths])
-                        u_val += [str(round(highest_path_weight, 5))]
-                        sum_of_path_weights += highest_path_weight
-                    else:
-                        u_val += ["0"]
+            for j, v in enumerate(self.graph.nodes):
+                highest_path_weight = highest_path_weights[i][j]
+                if u != v and highest_path_weight is not None:
+                    u_val += [str(round(highest_path_weight, 5))]
+                    sum_of_path_weights += highest_path_weight
                 else:
                     u_val += ["0"]
             values += [u_val]
         if detailed:
+            from tabulate import tabulate
             print(tabulate(values, headers='firstrow', tablefmt='fancy_grid'))
         maximum_sum_of_path_weights = len(self.graph.nodes) * (len(self.graph.nodes) - 1)
         cross_connectivity = 1 - (sum_of_path_weights / maximum_sum_of_path_weights)
@@ -190,57 +149,42 @@ class DirectlyFollowsGraph:
         return 1 - sequential_arcs / len(self.graph.edges)
 
     def depth(self):
-        # initialize the in_depth and the out_depth of each node with 0
-        in_depth = {}
-        out_depth = {}
-        for node in self.graph.nodes:
-            in_depth[node] = 0
-            out_depth[node] = 0
-        # define a sub-procedure to calculate the depth of each node
-        def fill_depth_of_nodes(graph, start, node_dict):
-            bfs_tree = networkx.bfs_tree(graph, start)
-            queue = [start]
-            # go through all nodes in breadth first order
-            while len(queue) > 0:
-                current_node = queue.pop(0)
-                # add all neighbors of the current node to the queue
-                queue += [neighbor for neighbor in bfs_tree[current_node]]
-                # get the parent node, which is either unique or non-existent
-                parents = [edge[0] for edge in bfs_tree.in_edges(current_node)]
-                # the root node keeps depth 0
-                if len(parents) != 0:
-                    parent = parents[0]
-                    # increase depth if the parent is a split and the current node is not a join
-                    if graph.out_degree(parent) > 1 >= graph.in_degree(current_node):
-                        node_dict[current_node] = max(node_dict[current_node], node_dict[parent] + 1)
-                    # decrease depth if the parent is a join and the current node is not a split
-                    elif graph.in_degree(current_node) > 1 >= graph.out_degree(parent):
-                        node_dict[current_node] = max(node_dict[current_node], node_dict[parent] - 1)
-                    # keep the depth from the parent in all other cases
-                    else:
-                        node_dict[current_node] = max(node_dict[current_node], node_dict[parent])
-        fill_depth_of_nodes(self.graph, self.start, in_depth)
-        fill_depth_of_nodes(self.graph.reverse(), self.end, out_depth)
+        nodes = list(self.graph.nodes)
+        node_ids = {node: node_id for node_id, node in enumerate(nodes)}
+        # the successors keep the order of the graph, and the predecessors the order of self.graph.reverse(), which
+        # lists the edges into a node in the order of their sources
+        successors = [[node_ids[target] for target in self.graph.successors(node)] for node in nodes]
+        predecessors = [[] for _ in nodes]
+        for source, target in self.graph.edges:
+            predecessors[node_ids[target]].append(node_ids[source])
+        out_degree = [len(targets) for targets in successors]
+        in_degree = [len(sources) for sources in predecessors]
+        # initialize the in_depth and the out_depth of each node with 0, and propagate them from the start and the end
+        in_depth = [0] * len(nodes)
+        out_depth = [0] * len(nodes)
+        GraphAlgorithms.fill_depths([node_ids[self.start]], successors, out_degree, in_degree, in_depth)
+        GraphAlgorithms.fill_depths([node_ids[self.end]], predecessors, in_degree, out_degree, out_depth)
         # calculate the depth of each node
         maximum_depth = -math.inf
-        for node in self.graph.nodes:
+        for node in range(len(nodes)):
             depth = min(in_depth[node], out_depth[node])
             if depth > maximum_depth:
                 maximum_depth = depth
         return maximum_depth
 
     def diameter(self):
-        all_simple_paths = list(networkx.all_simple_paths(self.graph, self.start, self.end))
-        if len(all_simple_paths) == 0:
-            return math.inf
-        return len(max(all_simple_paths, key=lambda path: len(path)))
-
-    def cyclicity(self):
-        simple_cycles = networkx.simple_cycles(self.graph)
-        nodes_on_cycles = set()
-        for cycle in simple_cycles:
-            for node in cycle:
-                nodes_on_cycles.add(node)
+        return GraphAlgorithms.longest_simple_path_length(self.graph, [self.start], [self.end])
+
+    def cyclicity(self, reference=False):
+        if reference:
+            simple_cycles = networkx.simple_cycles(self.graph)
+            nodes_on_cycles = set()
+            for cycle in simple_cycles:
+                for node in cycle:
+                    nodes_on_cycles.add(node)
+        else:
+            # a node lies on a cycle if its strongly connected component is non-trivial or if it has a self-loop
+            nodes_on_cycles = GraphAlgorithms.nodes_on_cycles(self.graph)
         return len(nodes_on_cycles) / (len(self.graph.nodes) - 2)
 
     def coefficient_of_network_connectivity(self):
@@ -248,3 +192,10 @@ class DirectlyFollowsGraph:
 
     def density(self):
         return len(self.graph.edges) / ((len(self.graph.nodes) - 1)**2)
+
+
+def from_directly_follows_matrix(directly_follows_matrix):
+    # the matrix contains Constants.start_marker and Constants.end_marker as its last two activities
+    directly_follows_graph = DirectlyFollowsGraph()
+    directly_follows_graph.add_directly_follows_matrix(directly_follows_matrix)
+    return directly_follows_graph
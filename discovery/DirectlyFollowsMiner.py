@@ -1,12 +1,14 @@
-from pm4py.objects.petri_net.obj import PetriNet, Marking # for creating marked Petri nets
-from pm4py.objects.petri_net.utils import petri_utils # for adding edges between places and transitions in a Petri net
-
 from discovery import DirectlyFollowsGraph as DFG # (internal) for calculating the DFG that defines the structure of the DFM
 
 
 def directly_follows_miner(pm4py_log):
-    net = PetriNet("directly-follows-model")
     dfg = DFG.DirectlyFollowsGraph(pm4py_log)
+    return directly_follows_model_for(dfg)
+
+def directly_follows_model_for(dfg):
+    from pm4py.objects.petri_net.obj import PetriNet, Marking # for creating marked Petri nets
+    from pm4py.objects.petri_net.utils import petri_utils # for adding edges between places and transitions in a Petri net
+    net = PetriNet("directly-follows-model")
     transition_id = 1
     places = {}
     for node in dfg.graph.nodes:
@@ -1,8 +1,16 @@
-import pm4py
-from discovery import BaselineMiners, DirectlyFollowsMiner, DirectlyFollowsGraph
+from discovery import AlphaAlgorithm, BaselineMiners, DirectlyFollowsMiner, DirectlyFollowsGraph
+from logcomplexity import DirectlyFollowsMatrix
+
+
+def directly_follows_graph_of(incremental_log):
+    # the directly follows matrix is shared with the alpha miner and the number of ties if they are analyzed in the same pass
+    directly_follows_matrix = incremental_log.shared("directly follows matrix", DirectlyFollowsMatrix.shared_directly_follows_matrix)
+    return DirectlyFollowsGraph.from_directly_follows_matrix(directly_follows_matrix)
+
 
 class FlowerModelMiner:
     name = "Flower model"
+    abbreviation = "flower"
 
     def __str__(self):
         return self.name
@@ -11,8 +19,17 @@ class FlowerModelMiner:
         net, im, fm = BaselineMiners.flower_miner(event_log)
         return net, im, fm
 
+    def discover_incrementally(self, incremental_log):
+        net, im, fm = BaselineMiners.flower_model_for_events(incremental_log.activities)
+        return net, im, fm
+
+    def abstraction_key(self, incremental_log):
+        # the flower model only depends on the set of activities
+        return len(incremental_log.activities)
+
 class TraceNetMiner:
     name = "Trace net"
+    abbreviation = "trace-net"
 
     def __str__(self):
         return self.name
@@ -21,18 +38,39 @@ class TraceNetMiner:
         net, im, fm = BaselineMiners.trace_net_miner(event_log)
         return net, im, fm
 
+    def discover_incrementally(self, incremental_log):
+        net, im, fm = BaselineMiners.trace_net_for_variants(list(incremental_log.variant_counts.keys()))
+        return net, im, fm
+
+    def abstraction_key(self, incremental_log):
+        # the trace net only depends on the set of variants
+        return len(incremental_log.variant_counts)
+
 class AlphaMiner:
     name = "Alpha miner"
+    abbreviation = "alpha"
 
     def __str__(self):
         return self.name
 
     def discover_for(self, event_log):
-        net, im, fm = pm4py.discover_petri_net_alpha(event_log)
+        net, im, fm = AlphaAlgorithm.alpha_miner(event_log)
         return net, im, fm
 
+    def discover_incrementally(self, incremental_log):
+        # the directly follows matrix is shared with the number of ties if both are analyzed in the same pass
+        directly_follows_matrix = incremental_log.shared("directly follows matrix", DirectlyFollowsMatrix.shared_directly_follows_matrix)
+        net, im, fm = AlphaAlgorithm.alpha_model_for(directly_follows_matrix)
+        return net, im, fm
+
+    def abstraction_key(self, incremental_log):
+        # the alpha miner only depends on the footprint, i.e., the directly follows relation and the start and end
+        # activities, which are the pairs of the directly follows relation containing the start and end markers
+        return len(incremental_log.directly_follows_counts)
+
 class DirectlyFollowsGraphMiner:
     name = "Directly follows graph"
+    abbreviation = "dfg"
 
     def __str__(self):
         return self.name
@@ -41,8 +79,17 @@ class DirectlyFollowsGraphMiner:
         graph = DirectlyFollowsGraph.DirectlyFollowsGraph(event_log)
         return graph, None, None
 
+    def discover_incrementally(self, incremental_log):
+        graph = incremental_log.shared("directly follows graph", directly_follows_graph_of)
+        return graph, None, None
+
+    def abstraction_key(self, incremental_log):
+        # apart from the edge weights, which no complexity measure uses, the graph only depends on the relation
+        return len(incremental_log.directly_follows_counts)
+
 class DirectlyFollowsModelMiner:
     name = "Directly follows miner"
+    abbreviation = "dfm"
 
     def __str__(self):
         return self.name
@@ -51,13 +98,31 @@ class DirectlyFollowsModelMiner:
         net, im, fm = DirectlyFollowsMiner.directly_follows_miner(event_log)
         return net, im, fm
 
+    def discover_incrementally(self, incremental_log):
+        # the graph is shared with the directly follows graph miner if both are analyzed in the same pass
+        graph = incremental_log.shared("directly follows graph", directly_follows_graph_of)
+        net, im, fm = DirectlyFollowsMiner.directly_follows_model_for(graph)
+        return net, im, fm
+
+    def abstraction_key(self, incremental_log):
+        # the directly follows model only depends on the directly follows relation
+        return len(incremental_log.directly_follows_counts)
+
 # To add more discovery algorithms:
 # 1. Create a class like the ones above. Its attributes should include "name", which is a descriptive name of
-#    the discovery algorithm, shown when the user can choose the discovery algorithm they want to investigate.
+#    the discovery algorithm, shown when the user can choose the discovery algorithm they want to investigate, and
+#    "abbreviation", which is a short name used to choose the discovery algorithm on command line.
 #    Furthermore, your class must implement the functions __str__ (returning the name of the discovery algorithm)
-#    and discover_for, which takes an event log and returns the model discovered by the discovery algorithm.
+#    and discover_for, which takes an event log (in pm4py-format or as ColumnarLog) and returns the model discovered
+#    by the discovery algorithm.
 #    The result must consist of a net, an initial marking, and a final marking. If the latter two do not exist,
 #    set them to None.
+#    Optionally, your class can implement discover_incrementally, which takes an IncrementalLog and returns the model
+#    discovered for its current prefix, using the information kept by the IncrementalLog instead of the traces.
+#    If the model only depends on an abstraction of the log, like its set of activities, your class can also implement
+#    abstraction_key, which takes an IncrementalLog and returns a value that changes whenever the abstraction of the
+#    prefix changes. Since prefixes only grow, the size of the abstraction is usually enough. If the key did not
+#    change, the model of the previous prefix and its complexity scores are reused.
 # 2. Add an instance of your new class to the following list of all discovery algorithms
 
 all_discovery_algorithms = [FlowerModelMiner(), TraceNetMiner(), AlphaMiner(), DirectlyFollowsGraphMiner(), DirectlyFollowsModelMiner()]
\ No newline at end of file
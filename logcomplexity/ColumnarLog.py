@@ -0,0 +1,163 @@
+import numpy # for storing the activities of all events in compact arrays
+from datetime import datetime, timezone # for including artificial timestamps
+
+import Constants # (internal) for picking attributes in event logs
+
+
+class ColumnarLog:
+    """
+    An event log where each activity is encoded as an integer and the activities of all events are stored in one
+    array. The events of trace i are activities[offsets[i]:offsets[i+1]], and variant_ids[i] is the index of the
+    variant of trace i in the list of variants, which are numbered in the order of their first occurrence. Prefixes
+    of the log share the arrays with the log they were taken from, so taking a prefix does not copy any events.
+    """
+    def __init__(self, activity_names: list, activities, offsets, variant_ids, variants: list, first_occurrences, event_log=None, case_ids=None):
+        """
+        Creates a columnar log from its arrays. Use from_event_log or from_arrays to build these arrays.
+        :param activity_names: a list containing the name of each activity id
+        :param activities: an int32 array containing the activity id of each event
+        :param offsets: an int64 array of trace boundaries, containing one entry more than there are traces
+        :param variant_ids: an int32 array containing the variant id of each trace
+        :param variants: a list containing each variant as a tuple of activity names, in the order of their first occurrence
+        :param first_occurrences: an int64 array containing the index of the first trace of each variant
+        :param event_log: the event log in pm4py-format this log was built from, if there is one
+        :param case_ids: a list containing the case identifier of each trace, if they are known
+        """
+        self.activity_names = activity_names
+        self.activities = activities
+        self.offsets = offsets
+        self.variant_ids = variant_ids
+        self.variants = variants
+        self.first_occurrences = first_occurrences
+        self.case_ids = case_ids
+        self.number_of_traces = len(offsets) - 1
+        self.number_of_events = int(offsets[-1])
+        # the complete log, which keeps the event log in pm4py-format shared by all of its prefixes
+        self.complete_log = self
+        self.event_log = event_log
+
+    def __len__(self):
+        return self.number_of_traces
+
+    def prefix(self, number_of_traces: int):
+        """
+        Returns the prefix of this log containing its first traces, without copying the arrays.
+        :param number_of_traces: the number of traces of the prefix
+        :return: a ColumnarLog sharing the arrays of this log
+        """
+        number_of_traces = min(number_of_traces, self.number_of_traces)
+        offsets = self.offsets[:number_of_traces + 1]
+        prefix = ColumnarLog(self.activity_names, self.activities[:offsets[-1]], offsets,
+                             self.variant_ids[:number_of_traces], self.variants, self.first_occurrences,
+                             case_ids=None if self.case_ids is None else self.case_ids[:number_of_traces])
+        prefix.complete_log = self.complete_log
+        return prefix
+
+    def trace(self, index: int):
+        return self.activities[self.offsets[index]:self.offsets[index + 1]]
+
+    def variant(self, index: int):
+        return self.variants[self.variant_ids[index]]
+
+    def number_of_variants(self):
+        # since variants are numbered in the order of their first occurrence, the variants of this log come first
+        return int(numpy.searchsorted(self.first_occurrences, self.number_of_traces))
+
+    def variant_counts(self):
+        """
+        Returns the variants of this log.
+        :return: a dictionary mapping each variant to its number of traces, in the order of their first occurrence
+        """
+        number_of_variants = self.number_of_variants()
+        counts = numpy.bincount(self.variant_ids, minlength=number_of_variants)
+        return {self.variants[variant_id]: int(counts[variant_id]) for variant_id in range(number_of_variants)}
+
+    def activity_set(self):
+        return {self.activity_names[activity] for activity in numpy.unique(self.activities)}
+
+    def trace_lengths(self):
+        return numpy.diff(self.offsets)
+
+    def to_event_log(self):
+        """
+        Returns this log in pm4py-format. If the log was built from an event log in pm4py-format, the traces of this
+        event log are returned; otherwise, the event log is built once, with artificial timestamps that keep the order
+        of the events, and with artificial case identifiers if they are not known.
+        :return: the event log in pm4py-format, or the list of its first traces if this log is a prefix
+        """
+        complete_log = self.complete_log
+        if complete_log.event_log is None:
+            complete_log.event_log = decode(complete_log)
+        if self.number_of_traces == complete_log.number_of_traces:
+            return complete_log.event_log
+        return complete_log.event_log[:self.number_of_traces]
+
+
+def from_arrays(activity_names: list, activities, offsets, event_log=None, case_ids=None):
+    """
+    Builds a columnar log from the activity ids of its events, numbering its variants.
+    :param activity_names: a list containing the name of each activity id
+    :param activities: an array containing the activity id of each event
+    :param offsets: an array of trace boundaries, containing one entry more than there are traces
+    :param event_log: the event log in pm4py-format the arrays were built from, if there is one
+    :param case_ids: a list containing the case identifier of each trace, if they are known
+    :return: the ColumnarLog
+    """
+    activities = numpy.asarray(activities, dtype=numpy.int32)
+    offsets = numpy.asarray(offsets, dtype=numpy.int64)
+    variant_ids = numpy.zeros(len(offsets) - 1, dtype=numpy.int32)
+    variant_index = {}
+    variants = []
+    first_occurrences = []
+    for trace_index in range(len(offsets) - 1):
+        encoded_variant = activities[offsets[trace_index]:offsets[trace_index + 1]].tobytes()
+        if encoded_variant not in variant_index:
+            variant_index[encoded_variant] = len(variants)
+            trace = activities[offsets[trace_index]:offsets[trace_index + 1]]
+            variants += [tuple(activity_names[activity] for activity in trace)]
+            first_occurrences += [trace_index]
+        variant_ids[trace_index] = variant_index[encoded_variant]
+    return ColumnarLog(activity_names, activities, offsets, variant_ids, variants,
+                       numpy.array(first_occurrences, dtype=numpy.int64), event_log, case_ids)
+
+def from_event_log(event_log):
+    """
+    Builds a columnar log from an event log in pm4py-format, reading each event once.
+    :param event_log: the event log in pm4py-format
+    :return: the ColumnarLog, which keeps a reference to the event log
+    """
+    activity_ids = {}
+    activities = []
+    offsets = [0]
+    for trace in event_log:
+        for event in trace:
+            activities += [activity_ids.setdefault(event[Constants.activity_specifier], len(activity_ids))]
+        offsets += [len(activities)]
+    return from_arrays(list(activity_ids.keys()), activities, offsets, event_log)
+
+def columnar_log_of(event_log):
+    """
+    Returns the columnar representation of the passed event log. If the passed object already is a ColumnarLog,
+    it is returned as it is.
+    :param event_log: an event log in pm4py-format, or a ColumnarLog
+    :return: the ColumnarLog
+    """
+    if type(event_log) == ColumnarLog:
+        return event_log
+    return from_event_log(event_log)
+
+def decode(columnar_log: ColumnarLog):
+    from pm4py.objects.log.obj import EventLog, Trace, Event # for converting the log back into pm4py-format
+    event_log = EventLog()
+    for trace_index in range(columnar_log.number_of_traces):
+        if columnar_log.case_ids is None:
+            case_id = str(trace_index + 1)
+        else:
+            case_id = columnar_log.case_ids[trace_index]
+        trace = Trace(attributes={Constants.activity_specifier: case_id})
+        for event_index in range(columnar_log.offsets[trace_index], columnar_log.offsets[trace_index + 1]):
+            timestamp = datetime.fromtimestamp(int(event_index), timezone.utc)
+            activity = columnar_log.activity_names[columnar_log.activities[event_index]]
+            trace.append(Event({Constants.activity_specifier: activity, Constants.timestamp_specifier: timestamp}))
+        event_log.append(trace)
+    return event_log
@@ -0,0 +1,157 @@
+import numpy # for counting the directly follows pairs of all events at once
+
+import Constants # (internal) for the markers of directly follows relations
+from logcomplexity.ColumnarLog import ColumnarLog, columnar_log_of # (internal) for the integer-encoded events of event logs
+
+# the first occurrence of pairs that do not occur in the event log
+NEVER = numpy.iinfo(numpy.int64).max
+
+
+class DirectlyFollowsMatrix:
+    """
+    The directly follows relation of an event log as a square matrix over the integer-encoded activities, where entry
+    [a][b] counts how often activity b directly follows activity a. The last two rows and columns stand for
+    Constants.start_marker and Constants.end_marker, such that the first activity of each trace follows the start
+    marker, and the end marker follows the last activity of each trace. The matrix is shared by the measures and the
+    miners that only depend on the directly follows relation, like the number of ties, the alpha miner, and the
+    directly follows graph. Since some measures of directly follows graphs visit the neighbors of a node in order, the
+    matrix also keeps when each pair occurred first, such that graphs can be built in the order of the event log.
+    """
+    def __init__(self, activity_names: list, counts, first_occurrences):
+        """
+        Creates a directly follows matrix from its counts.
+        :param activity_names: a list containing the name of each activity id
+        :param counts: an int64 array with two more rows and columns than there are activities
+        :param first_occurrences: an int64 array of the same shape, where pairs that occur earlier in the event log
+                                  have smaller entries, and pairs that never occur have the entry NEVER
+        """
+        self.activity_names = activity_names
+        self.counts = counts
+        self.first_occurrences = first_occurrences
+        self.start = len(activity_names)
+        self.end = len(activity_names) + 1
+
+    def relation(self):
+        # the boolean directly follows relation between the activities, without the markers
+        return self.counts[:self.start, :self.start] > 0
+
+    def number_of_ties(self):
+        """
+        Counts the pairs (a, b) of activities where b directly follows a, but a never directly follows b, i.e., the
+        entries "->" of the causal footprint. Self-loops are parallel, so they are never counted.
+        :return: the number of ties
+        """
+        relation = self.relation()
+        return int(numpy.count_nonzero(relation & ~relation.T))
+
+    def directly_follows_counts(self):
+        """
+        Returns the directly follows relation between activities in the format of pm4py, without the markers.
+        :return: a dictionary mapping each pair (a, b) of activity names to the number of times b directly follows a
+        """
+        sources, targets = numpy.nonzero(self.counts[:self.start, :self.start])
+        return {(self.activity_names[source], self.activity_names[target]): int(self.counts[source, target])
+                for source, target in zip(sources.tolist(), targets.tolist())}
+
+    def pairs_in_order(self):
+        """
+        Returns the pairs of the directly follows relation, including the pairs with the markers, in the order of their
+        first occurrence in the event log.
+        :return: an array of the sources and an array of the targets of the pairs
+        """
+        sources, targets = numpy.nonzero(self.counts)
+        order = numpy.argsort(self.first_occurrences[sources, targets], kind="stable")
+        return sources[order], targets[order]
+
+    def activities_in_order(self):
+        """
+        Returns the activities that occur in the event log, without the markers, in the order of their first occurrence.
+        Each occurrence of an activity ends a pair, so an activity first occurs with the first pair that ends in it.
+        :return: an array of activity ids
+        """
+        first_occurrences = self.first_occurrences[:, :self.start].min(axis=0)
+        activities = numpy.nonzero(first_occurrences != NEVER)[0]
+        return activities[numpy.argsort(first_occurrences[activities], kind="stable")]
+
+    def start_activities(self):
+        # the activities that start some trace, with the number of traces they start
+        activities = numpy.nonzero(self.counts[self.start, :self.start])[0].tolist()
+        return {self.activity_names[activity]: int(self.counts[self.start, activity]) for activity in activities}
+
+    def end_activities(self):
+        # the activities that end some trace, with the number of traces they end
+        activities = numpy.nonzero(self.counts[:self.start, self.end])[0].tolist()
+        return {self.activity_names[activity]: int(self.counts[activity, self.end]) for activity in activities}
+
+
+def from_columnar_log(columnar_log: ColumnarLog):
+    """
+    Counts the directly follows pairs of all events of a columnar log at once, without visiting the events in Python.
+    :param columnar_log: the ColumnarLog
+    :return: the DirectlyFollowsMatrix of the log
+    """
+    number_of_activities = len(columnar_log.activity_names)
+    start = number_of_activities
+    end = number_of_activities + 1
+    activities = numpy.asarray(columnar_log.activities, dtype=numpy.int64)
+    offsets = numpy.asarray(columnar_log.offsets, dtype=numpy.int64)
+    # pairs of consecutive events, except for the pairs of the last event of a trace and the first event of the next
+    is_within_trace = numpy.ones(max(len(activities) - 1, 0), dtype=bool)
+    boundaries = offsets[1:-1]
+    is_within_trace[boundaries[(boundaries > 0) & (boundaries < len(activities))] - 1] = False
+    sources = activities[:-1][is_within_trace]
+    targets = activities[1:][is_within_trace]
+    # the first and the last event of each trace follow the start marker and are followed by the end marker, while
+    # empty traces directly go from the start marker to the end marker
+    is_empty = offsets[1:] == offsets[:-1]
+    first_activities = numpy.full(len(offsets) - 1, end, dtype=numpy.int64)
+    first_activities[~is_empty] = activities[offsets[:-1][~is_empty]]
+    last_activities = activities[offsets[1:][~is_empty] - 1]
+    sources = numpy.concatenate([sources, numpy.full(len(first_activities), start), last_activities])
+    targets = numpy.concatenate([targets, first_activities, numpy.full(len(last_activities), end)])
+    counts = numpy.zeros((number_of_activities + 2, number_of_activities + 2), dtype=numpy.int64)
+    numpy.add.at(counts, (sources, targets), 1)
+    # the position of the source of each pair, as if each trace was surrounded by its markers: the start marker of
+    # trace k is at its offset + 2k, followed by its events, such that its last event is at the next offset + 2k
+    trace_ids = numpy.arange(len(offsets) - 1, dtype=numpy.int64)
+    event_positions = numpy.arange(len(activities), dtype=numpy.int64) + 2 * numpy.repeat(trace_ids, numpy.diff(offsets)) + 1
+    positions = numpy.concatenate([event_positions[:-1][is_within_trace], offsets[:-1] + 2 * trace_ids,
+                                   (offsets[1:] + 2 * trace_ids)[~is_empty]])
+    first_occurrences = numpy.full(counts.shape, NEVER, dtype=numpy.int64)
+    numpy.minimum.at(first_occurrences, (sources, targets), positions)
+    return DirectlyFollowsMatrix(columnar_log.activity_names, counts, first_occurrences)
+
+def from_directly_follows_counts(activity_names: list, directly_follows_counts: dict):
+    """
+    Builds the directly follows matrix from a directly follows relation that is already known, like the one kept by
+    an IncrementalLog.
+    :param activity_names: a list containing the name of each activity id, including all activities of the relation
+    :param directly_follows_counts: a dictionary mapping each pair (a, b) to the number of times b directly follows a,
+                                    where the pairs may contain Constants.start_marker and Constants.end_marker, in
+                                    the order of their first occurrence
+    :return: the DirectlyFollowsMatrix of the relation
+    """
+    activity_ids = {activity: activity_id for activity_id, activity in enumerate(activity_names)}
+    activity_ids[Constants.start_marker] = len(activity_names)
+    activity_ids[Constants.end_marker] = len(activity_names) + 1
+    counts = numpy.zeros((len(activity_names) + 2, len(activity_names) + 2), dtype=numpy.int64)
+    first_occurrences = numpy.full(counts.shape, NEVER, dtype=numpy.int64)
+    if len(directly_follows_counts) > 0:
+        sources = [activity_ids[source] for source, _ in directly_follows_counts.keys()]
+        targets = [activity_ids[target] for _, target in directly_follows_counts.keys()]
+        numpy.add.at(counts, (sources, targets), list(directly_follows_counts.values()))
+        # the pairs of a dictionary are distinct, and they are listed in the order of their first occurrence
+        first_occurrences[sources, targets] = numpy.arange(len(directly_follows_counts))
+    return DirectlyFollowsMatrix(activity_names, counts, first_occurrences)
+
+def directly_follows_matrix_of(event_log):
+    """
+    Returns the directly follows matrix of the passed event log.
+    :param event_log: an event log in pm4py-format, or a ColumnarLog
+    :return: the DirectlyFollowsMatrix of the event log
+    """
+    return from_columnar_log(columnar_log_of(event_log))
+
+def shared_directly_follows_matrix(incremental_log):
+    # the matrix of the current prefix of an IncrementalLog, to be built once per prefix by IncrementalLog.shared
+    return from_directly_follows_counts(incremental_log.event_log.activity_names, incremental_log.directly_follows_counts)
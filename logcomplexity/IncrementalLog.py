@@ -0,0 +1,143 @@
+import Constants # (internal) for the markers of directly follows relations
+from logcomplexity.ColumnarLog import columnar_log_of # (internal) for reading the variants of traces without pm4py objects
+from logcomplexity.LogArtifacts import LogArtifacts # (internal) for sharing information about the prefix between measures
+
+
+class IncrementalLog:
+    """
+    Represents a prefix of an event log that grows by one trace at a time. Instead of recalculating everything from
+    scratch for each prefix, this class keeps information about the prefix that can be updated cheaply whenever a
+    trace is appended, like the variants, the directly follows relation, and the set of activities. Complexity
+    measures can register their own state, together with a function that updates this state for each new trace.
+    """
+    def __init__(self, event_log):
+        """
+        Creates an empty prefix of the passed event log.
+        :param event_log: the event log in pm4py-format or the ColumnarLog whose prefixes should be analyzed
+        """
+        self.event_log = columnar_log_of(event_log)
+        self.number_of_traces = 0
+        self.number_of_events = 0
+        self.maximum_trace_length = 0
+        self.activities = set()
+        # maps each variant (a tuple of activities) to the number of traces in the prefix that follow this variant
+        self.variant_counts = {}
+        # maps each pair (a, b) to the number of times b directly follows a in the prefix, where the first activity
+        # of a trace follows Constants.start_marker and Constants.end_marker follows the last activity of a trace
+        self.directly_follows_counts = {}
+        self.measure_states = {}
+        self.update_functions = {}
+        # information about the current prefix that is built on first use, like the directly follows graph
+        self.shared_information = {}
+
+    def register_update(self, key, initial_state, update_function):
+        """
+        Registers state that is kept by a complexity measure, and a function that updates the state whenever a trace
+        is appended. The update function is called before the information of this class is updated, so it can still
+        see the prefix without the new trace. If there already is state for the key, this method does nothing.
+        :param key: a unique name for the state
+        :param initial_state: the state for the empty prefix
+        :param update_function: a function taking this object, the old state and the new variant, returning the new state
+        :return: None
+        """
+        if key not in self.measure_states:
+            self.measure_states[key] = initial_state
+            self.update_functions[key] = update_function
+
+    def state_of(self, key):
+        """
+        Returns the state registered under the passed key.
+        :param key: the name of the state
+        :return: the state registered for the key
+        """
+        return self.measure_states[key]
+
+    def shared(self, key, build_function):
+        """
+        Returns information about the current prefix that is built once and shared by everyone asking for it, for
+        example by several miners using the same directly follows graph. The information is forgotten as soon as the
+        next trace is appended, and it must not be modified by the callers.
+        :param key: a unique name for the information
+        :param build_function: a function taking this object and returning the information for the current prefix
+        :return: the information for the current prefix
+        """
+        if key not in self.shared_information:
+            self.shared_information[key] = build_function(self)
+        return self.shared_information[key]
+
+    def has_next_trace(self):
+        return self.number_of_traces < len(self.event_log)
+
+    def append_next_trace(self):
+        """
+        Extends the prefix by the next trace of the event log and updates all information about the prefix.
+        :return: the variant of the appended trace, i.e., its tuple of activities
+        """
+        variant = self.event_log.variant(self.number_of_traces)
+        for key, update_function in self.update_functions.items():
+            self.measure_states[key] = update_function(self, self.measure_states[key], variant)
+        self.shared_information = {}
+        self.number_of_traces += 1
+        self.number_of_events += len(variant)
+        self.maximum_trace_length = max(self.maximum_trace_length, len(variant))
+        if variant in self.variant_counts:
+            # a repeated variant changes neither the activities nor the directly follows relation
+            self.variant_counts[variant] += 1
+        else:
+            self.variant_counts[variant] = 1
+            self.activities.update(variant)
+        previous_activity = Constants.start_marker
+        for activity in variant + (Constants.end_marker,):
+            pair = (previous_activity, activity)
+            self.directly_follows_counts[pair] = self.directly_follows_counts.get(pair, 0) + 1
+            previous_activity = activity
+        return variant
+
+    def state(self):
+        """
+        Returns the information kept about the current prefix, such that it can be stored in a checkpoint. The event
+        log and the update functions of the measures are not part of the state.
+        :return: a dictionary containing the information about the prefix
+        """
+        return {"number of traces": self.number_of_traces,
+                "number of events": self.number_of_events,
+                "maximum trace length": self.maximum_trace_length,
+                "activities": self.activities,
+                "variant counts": self.variant_counts,
+                "directly follows counts": self.directly_follows_counts,
+                "measure states": self.measure_states}
+
+    def restore(self, state: dict):
+        """
+        Continues with the prefix described by the passed state, which was returned by the state function of an
+        incremental log of the same event log. Measures must register their updates before the state is restored.
+        :param state: a dictionary containing the information about the prefix
+        :return: None
+        """
+        self.number_of_traces = state["number of traces"]
+        self.number_of_events = state["number of events"]
+        self.maximum_trace_length = state["maximum trace length"]
+        self.activities = set(state["activities"])
+        self.variant_counts = dict(state["variant counts"])
+        self.directly_follows_counts = dict(state["directly follows counts"])
+        self.measure_states.update(state["measure states"])
+        self.shared_information = {}
+
+    def prefix(self):
+        """
+        Returns the prefix of the event log represented by this object.
+        :return: the ColumnarLog of the first traces of the event log
+        """
+        return self.event_log.prefix(self.number_of_traces)
+
+    def artifacts(self):
+        """
+        Returns the artifacts of the current prefix, where the information kept by this object is already filled in.
+        The artifacts must not be used anymore once the next trace is appended.
+        :return: the LogArtifacts of the prefix of the event log represented by this object
+        """
+        artifacts = LogArtifacts(self.prefix())
+        artifacts.preset("variant_counts", self.variant_counts)
+        artifacts.preset("activities", self.activities)
+        artifacts.preset("directly_follows_counts", self.directly_follows_counts)
+        return artifacts
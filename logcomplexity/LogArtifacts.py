@@ -0,0 +1,140 @@
+import Constants # (internal) for picking attributes in event logs and the markers of directly follows relations
+import LazyImport # (internal) for importing the code of Vidgof et al. on first use
+from logcomplexity.ColumnarLog import ColumnarLog # (internal) for reading columnar logs without pm4py objects
+from logcomplexity import DirectlyFollowsMatrix # (internal) for counting the directly follows relation of columnar logs at once
+
+LogComplexity = LazyImport.lazy_module("logcomplexity.Complexity") # (internal) for the plain log and the extended prefix automaton
+
+# the share of distinct variants among the traces of a columnar log above which the directly follows matrix is counted
+# over all events instead of over the variants, as measured with benchmarks/DirectlyFollowsGraphScaling.py
+VARIANT_SHARE_FOR_COUNTING_EVENTS = 0.25
+
+
+class LogArtifacts:
+    """
+    Keeps the information derived from an event log that is needed by several complexity measures, like the plain log,
+    the extended prefix automaton (EPA), the variants, the activities, and the directly follows relation and matrix.
+    Each piece of information is calculated when it is requested for the first time and reused afterwards, so that
+    calculating many complexity measures for the same event log builds each of them only once.
+    If the event log is a ColumnarLog, the information is read from its arrays, and the event log is only converted
+    into pm4py-format if some measure needs it.
+    """
+    def __init__(self, event_log):
+        """
+        Creates an empty cache for the passed event log.
+        :param event_log: an event log in pm4py-format, or a ColumnarLog
+        """
+        if type(event_log) == ColumnarLog:
+            self.columnar_log = event_log
+            self.event_log = None
+        else:
+            self.columnar_log = None
+            self.event_log = event_log
+        self.cache = {}
+
+    def preset(self, name: str, value):
+        """
+        Stores a piece of information that is already known, for example because it was updated incrementally.
+        :param name: the name of the method that would otherwise calculate the information
+        :param value: the information
+        :return: None
+        """
+        self.cache[name] = value
+
+    def cached(self, name: str, calculate):
+        if name not in self.cache:
+            self.cache[name] = calculate()
+        return self.cache[name]
+
+    def pm4py_log(self):
+        # the event log in pm4py-format, which is needed by the measures of Vidgof et al.
+        if self.event_log is None:
+            self.event_log = self.columnar_log.to_event_log()
+        return self.event_log
+
+    def plain_log(self):
+        return self.cached("plain_log", lambda: LogComplexity.generate_log(self.pm4py_log()))
+
+    def epa(self):
+        return self.cached("epa", lambda: LogComplexity.build_graph(self.plain_log()))
+
+    def graph_complexity(self):
+        # the variant entropy and the normalized variant entropy of the EPA
+        return self.cached("graph_complexity", lambda: LogComplexity.graph_complexity(self.epa()))
+
+    def log_complexity(self):
+        # the sequence entropy and the normalized sequence entropy of the EPA
+        return self.cached("log_complexity", lambda: LogComplexity.log_complexity(self.epa()))
+
+    def trace_length(self):
+        def calculate():
+            if self.columnar_log is None:
+                return LogComplexity.measure_trace_length(self.pm4py_log(), quiet=True)
+            trace_lengths = self.columnar_log.trace_lengths()
+            return {"min": int(trace_lengths.min()), "avg": float(trace_lengths.mean()), "max": int(trace_lengths.max())}
+        return self.cached("trace_length", calculate)
+
+    def variant_counts(self):
+        """
+        Returns the variants of the event log, i.e., the tuples of activities occurring as a trace.
+        :return: a dictionary mapping each variant to its number of traces, in the order of their first occurrence
+        """
+        def calculate():
+            if self.columnar_log is not None:
+                return self.columnar_log.variant_counts()
+            variant_counts = {}
+            for trace in self.event_log:
+                variant = tuple(event[Constants.activity_specifier] for event in trace)
+                variant_counts[variant] = variant_counts.get(variant, 0) + 1
+            return variant_counts
+        return self.cached("variant_counts", calculate)
+
+    def activities(self):
+        def calculate():
+            activities = set()
+            for variant in self.variant_counts():
+                activities.update(variant)
+            return activities
+        return self.cached("activities", calculate)
+
+    def directly_follows_counts(self):
+        """
+        Returns the directly follows relation of the event log, where the first activity of a trace follows
+        Constants.start_marker and Constants.end_marker follows the last activity of a trace.
+        :return: a dictionary mapping each pair (a, b) to the number of times b directly follows a in the event log
+        """
+        def calculate():
+            directly_follows_counts = {}
+            for variant, count in self.variant_counts().items():
+                previous_activity = Constants.start_marker
+                for activity in variant + (Constants.end_marker,):
+                    pair = (previous_activity, activity)
+                    directly_follows_counts[pair] = directly_follows_counts.get(pair, 0) + count
+                    previous_activity = activity
+            return directly_follows_counts
+        return self.cached("directly_follows_counts", calculate)
+
+    def directly_follows_matrix(self):
+        def calculate():
+            if self.columnar_log is None:
+                # the activities get their ids in the order of their first occurrence, like in a ColumnarLog
+                activity_names = list(dict.fromkeys(activity for variant in self.variant_counts() for activity in variant))
+                return DirectlyFollowsMatrix.from_directly_follows_counts(activity_names, self.directly_follows_counts())
+            # the columnar log already knows its variants, so walking the variants is faster than counting the pairs
+            # of all events, unless most traces follow a variant of their own
+            if VARIANT_SHARE_FOR_COUNTING_EVENTS * len(self.columnar_log) < len(self.variant_counts()):
+                return DirectlyFollowsMatrix.from_columnar_log(self.columnar_log)
+            return DirectlyFollowsMatrix.from_directly_follows_counts(self.columnar_log.activity_names, self.directly_follows_counts())
+        return self.cached("directly_follows_matrix", calculate)
+
+
+def artifacts_of(event_log):
+    """
+    Returns the artifacts of the passed event log. If the passed object already is a LogArtifacts, it is returned
+    as it is, so that complexity measures can be called with both event logs and their artifacts.
+    :param event_log: an event log in pm4py-format, a ColumnarLog, or its LogArtifacts
+    :return: the LogArtifacts of the event log
+    """
+    if type(event_log) == LogArtifacts:
+        return event_log
+    return LogArtifacts(event_log)
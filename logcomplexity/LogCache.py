@@ -0,0 +1,159 @@
+import os # for file sizes, modification times and paths
+import json # for storing the metadata of cached event logs
+import hashlib # for identifying event logs by their content
+import shutil # for removing the arrays of replaced imports
+import tempfile # for creating a new folder for the arrays of each import
+import time # for finding the arrays of imports that were replaced long ago
+import numpy # for storing the arrays of columnar logs in .npy-files, which can be memory-mapped
+
+import Constants # (internal) for the path of the output folder
+from logcomplexity import ColumnarLog, XesImporter # (internal) for importing event logs that are not cached yet
+
+# the folder in which imported event logs are cached
+CACHE_PATH = Constants.OUTPUT_PATH + "log-cache/"
+# the name of the file mapping the path, size and modification time of an event log to the hash of its content
+INDEX_FILENAME = "index.json"
+# the arrays of a columnar log that are stored in .npy-files
+ARRAY_NAMES = ["activities", "offsets", "variant_ids", "first_occurrences"]
+# the prefix of the folders containing the arrays of an import of an event log
+ARRAYS_PREFIX = "arrays-"
+# the number of times a cached log is loaded again if another process replaced its arrays while it was loaded
+ATTEMPTS_TO_LOAD = 3
+# the number of seconds after which the arrays of an import that log.json does not name are removed
+STALE_ARRAYS_AGE = 60
+
+
+def content_hash_of(filename: str):
+    content_hash = hashlib.blake2b(digest_size=16)
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            content_hash.update(block)
+    return content_hash.hexdigest()
+
+def file_key_of(filename: str):
+    # a file that was neither moved nor modified keeps its key, so its content does not need to be hashed again
+    status = os.stat(filename)
+    return os.path.abspath(filename) + "|" + str(status.st_size) + "|" + str(status.st_mtime_ns)
+
+def read_index(cache_path: str):
+    index_filename = os.path.join(cache_path, INDEX_FILENAME)
+    if not os.path.exists(index_filename):
+        return {}
+    with open(index_filename) as index_file:
+        return json.load(index_file)
+
+def write_index(cache_path: str, index: dict):
+    # temporary files are named after the process, since several processes may import event logs at the same time
+    temporary_filename = os.path.join(cache_path, INDEX_FILENAME + "." + str(os.getpid()) + ".tmp")
+    with open(temporary_filename, "w") as index_file:
+        json.dump(index, index_file)
+    os.replace(temporary_filename, os.path.join(cache_path, INDEX_FILENAME))
+
+def read_metadata(entry_path: str):
+    metadata_filename = os.path.join(entry_path, "log.json")
+    if not os.path.exists(metadata_filename):
+        return {}
+    with open(metadata_filename) as metadata_file:
+        return json.load(metadata_file)
+
+def load_columnar_log(entry_path: str):
+    """
+    Loads a cached columnar log, where the arrays are memory-mapped instead of read. The file log.json names the
+    folder of the arrays, so all arrays belong to the same import even if another process replaces the entry.
+    :param entry_path: the folder of the cached event log
+    :return: the metadata of the cached event log, and its ColumnarLog
+    """
+    metadata = read_metadata(entry_path)
+    if "arrays" not in metadata:
+        # the event log is not cached yet, or the entry stems from an earlier version, which stored the arrays next to
+        # log.json, and is imported again
+        raise FileNotFoundError("The cached event log in " + entry_path + " does not name the folder of its arrays.")
+    arrays_path = os.path.join(entry_path, metadata["arrays"])
+    arrays = {name: numpy.load(os.path.join(arrays_path, name + ".npy"), mmap_mode="r") for name in ARRAY_NAMES}
+    activity_names = metadata["activity names"]
+    activities = arrays["activities"]
+    offsets = arrays["offsets"]
+    # the variants are the traces where they occur for the first time
+    variants = []
+    for trace_index in arrays["first_occurrences"]:
+        trace = activities[offsets[trace_index]:offsets[trace_index + 1]]
+        variants += [tuple(activity_names[activity] for activity in trace)]
+    columnar_log = ColumnarLog.ColumnarLog(activity_names, activities, offsets, arrays["variant_ids"], variants,
+                                           arrays["first_occurrences"], case_ids=metadata["case ids"])
+    return metadata, columnar_log
+
+def store_columnar_log(entry_path: str, columnar_log: ColumnarLog.ColumnarLog, complete: bool):
+    os.makedirs(entry_path, exist_ok=True)
+    # the arrays are written into a new folder, which no other process reads before log.json names it
+    temporary_path = tempfile.mkdtemp(prefix=ARRAYS_PREFIX, suffix="." + str(os.getpid()) + ".tmp", dir=entry_path)
+    for name in ARRAY_NAMES:
+        numpy.save(os.path.join(temporary_path, name + ".npy"), numpy.asarray(getattr(columnar_log, name)))
+    arrays_path = temporary_path[:-len(".tmp")]
+    os.rename(temporary_path, arrays_path)
+    metadata = {"number of traces": columnar_log.number_of_traces,
+                "complete": complete,
+                "activity names": columnar_log.activity_names,
+                "case ids": columnar_log.case_ids,
+                "arrays": os.path.basename(arrays_path)}
+    # replacing log.json switches readers to the new arrays in a single step
+    replaced_folder = read_metadata(entry_path).get("arrays")
+    temporary_filename = os.path.join(entry_path, "log.json." + str(os.getpid()) + ".tmp")
+    with open(temporary_filename, "w") as metadata_file:
+        json.dump(metadata, metadata_file)
+    os.replace(temporary_filename, os.path.join(entry_path, "log.json"))
+    remove_replaced_arrays(entry_path, replaced_folder, os.path.basename(arrays_path))
+
+def remove_replaced_arrays(entry_path: str, replaced_folder, current_folder: str):
+    # other folders may have been written by processes that did not switch to them yet, so they are only removed
+    # once they are old; arrays that are still memory-mapped (which cannot be removed on Windows) are kept
+    for folder in os.listdir(entry_path):
+        if not folder.startswith(ARRAYS_PREFIX) or folder == current_folder:
+            continue
+        folder_path = os.path.join(entry_path, folder)
+        try:
+            replaced = folder == replaced_folder or time.time() - os.path.getmtime(folder_path) > STALE_ARRAYS_AGE
+        except FileNotFoundError:
+            continue
+        if replaced:
+            shutil.rmtree(folder_path, ignore_errors=True)
+
+def import_cached_columnar_log(filename: str, maximum_number_of_traces=None, cache_path=CACHE_PATH):
+    """
+    Imports an event log from an .xes-file like XesImporter.import_columnar_log, but keeps the imported log in a
+    cache in the output folder. A cached log is found by the path, size and modification time of the file, or,
+    if the file was moved or touched, by the hash of its content. If the cached log contains enough traces, its
+    arrays are memory-mapped, so the file does not need to be parsed again.
+    :param filename: the file-path to the .xes-file
+    :param maximum_number_of_traces: the number of traces that should be read, or None if all traces should be read
+    :param cache_path: the folder containing the cached event logs
+    :return: the ColumnarLog of the (first traces of the) event log
+    """
+    os.makedirs(cache_path, exist_ok=True)
+    index = read_index(cache_path)
+    file_key = file_key_of(filename)
+    content_hash = index.get(file_key)
+    if content_hash is None or not os.path.exists(os.path.join(cache_path, content_hash)):
+        content_hash = content_hash_of(filename)
+        index[file_key] = content_hash
+        write_index(cache_path, index)
+    entry_path = os.path.join(cache_path, content_hash)
+    metadata = None
+    for _ in range(ATTEMPTS_TO_LOAD):
+        try:
+            metadata, columnar_log = load_columnar_log(entry_path)
+            break
+        except FileNotFoundError:
+            # the log is not cached yet, or its arrays were replaced by another process after log.json was read
+            pass
+    if metadata is not None:
+        if metadata["complete"]:
+            if maximum_number_of_traces is None:
+                return columnar_log
+            return columnar_log.prefix(maximum_number_of_traces)
+        if maximum_number_of_traces is not None and maximum_number_of_traces <= metadata["number of traces"]:
+            return columnar_log.prefix(maximum_number_of_traces)
+    # the event log was not cached yet, or the cached log does not contain enough traces
+    columnar_log = XesImporter.import_columnar_log(filename, maximum_number_of_traces)
+    complete = maximum_number_of_traces is None or len(columnar_log) < maximum_number_of_traces
+    store_columnar_log(entry_path, columnar_log, complete)
+    return columnar_log
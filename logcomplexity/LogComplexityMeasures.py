@@ -1,5 +1,10 @@
-from logcomplexity import Complexity as LogComplexity
+import Constants
+import LazyImport
 from logcomplexity import MoreLogComplexity
+from logcomplexity import DirectlyFollowsMatrix # (internal) for the directly follows relation shared with the alpha miner
+from logcomplexity.LogArtifacts import artifacts_of # (internal) for sharing information about a log between measures
+
+LogComplexity = LazyImport.lazy_module("logcomplexity.Complexity")
 
 class Magnitude:
     name = "Magnitude"
@@ -9,7 +14,13 @@ class Magnitude:
         return self.name
 
     def calculate_for(self, event_log):
-        return LogComplexity.measure_magnitude(event_log, quiet=True)
+        artifacts = artifacts_of(event_log)
+        if artifacts.columnar_log is not None:
+            return artifacts.columnar_log.number_of_events
+        return LogComplexity.measure_magnitude(artifacts.pm4py_log(), quiet=True)
+
+    def calculate_incrementally(self, incremental_log):
+        return incremental_log.number_of_events
 
 class Variety:
     name = "Variety"
@@ -19,7 +30,13 @@ class Variety:
         return self.name
 
     def calculate_for(self, event_log):
-        return LogComplexity.measure_variety(event_log, quiet=True)
+        artifacts = artifacts_of(event_log)
+        if artifacts.columnar_log is not None:
+            return len(artifacts.activities())
+        return LogComplexity.measure_variety(artifacts.pm4py_log(), quiet=True)
+
+    def calculate_incrementally(self, incremental_log):
+        return len(incremental_log.activities)
 
 class Support:
     name = "Support / Length"
@@ -29,7 +46,13 @@ class Support:
         return self.name
 
     def calculate_for(self, event_log):
-        return LogComplexity.measure_support(event_log, quiet=True)
+        artifacts = artifacts_of(event_log)
+        if artifacts.columnar_log is not None:
+            return artifacts.columnar_log.number_of_traces
+        return LogComplexity.measure_support(artifacts.pm4py_log(), quiet=True)
+
+    def calculate_incrementally(self, incremental_log):
+        return incremental_log.number_of_traces
 
 class AverageTraceLength:
     name = "Average trace length"
@@ -39,9 +62,12 @@ class AverageTraceLength:
         return self.name
 
     def calculate_for(self, event_log, decimals=8):
-        trace_length = LogComplexity.measure_trace_length(event_log, quiet=True)
+        trace_length = artifacts_of(event_log).trace_length()
         return round(trace_length["avg"], decimals)
 
+    def calculate_incrementally(self, incremental_log, decimals=8):
+        return round(incremental_log.number_of_events / incremental_log.number_of_traces, decimals)
+
 class MaximumTraceLength:
     name = "Maximum trace length"
     abbreviation = "TL-max"
@@ -50,9 +76,12 @@ class MaximumTraceLength:
         return self.name
 
     def calculate_for(self, event_log):
-        trace_length = LogComplexity.measure_trace_length(event_log, quiet=True)
+        trace_length = artifacts_of(event_log).trace_length()
         return trace_length["max"]
 
+    def calculate_incrementally(self, incremental_log):
+        return incremental_log.maximum_trace_length
+
 class LevelOfDetail:
     name = "Level of detail"
     abbreviation = "LOD"
@@ -61,7 +90,12 @@ class LevelOfDetail:
         return self.name
 
     def calculate_for(self, event_log):
-        return MoreLogComplexity.measure_number_of_transition_paths(event_log)
+        directly_follows_pairs = artifacts_of(event_log).directly_follows_counts().keys()
+        return MoreLogComplexity.count_transition_paths(directly_follows_pairs, Constants.start_marker, Constants.end_marker)
+
+    def calculate_incrementally(self, incremental_log):
+        directly_follows_pairs = incremental_log.directly_follows_counts.keys()
+        return MoreLogComplexity.count_transition_paths(directly_follows_pairs, Constants.start_marker, Constants.end_marker)
 
 class NumberOfTies:
     name = "Number of ties"
@@ -71,7 +105,12 @@ class NumberOfTies:
         return self.name
 
     def calculate_for(self, event_log, decimals=8):
-        return round(MoreLogComplexity.measure_number_of_ties(event_log), decimals)
+        return round(artifacts_of(event_log).directly_follows_matrix().number_of_ties(), decimals)
+
+    def calculate_incrementally(self, incremental_log, decimals=8):
+        # the matrix is shared with the alpha miner if both are analyzed in the same pass
+        directly_follows_matrix = incremental_log.shared("directly follows matrix", DirectlyFollowsMatrix.shared_directly_follows_matrix)
+        return round(directly_follows_matrix.number_of_ties(), decimals)
 
 class LempelZiv:
     name = "Lempel-Ziv complexity"
@@ -81,7 +120,7 @@ class LempelZiv:
         return self.name
 
     def calculate_for(self, event_log):
-        plain_log = LogComplexity.generate_log(event_log)
+        plain_log = artifacts_of(event_log).plain_log()
         return LogComplexity.measure_lempel_ziv(plain_log, quiet=True)
 
 class NumberOfDistinctTraces:
@@ -92,9 +131,10 @@ class NumberOfDistinctTraces:
         return self.name
 
     def calculate_for(self, event_log):
-        support = LogComplexity.measure_support(event_log, quiet=True)
-        distinct_trace_percentage = LogComplexity.measure_distinct_traces(event_log, quiet=True) / 100
-        return round(distinct_trace_percentage * support)
+        return len(artifacts_of(event_log).variant_counts())
+
+    def calculate_incrementally(self, incremental_log):
+        return len(incremental_log.variant_counts)
 
 class PercentageOfDistinctTraces:
     name = "Percentage of distinct traces"
@@ -104,9 +144,15 @@ class PercentageOfDistinctTraces:
         return self.name
 
     def calculate_for(self, event_log, decimals=8):
-        distinct_trace_percentage = LogComplexity.measure_distinct_traces(event_log, quiet=True) / 100
+        artifacts = artifacts_of(event_log)
+        if artifacts.columnar_log is not None:
+            return round(len(artifacts.variant_counts()) / artifacts.columnar_log.number_of_traces, decimals)
+        distinct_trace_percentage = LogComplexity.measure_distinct_traces(artifacts.pm4py_log(), quiet=True) / 100
         return round(distinct_trace_percentage, decimals)
 
+    def calculate_incrementally(self, incremental_log, decimals=8):
+        return round(len(incremental_log.variant_counts) / incremental_log.number_of_traces, decimals)
+
 class Structure:
     name = "Structure"
     abbreviation = "struct"
@@ -117,7 +163,7 @@ class Structure:
     def calculate_for(self, event_log, decimals=8):
         # In the code of Vidgof et al., the calculation of the level of detail corresponds to the definition
         # of the structure, which is why we return the result of the level of detail.
-        return round(LogComplexity.measure_level_of_detail(event_log, quiet=True), decimals)
+        return round(LogComplexity.measure_level_of_detail(artifacts_of(event_log).pm4py_log(), quiet=True), decimals)
 
 class Affinity:
     name = "Affinity"
@@ -127,7 +173,7 @@ class Affinity:
         return self.name
 
     def calculate_for(self, event_log, decimals=8):
-        affinity = LogComplexity.measure_affinity(event_log, quiet=True)
+        affinity = LogComplexity.measure_affinity(artifacts_of(event_log).pm4py_log(), quiet=True)
         if affinity is None:
             # Affinity can become None if there is only a single trace in the event log.
             # In this case, rounding the result is not possible.
@@ -143,8 +189,8 @@ class DeviationFromRandom:
         return self.name
 
     def calculate_for(self, event_log, decimals=8):
-        plain_log = LogComplexity.generate_log(event_log)
-        deviation_from_random = LogComplexity.measure_deviation_from_random(plain_log, event_log, quiet=True)
+        artifacts = artifacts_of(event_log)
+        deviation_from_random = LogComplexity.measure_deviation_from_random(artifacts.plain_log(), artifacts.pm4py_log(), quiet=True)
         if deviation_from_random is None:
             # Deviation from random can become None if all traces consist of at most one event name.
             # In this case, rounding the result is not possible.
@@ -160,7 +206,20 @@ class AverageEditDistance:
         return self.name
 
     def calculate_for(self, event_log, decimals=8):
-        return round(MoreLogComplexity.measure_average_edit_distance(event_log), decimals)
+        variant_counts = artifacts_of(event_log).variant_counts()
+        return round(MoreLogComplexity.average_edit_distance_for_variants(variant_counts), decimals)
+
+    def register_incremental_update(self, incremental_log):
+        def update(log, edit_distance_sum, variant):
+            return MoreLogComplexity.update_edit_distance_sum(edit_distance_sum, log.variant_counts, variant)
+        incremental_log.register_update(self.abbreviation, 0, update)
+
+    def calculate_incrementally(self, incremental_log, decimals=8):
+        number_of_traces = incremental_log.number_of_traces
+        if number_of_traces < 2:
+            return 0
+        edit_distance_sum = incremental_log.state_of(self.abbreviation)
+        return round(edit_distance_sum / (number_of_traces * (number_of_traces - 1)), decimals)
 
 class VariantEntropy:
     name = "Variant entropy"
@@ -170,9 +229,7 @@ class VariantEntropy:
         return self.name
 
     def calculate_for(self, event_log, decimals=8):
-        plain_log = LogComplexity.generate_log(event_log)
-        epa = LogComplexity.build_graph(plain_log)
-        return round(LogComplexity.graph_complexity(epa)[0], decimals)
+        return round(artifacts_of(event_log).graph_complexity()[0], decimals)
 
 class NormalizedVariantEntropy:
     name = "Normalized variant entropy"
@@ -182,9 +239,7 @@ class NormalizedVariantEntropy:
         return self.name
 
     def calculate_for(self, event_log, decimals=8):
-        plain_log = LogComplexity.generate_log(event_log)
-        epa = LogComplexity.build_graph(plain_log)
-        return round(LogComplexity.graph_complexity(epa)[1], decimals)
+        return round(artifacts_of(event_log).graph_complexity()[1], decimals)
 
 class SequenceEntropy:
     name = "Sequence Entropy"
@@ -194,9 +249,7 @@ class SequenceEntropy:
         return self.name
 
     def calculate_for(self, event_log, decimals=8):
-        plain_log = LogComplexity.generate_log(event_log)
-        epa = LogComplexity.build_graph(plain_log)
-        return round(LogComplexity.log_complexity(epa)[0], decimals)
+        return round(artifacts_of(event_log).log_complexity()[0], decimals)
 
 class NormalizedSequenceEntropy:
     name = "Normalized sequence entropy"
@@ -206,9 +259,7 @@ class NormalizedSequenceEntropy:
         return self.name
 
     def calculate_for(self, event_log, decimals=8):
-        plain_log = LogComplexity.generate_log(event_log)
-        epa = LogComplexity.build_graph(plain_log)
-        return round(LogComplexity.log_complexity(epa)[1], decimals)
+        return round(artifacts_of(event_log).log_complexity()[1], decimals)
 
 
 # To add more log complexity measures:
@@ -216,7 +267,13 @@ class NormalizedSequenceEntropy:
 #    the log complexity measure, shown when the user can choose log complexity measures, and "abbreviation",
 #    which is a short name for the measure shown in the tables of the analysis. Furthermore, your class must
 #    implement the functions __str__ (returning the name of the measure) and calculate_for, which takes an
-#    event log and calculates the result of your measure for this log.
+#    event log and calculates the result of your measure for this log. The event log may also be passed as
+#    ColumnarLog or as LogArtifacts; use artifacts_of(event_log) to access the information shared between measures,
+#    its columnar_log (if there is one), and pm4py_log() for the event log in pm4py-format.
+#    Optionally, your class can implement calculate_incrementally, which takes an IncrementalLog and calculates the
+#    result of your measure for its current prefix, using the information kept by the IncrementalLog. If your measure
+#    needs additional information about the prefix, implement register_incremental_update, which registers this
+#    information at the IncrementalLog together with a function updating it whenever a trace is appended.
 # 2. Add an instance of your new class to the following list of all log complexity measures.
 
 all_log_complexity_measures = [Magnitude(), Variety(), Support(), AverageTraceLength(), MaximumTraceLength(),
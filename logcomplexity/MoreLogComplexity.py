@@ -1,10 +1,21 @@
-import networkx
-from logcomplexity import Complexity as LogComplexity
+import os # for the number of available CPUs
+from concurrent.futures import ProcessPoolExecutor # for comparing the variants of large event logs in parallel
+import LazyImport
+import TimeBudget # (internal) for reporting the number of paths counted so far
+from logcomplexity.ColumnarLog import ColumnarLog # (internal) for reading the variants of columnar logs
+from logcomplexity import DirectlyFollowsMatrix # (internal) for counting ties on the directly follows matrix
+from modelcomplexity import GraphAlgorithms # (internal) for sorting directly follows graphs topologically
+
+networkx = LazyImport.lazy_module("networkx")
+LogComplexity = LazyImport.lazy_module("logcomplexity.Complexity")
 
 case_specifier = 'case:concept:name'
 activity_specifier = 'concept:name'
 timestamp_specifier = 'time:timestamp'
 
+# the number of variants from which on the average edit distance is calculated in parallel
+PARALLEL_VARIANT_THRESHOLD = 1000
+
 def measure_number_of_ties(pm4py_log):
     """
     Counts the amount of directly follows relations in the transition matrix.
@@ -20,42 +31,9 @@ def measure_number_of_ties(pm4py_log):
     :param pm4py_log: An event log in pm4py-format
     :return: The number of directly follows relations in the event log
     """
-    # define symbols for the causal footprint relations
-    follows = '->' # e1 is followed by e2 in some trace, but e2 is never followed by e1 in a trace
-    precedes = '<-' # e2 is followed by e1 in some trace, but e1 is never followed by e2 in a trace
-    parallel = '||' # e1 is followed by e2 in some trace, and e2 is followed by e1 in some trace
-    incomparable = '#' # e1 is never followed by e2 in a trace, and e2 is never followed by e1 in a trace
-    # calculate the set of events
-    events = set()
-    events_per_case = LogComplexity.aux_event_classes(pm4py_log)
-    for case in events_per_case.keys():
-        events = events.union(events_per_case[case])
-    # initialize the causal footprint with only 'incomparable'-entries
-    causal_footprint = {}
-    for event in events:
-        causal_footprint[event] = {}
-        for other_event in events:
-            causal_footprint[event][other_event] = incomparable
-    # enrich the causal footprint with the correct relations between events
-    for trace in pm4py_log:
-        for i in range(len(trace)-1):
-            e1 = trace[i][activity_specifier]
-            e2 = trace[i+1][activity_specifier]
-            if e1 == e2:
-                causal_footprint[e1][e2] = parallel
-            elif causal_footprint[e1][e2] == precedes:
-                causal_footprint[e1][e2] = parallel
-                causal_footprint[e2][e1] = parallel
-            elif causal_footprint[e1][e2] == incomparable:
-                causal_footprint[e1][e2] = follows
-                causal_footprint[e2][e1] = precedes
-    # count the number of follows relations in the causal footprint
-    number_of_ties = 0
-    for event1 in events:
-        for event2 in events:
-            if causal_footprint[event1][event2] == follows:
-                number_of_ties += 1
-    return number_of_ties
+    # the "->" entries of the causal footprint are the pairs of the directly follows matrix whose transposed pair is
+    # missing, so they are counted from the matrix of the integer-encoded log
+    return DirectlyFollowsMatrix.directly_follows_matrix_of(pm4py_log).number_of_ties()
 
 def measure_number_of_transition_paths(pm4py_log):
     """
@@ -91,37 +69,261 @@ def measure_number_of_transition_paths(pm4py_log):
             directly_follows_graph.add_edge(trace[i][activity_specifier], trace[i+1][activity_specifier])
         # add an edge from the end event of this trace to the end node
         directly_follows_graph.add_edge(trace[-1][activity_specifier], end)
-    # calculate all simple paths from the start node to the end node and return the amount of paths found this way
-    return len(list(networkx.all_simple_paths(directly_follows_graph, start, end)))
+    # count all simple paths from the start node to the end node
+    return count_simple_paths(directly_follows_graph.edges, start, end)
+
+def count_transition_paths(directly_follows_pairs, start, end, workers=1):
+    """
+    Calculates the amount of acyclic paths from start to end in the directly follows graph whose edges are the
+    passed pairs. This yields the same result as measure_number_of_transition_paths on any event log with this
+    directly follows relation, if the pairs contain an edge from start to each first event of a trace and an edge
+    from each last event of a trace to end.
+    :param directly_follows_pairs: a collection of pairs (e1, e2) such that e2 directly follows e1 in some trace
+    :param start: the node marking the start of the traces
+    :param end: the node marking the end of the traces
+    :param workers: the number of processes used to count the paths of cyclic graphs, where 1 means that no processes are started
+    :return: The number of acyclic paths in the directly follows graph
+    """
+    return count_simple_paths(directly_follows_pairs, start, end, workers)
+
+def count_simple_paths(edges, start, end, workers=1):
+    """
+    Counts the simple paths from start to end in a directed graph without enumerating them. Only the nodes that lie
+    on some path from start to end matter, where edges into start, out of end, and self-loops can never be used. If
+    these nodes form an acyclic graph, the number of paths to each node is the sum over its predecessors, which takes
+    linear time. Otherwise, the paths are counted by a depth first search that stores the nodes of the current path
+    as a bitset, so the memory does not depend on the number of paths (see count_simple_paths_from).
+    :param edges: a collection of pairs (u, v) for the edges of the graph
+    :param start: the node where the paths start
+    :param end: the node where the paths end
+    :param workers: the number of processes used for cyclic graphs, each counting the paths that begin with some of
+                    the edges leaving start, where 1 means that no processes are started
+    :return: The number of simple paths from start to end
+    """
+    if start == end:
+        return 1
+    node_ids = {start: 0, end: 1}
+    adjacency = [[], []]
+    for source, target in set(edges):
+        if source == target or source == end or target == start:
+            continue
+        for node in (source, target):
+            if node not in node_ids:
+                node_ids[node] = len(adjacency)
+                adjacency.append([])
+        adjacency[node_ids[source]].append(node_ids[target])
+    # remove the nodes that cannot be reached from start or cannot reach end
+    relevant = reachable_nodes(adjacency, 0)
+    predecessors = [[] for _ in adjacency]
+    for source in range(len(adjacency)):
+        for target in adjacency[source]:
+            predecessors[target].append(source)
+    relevant &= reachable_nodes(predecessors, 1)
+    if 1 not in relevant:
+        return 0
+    adjacency = [[target for target in adjacency[source] if target in relevant] if source in relevant else []
+                 for source in range(len(adjacency))]
+    order = GraphAlgorithms.topological_order(adjacency)
+    if order is not None:
+        number_of_paths = [0] * len(adjacency)
+        number_of_paths[0] = 1
+        for node in order:
+            for successor in adjacency[node]:
+                number_of_paths[successor] += number_of_paths[node]
+        return number_of_paths[1]
+    if workers <= 1 or len(adjacency[0]) < 2:
+        return count_simple_paths_from([0], adjacency)
+    with ProcessPoolExecutor(max_workers=workers, initializer=initialize_path_counting_worker, initargs=(adjacency,)) as executor:
+        return sum(executor.map(count_simple_paths_from_worker, [[0, successor] for successor in adjacency[0]]))
+
+def reachable_nodes(adjacency: list, source: int):
+    reachable = {source}
+    stack = [source]
+    while len(stack) > 0:
+        for successor in adjacency[stack.pop()]:
+            if successor not in reachable:
+                reachable.add(successor)
+                stack.append(successor)
+    return reachable
+
+# the adjacency lists used by the processes of a process pool counting paths, set once per process
+worker_adjacency = None
+
+def initialize_path_counting_worker(adjacency):
+    global worker_adjacency
+    worker_adjacency = adjacency
+
+def count_simple_paths_from_worker(path):
+    return count_simple_paths_from(path, worker_adjacency)
+
+def count_simple_paths_from(path: list, adjacency: list):
+    """
+    Counts the simple paths to node 1 that extend the passed path by a depth first search, where bit i of the
+    visited bitset is set if node i lies on the current path. The number of paths counted so far is reported to
+    TimeBudget as a lower bound.
+    :param path: a simple path starting in node 0, which does not contain node 1
+    :param adjacency: a list containing, for each node, the list of its successors, where each node lies on a path from 0 to 1
+    :return: The number of simple paths from 0 to 1 that start with the passed path
+    """
+    if path[-1] == 1:
+        return 1
+    path = list(path)
+    visited = 0
+    for node in path:
+        visited |= 1 << node
+    number_of_paths = 0
+    expansions = 0
+    # the iterators over the successors of the nodes on the current path, where the last one belongs to its end
+    successors = [iter(adjacency[path[-1]])]
+    while len(successors) > 0:
+        for successor in successors[-1]:
+            if visited >> successor & 1:
+                continue
+            if successor == 1:
+                number_of_paths += 1
+                continue
+            path.append(successor)
+            visited |= 1 << successor
+            successors.append(iter(adjacency[successor]))
+            break
+        else:
+            # all extensions of the current path were counted, so the search continues with its prefix
+            successors.pop()
+            visited &= ~(1 << path.pop())
+        expansions += 1
+        if expansions % 1024 == 0:
+            TimeBudget.report_bounds(number_of_paths, None)
+    return number_of_paths
+
+def match_masks(trace):
+    """
+    Calculates the match masks of a sequence of activities for the bit-parallel computation of longest common
+    subsequences. The mask of an activity has the i-th bit set if the i-th entry of the sequence is this activity.
+    :param trace: a sequence of activities
+    :return: a dictionary mapping each activity in the sequence to its match mask
+    """
+    masks = {}
+    for position, activity in enumerate(trace):
+        masks[activity] = masks.get(activity, 0) | (1 << position)
+    return masks
+
+def longest_common_subsequence_length(masks, length, trace):
+    """
+    Calculates the length of a longest common subsequence of two sequences with the bit-parallel algorithm of
+    Hyyrö, which processes one row of the dynamic programming table of the first sequence per integer operation.
+    The zero bits of the row vector mark the positions where the length of the common subsequence increases.
+    :param masks: the match masks of the first sequence, as calculated by match_masks
+    :param length: the length of the first sequence
+    :param trace: the second sequence
+    :return: The length of a longest common subsequence of both sequences
+    """
+    all_ones = (1 << length) - 1
+    row = all_ones
+    for activity in trace:
+        matches = row & masks.get(activity, 0)
+        row = ((row + matches) | (row - matches)) & all_ones
+    return length - row.bit_count()
+
+def edit_distance(trace1, trace2):
+    """
+    Calculates the edit distance between two sequences of activities, where only insertions and deletions are allowed.
+    Every activity that is not part of a longest common subsequence must be deleted from trace1 or inserted into it.
+    :param trace1: a sequence of activities
+    :param trace2: a sequence of activities
+    :return: The minimum number of insert- and delete-operations needed to transform trace1 into trace2
+    """
+    common_length = longest_common_subsequence_length(match_masks(trace1), len(trace1), trace2)
+    return len(trace1) + len(trace2) - 2 * common_length
+
+# the encoded variants and their counts used by the processes of a process pool, set once per process
+worker_variants = None
+worker_counts = None
+
+def initialize_edit_distance_worker(variants, counts):
+    global worker_variants, worker_counts
+    worker_variants = variants
+    worker_counts = counts
+
+def edit_distance_sum_for_rows(rows):
+    return sum(edit_distance_sum_for_row(row, worker_variants, worker_counts) for row in rows)
+
+def edit_distance_sum_for_row(row, variants, counts):
+    """
+    Sums up the edit distances between all traces of one variant and all traces of the variants with a higher index.
+    :param row: the index of the variant
+    :param variants: a list of variants, where each variant is a tuple of integer-encoded activities
+    :param counts: a list containing the number of traces for each variant
+    :return: The sum of edit distances between the traces of the variant and the traces of all later variants
+    """
+    variant = variants[row]
+    masks = match_masks(variant)
+    edit_distance_sum = 0
+    for other in range(row + 1, len(variants)):
+        common_length = longest_common_subsequence_length(masks, len(variant), variants[other])
+        edit_distance_sum += counts[other] * (len(variant) + len(variants[other]) - 2 * common_length)
+    return counts[row] * edit_distance_sum
 
-def measure_average_edit_distance(pm4py_log):
+def measure_average_edit_distance(pm4py_log, workers=None):
     """
     Calculates the average edit distance between two traces of the event log.
     The edit distance of two words u and v is the amount of insert- and delete-operations
     needed to transform u into v. For example, to transform u = abcd into v = acbd, we would need
     to delete the first 'b' of u and insert a 'b' after the symbol 'c' of u, leading to 2 operations.
-    :param pm4py_log: An event log in pm4py-format
+    Since traces of the same variant have distance 0, this method only compares pairs of distinct
+    variants and weights their distance by the number of trace pairs they stand for. For large
+    numbers of variants, the comparisons are distributed over a process pool.
+    :param pm4py_log: An event log in pm4py-format, or a ColumnarLog
+    :param workers: The number of processes used for large numbers of variants, by default the number of CPUs
     :return: The average edit distance between two traces in the event log
     """
-    def edit_distance(trace1, trace2):
-        if len(trace1) == 0:
-            return len(trace2)
-        elif len(trace2) == 0:
-            return len(trace1)
-        else:
-            if trace1[0][activity_specifier] == trace2[0][activity_specifier]:
-                return edit_distance(trace1[1:], trace2[1:])
-            else:
-                delete = edit_distance(trace1[1:], trace2)
-                insert = edit_distance(trace1, trace2[1:])
-                return 1 + min(delete, insert)
-    edit_distance_sum = 0
-    total_entries = 0
-    for first_trace in pm4py_log:
-        for second_trace in pm4py_log:
-            if first_trace != second_trace:
-                edit_distance_sum += edit_distance(first_trace, second_trace)
-                total_entries += 1
-    if total_entries == 0:
+    if type(pm4py_log) == ColumnarLog:
+        return average_edit_distance_for_variants(pm4py_log.variant_counts(), workers)
+    variant_counts = {}
+    for trace in pm4py_log:
+        variant = tuple(event[activity_specifier] for event in trace)
+        variant_counts[variant] = variant_counts.get(variant, 0) + 1
+    return average_edit_distance_for_variants(variant_counts, workers)
+
+def average_edit_distance_for_variants(variant_counts: dict, workers=None):
+    """
+    Calculates the average edit distance between two traces of an event log from its variants.
+    :param variant_counts: a dictionary mapping each variant of the event log to its number of traces
+    :param workers: The number of processes used for large numbers of variants, by default the number of CPUs
+    :return: The average edit distance between two traces in the event log
+    """
+    number_of_traces = sum(variant_counts.values())
+    if number_of_traces < 2:
         return 0
-    return edit_distance_sum / total_entries
\ No newline at end of file
+    # encode the activities as integers
+    activity_codes = {}
+    variants = []
+    for variant in variant_counts.keys():
+        variants += [tuple(activity_codes.setdefault(activity, len(activity_codes)) for activity in variant)]
+    counts = list(variant_counts.values())
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(variants) < PARALLEL_VARIANT_THRESHOLD:
+        edit_distance_sum = sum(edit_distance_sum_for_row(row, variants, counts) for row in range(len(variants)))
+    else:
+        # interleave the rows, since the rows with small indices contain more comparisons
+        chunks = [range(offset, len(variants), workers) for offset in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=initialize_edit_distance_worker, initargs=(variants, counts)) as executor:
+            edit_distance_sum = sum(executor.map(edit_distance_sum_for_rows, chunks))
+    # each unordered pair of variants stands for two ordered pairs of traces
+    return 2 * edit_distance_sum / (number_of_traces * (number_of_traces - 1))
+
+def update_edit_distance_sum(edit_distance_sum, variant_counts, new_variant):
+    """
+    Updates the sum of edit distances between all ordered pairs of traces when a trace is added to an event log.
+    :param edit_distance_sum: the sum of edit distances between all ordered pairs of traces before adding the trace
+    :param variant_counts: a dictionary mapping each variant of the event log to the number of its traces
+    :param new_variant: the sequence of activities of the new trace
+    :return: The sum of edit distances between all ordered pairs of traces after adding the trace
+    """
+    masks = match_masks(new_variant)
+    for variant, count in variant_counts.items():
+        if variant != new_variant:
+            common_length = longest_common_subsequence_length(masks, len(new_variant), variant)
+            # the new trace is the first and the second trace of a pair once for each trace of the variant
+            edit_distance_sum += 2 * count * (len(new_variant) + len(variant) - 2 * common_length)
+    return edit_distance_sum
@@ -0,0 +1,69 @@
+import gzip # for reading compressed .xes.gz-files
+from array import array # for collecting the activity ids of the events compactly
+from xml.etree.ElementTree import iterparse # for reading .xes-files element by element
+
+import Constants # (internal) for the names of the case and activity attributes
+from logcomplexity import ColumnarLog # (internal) for the integer-encoded representation of the imported event log
+
+# the first two bytes of every gzip-compressed file
+GZIP_MAGIC_NUMBER = b"\x1f\x8b"
+
+
+def open_xes_file(filename: str):
+    with open(filename, "rb") as file:
+        compressed = file.read(2) == GZIP_MAGIC_NUMBER
+    if compressed:
+        return gzip.open(filename, "rb")
+    return open(filename, "rb")
+
+def local_name(tag: str):
+    # remove the namespace, for example {http://www.xes-standard.org/}trace becomes trace
+    return tag.rsplit("}", 1)[-1]
+
+def import_columnar_log(filename: str, maximum_number_of_traces=None):
+    """
+    Imports an event log from an .xes-file (or an .xes.gz-file) without building pm4py objects. The file is read
+    element by element, only the case identifiers and the activities are kept, and reading stops as soon as the
+    requested number of traces was read, so the rest of the file is never parsed.
+    :param filename: the file-path to the .xes-file
+    :param maximum_number_of_traces: the number of traces that should be read, or None if all traces should be read
+    :return: the ColumnarLog of the (first traces of the) event log
+    """
+    activity_ids = {}
+    activities = array("i")
+    offsets = array("q", [0])
+    case_ids = []
+    # the names of the elements enclosing the current element, since only attributes of traces and events count
+    enclosing_elements = []
+    case_id = None
+    activity = None
+    root = None
+    with open_xes_file(filename) as file:
+        for event, element in iterparse(file, events=("start", "end")):
+            name = local_name(element.tag)
+            if event == "start":
+                if root is None:
+                    root = element
+                enclosing_elements += [name]
+                continue
+            enclosing_elements.pop()
+            parent = enclosing_elements[-1] if len(enclosing_elements) > 0 else None
+            if name == "string" and element.get("key") == Constants.activity_specifier:
+                if parent == "event":
+                    activity = element.get("value")
+                elif parent == "trace":
+                    case_id = element.get("value")
+            elif name == "event" and parent == "trace":
+                # events without an activity are ignored
+                if activity is not None:
+                    activities.append(activity_ids.setdefault(activity, len(activity_ids)))
+                activity = None
+            elif name == "trace":
+                offsets.append(len(activities))
+                case_ids += [case_id if case_id is not None else str(len(case_ids) + 1)]
+                case_id = None
+                # forget the elements of the finished trace to keep the memory usage low
+                root.clear()
+                if maximum_number_of_traces is not None and len(case_ids) >= maximum_number_of_traces:
+                    break
+    return ColumnarLog.from_arrays(list(activity_ids.keys()), activities, offsets, case_ids=case_ids)
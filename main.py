@@ -1,12 +1,16 @@
+import os # for checking whether the event log exists
+import sys # for exiting with an error code
+import json # for printing the results of non-interactive analyses
+import argparse # for parsing command-line options
 import questionary # for pretty command-line selections
 
 import Constants # (internal) strings representing the supported mining algorithms and complexity measures
 from logcomplexity import LogComplexityMeasures
 from modelcomplexity import ModelComplexityMeasures
 from discovery import DiscoveryAlgorithms
-from analysis import EventLogHandler, ModelHandler, PaperResults, RealLiveLogs
-
-from pm4py.objects.log.importer.xes import importer as xes_importer
+from analysis import EventLogHandler, ModelHandler, PaperResults, RealLiveLogs, BatchAnalysis
+from analysis import RelationTable
+from logcomplexity import LogCache
 
 
 def example_selector(miner: str, measure: str):
@@ -25,30 +29,43 @@ def enter_paper_mode():
     measure = questionary.select(complexity_question, choices=measures).ask()
     example_selector(miner, measure)
 
-def enter_real_log_analysis_mode():
+def enter_real_log_analysis_mode(workers=1, stop_when_saturated=False, resume=False, measure_time_limit=None):
     # Ask for the event log
     file_question = "Please specify where the event log in XES format can be found."
     selected_filepath = questionary.path(file_question).ask()
-    pm4py_log = xes_importer.apply(selected_filepath)
-    log_info = "Your event log contains " + str(len(pm4py_log)) + " traces."
-    print(log_info)
-    threshold_question = "How many traces would you like to include in the analysis?"
+    threshold_question = "How many traces would you like to include in the analysis? Leave empty to include all traces."
     threshold_parseable = False
-    chosen_threshold = str(len(pm4py_log))
+    chosen_threshold = ""
     while not threshold_parseable:
         chosen_threshold = questionary.text(threshold_question).ask()
-        if chosen_threshold.isdigit() and 0 < int(chosen_threshold) <= len(pm4py_log):
+        if chosen_threshold == "" or (chosen_threshold.isdigit() and 0 < int(chosen_threshold)):
             threshold_parseable = True
         else:
-            print("Sorry, I cannot interpret your input as a number between 0 (exclusive) and " + str(len(pm4py_log)) + " (inclusive).")
+            print("Sorry, I cannot interpret your input as a number greater than 0.")
             print("Please try again.")
-    threshold = int(chosen_threshold)
-    # Ask for the mining algorithm
+    # the analysis compares the prefix containing the chosen number of traces to the prefix with one more trace,
+    # so the importer can stop reading the event log after this trace
+    maximum_number_of_traces = None if chosen_threshold == "" else int(chosen_threshold) + 1
+    # logs that were imported before are read from the cache in the output folder
+    columnar_log = LogCache.import_cached_columnar_log(selected_filepath, maximum_number_of_traces)
+    log_info = "I read " + str(len(columnar_log)) + " traces of your event log."
+    print(log_info)
+    if len(columnar_log) == 0:
+        print("Your event log contains no traces, so there's nothing to do for me.")
+        return
+    if chosen_threshold == "":
+        threshold = len(columnar_log)
+    else:
+        threshold = min(int(chosen_threshold), len(columnar_log))
+    # Ask for the mining algorithms, which are all analyzed in the same pass over the event log
     miners = [questionary.Choice(title=str(miner), value=miner) for miner in DiscoveryAlgorithms.all_discovery_algorithms]
-    miner_question = "Which mining algorithm should be used to find process models?"
-    selected_miner = questionary.select(miner_question, choices=miners).ask()
+    miner_question = "Which mining algorithms should be used to find process models?"
+    selected_miners = questionary.checkbox(miner_question, choices=miners).ask()
+    if len(selected_miners) == 0:
+        print("You chose no mining algorithm, so there's nothing to do for me.")
+        return
     # Ask for the log complexity measures
-    log_complexity_question = "Which log complexity measures would you like to investigate?\n Hint: Calculating the edit distance is very runtime-heavy for real event logs."
+    log_complexity_question = "Which log complexity measures would you like to investigate?"
     log_measures = [questionary.Choice(title=str(measure), value=measure) for measure in LogComplexityMeasures.all_log_complexity_measures]
     selected_log_measures = questionary.checkbox(log_complexity_question, choices=log_measures).ask()
     if len(selected_log_measures) == 0:
@@ -57,15 +74,16 @@ def enter_real_log_analysis_mode():
     # Ask for the model complexity measures
     model_complexity_question = "Which model complexity measures would you like to investigate?"
     model_measures = []
-    if type(selected_miner) == DiscoveryAlgorithms.DirectlyFollowsGraphMiner:
+    if all(type(miner) == DiscoveryAlgorithms.DirectlyFollowsGraphMiner for miner in selected_miners):
         model_measures += [questionary.Choice(title=str(measure), value=measure) for measure in ModelComplexityMeasures.dfg_model_complexity_measures]
     else:
+        # measures that are not defined for directly follows graphs stay empty in the table of the graph
         model_measures += [questionary.Choice(title=str(measure), value=measure) for measure in ModelComplexityMeasures.all_model_complexity_measures]
     selected_model_measures = questionary.checkbox(model_complexity_question, choices=model_measures).ask()
     if len(selected_model_measures) == 0:
         print("You chose to analyze no model complexity measures, so there's nothing to do for me.")
         return
-    RealLiveLogs.investigate_real_life_log(pm4py_log, threshold, selected_log_measures, selected_model_measures, selected_miner)
+    RealLiveLogs.investigate_real_life_log(columnar_log, threshold, selected_log_measures, selected_model_measures, selected_miners, workers, stop_when_saturated, resume, measure_time_limit)
 
 def ask_for_event_log(message:str):
     log_spec_question = message + "Use the structure of the following example: [abcd, acbd, abce, acbe]\n"
@@ -99,21 +117,106 @@ def enter_playground_mode():
     ModelHandler.show_model_comparison(selected_miner, model_complexity_measures, pm4py_logs)
     print("This concludes the analysis of your event log. Hope this helped!")
 
+def run_analysis(arguments, miner, log_measures: list, model_measures: list):
+    try:
+        result = BatchAnalysis.analyze_event_log(arguments.log, miner, log_measures, model_measures, arguments.threshold,
+                                                 arguments.workers, arguments.stop_when_saturated,
+                                                 show_progress=arguments.format == "table", resume=arguments.resume,
+                                                 measure_time_limit=arguments.measure_time_limit)
+    except KeyboardInterrupt:
+        print("Keyboard Interrupt detected! Run the same command with --resume to continue from the last checkpoint.", file=sys.stderr)
+        sys.exit(130)
+    if arguments.format == "json":
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print("I read " + str(result["number of traces"]) + " traces of " + result["log"] + ".")
+        print("I found the following relations of model complexity in your event log if log complexity increases:")
+        RelationTable.from_dict(result["relation table"]).print()
+
 if __name__ == "__main__":
-    print("Welcome to anaLOG: The friendly log and model analyzer.")
-    print("With this tool, you can reproduce the results of the paper ")
-    print("\"Mind the Gap: A Formal Investigation of the Relationship Between Log and Model Complexity\"")
-    print("or analyse your own event logs.")
-    print()
-    paper_mode = "Reproduce the results of the paper"
-    real_log_analysis_mode = "Check what relations can be found in my event log"
-    playground_mode = "Input and analyze an event log via keyboard"
-    mode = questionary.select("What would you like to do?", choices=[paper_mode, real_log_analysis_mode, playground_mode]).ask()
-    if mode == paper_mode:
-        enter_paper_mode()
-    elif mode == real_log_analysis_mode:
-        enter_real_log_analysis_mode()
-    elif mode == playground_mode:
-        enter_playground_mode()
+    parser = argparse.ArgumentParser(description="anaLOG: The friendly log and model analyzer.")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes used to analyze the prefixes of a real-life event log (the command batch analyzes the prefixes of each event log in one process, see batch --log-workers)")
+    parser.add_argument("--stop-when-saturated", action="store_true", help="stop the analysis of real-life event logs as soon as no relations are left")
+    parser.add_argument("--resume", action="store_true", help="continue analyses of real-life event logs from their last checkpoint in the output folder")
+    parser.add_argument("--measure-time-limit", type=float, help="the maximum CPU time in seconds a complexity measure may take for a prefix of a real-life event log, after which the measure is skipped for this prefix")
+    subparsers = parser.add_subparsers(dest="command", help="run without a command to choose what to do interactively")
+    analyze_parser = subparsers.add_parser("analyze", help="check what relations can be found in an event log, without asking any questions")
+    analyze_parser.add_argument("--log", required=True, help="the file-path to the event log in XES format")
+    analyze_parser.add_argument("--miner", required=True, help="the abbreviation of the mining algorithm: " + ", ".join(miner.abbreviation for miner in DiscoveryAlgorithms.all_discovery_algorithms))
+    analyze_parser.add_argument("--log-measures", nargs="+", help="the abbreviations of the log complexity measures (default: all)")
+    analyze_parser.add_argument("--model-measures", nargs="+", help="the abbreviations of the model complexity measures (default: all for the mining algorithm)")
+    analyze_parser.add_argument("--threshold", type=int, help="the number of traces to include in the analysis (default: all)")
+    analyze_parser.add_argument("--format", choices=["table", "json"], default="table", help="how the relations are printed")
+    # the options of the program can also be given after the command; if they are not, the values above are kept
+    analyze_parser.add_argument("--workers", type=int, default=argparse.SUPPRESS, help="number of processes used to analyze the prefixes")
+    analyze_parser.add_argument("--stop-when-saturated", action="store_true", default=argparse.SUPPRESS, help="stop the analysis as soon as no relations are left")
+    analyze_parser.add_argument("--resume", action="store_true", default=argparse.SUPPRESS, help="continue the analysis from its last checkpoint")
+    analyze_parser.add_argument("--measure-time-limit", type=float, default=argparse.SUPPRESS, help="the maximum CPU time in seconds a complexity measure may take for a prefix")
+    batch_parser = subparsers.add_parser("batch", help="check what relations can be found in many event logs, analyzing several logs at the same time")
+    batch_parser.add_argument("--logs", nargs="+", required=True, help="folders containing event logs in XES format, files, or patterns like \"logs/*.xes\"")
+    batch_parser.add_argument("--miners", nargs="+", default=[miner.abbreviation for miner in DiscoveryAlgorithms.all_discovery_algorithms], help="the abbreviations of the mining algorithms (default: all)")
+    batch_parser.add_argument("--log-measures", nargs="+", help="the abbreviations of the log complexity measures (default: all)")
+    batch_parser.add_argument("--model-measures", nargs="+", help="the abbreviations of the model complexity measures (default: all for each mining algorithm)")
+    batch_parser.add_argument("--threshold", type=int, help="the number of traces of each event log to include in the analysis (default: all)")
+    batch_parser.add_argument("--time-limit", type=int, help="the maximum number of seconds spent on each event log")
+    batch_parser.add_argument("--memory-limit", type=int, help="the maximum memory in megabytes of the process analyzing an event log")
+    batch_parser.add_argument("--output", default=BatchAnalysis.SUMMARY_PATH, help="the path of the summary, to which .json and .csv are appended")
+    batch_parser.add_argument("--log-workers", type=int, default=1, help="number of event logs analyzed at the same time, each by its own process")
+    batch_parser.add_argument("--stop-when-saturated", action="store_true", default=argparse.SUPPRESS, help="stop the analysis of an event log as soon as no relations are left")
+    batch_parser.add_argument("--resume", action="store_true", default=argparse.SUPPRESS, help="continue the analyses of the event logs from their last checkpoints, for example after they exceeded the time limit")
+    batch_parser.add_argument("--measure-time-limit", type=float, default=argparse.SUPPRESS, help="the maximum CPU time in seconds a complexity measure may take for a prefix")
+    arguments = parser.parse_args()
+    if arguments.command == "batch":
+        filenames = BatchAnalysis.event_log_files(arguments.logs)
+        if len(filenames) == 0:
+            batch_parser.error("No event logs were found.")
+        if arguments.threshold is not None and arguments.threshold < 1:
+            batch_parser.error("The threshold must be greater than 0.")
+        if arguments.workers != 1:
+            batch_parser.error("--workers sets the processes per event log, which batch mode does not use. Use --log-workers to analyze several event logs at the same time.")
+        try:
+            selected_miners = [BatchAnalysis.miner_of(miner) for miner in arguments.miners]
+            selected_log_measures = BatchAnalysis.measures_of(arguments.log_measures, LogComplexityMeasures.all_log_complexity_measures, "log")
+            BatchAnalysis.measures_of(arguments.model_measures, ModelComplexityMeasures.all_model_complexity_measures, "model")
+        except ValueError as error:
+            batch_parser.error(str(error))
+        print("I found " + str(len(filenames)) + " event logs.")
+        results = BatchAnalysis.analyze_event_logs(filenames, selected_miners, selected_log_measures, arguments.model_measures,
+                                                   arguments.threshold, arguments.log_workers, arguments.stop_when_saturated,
+                                                   arguments.memory_limit, arguments.time_limit, resume=arguments.resume,
+                                                   measure_time_limit=arguments.measure_time_limit)
+        failed_results = [result for result in results if result["status"] != "done"]
+        for result in failed_results:
+            print("The analysis of " + result["log"] + " did not finish: " + result["status"])
+        json_filename, csv_filename = BatchAnalysis.write_summary(results, arguments.output)
+        print("I analyzed " + str(len(results) - len(failed_results)) + " of " + str(len(results)) + " event logs and wrote the summary to " + json_filename + " and " + csv_filename + ".")
+    elif arguments.command == "analyze":
+        if not os.path.isfile(arguments.log):
+            analyze_parser.error("The event log " + arguments.log + " does not exist.")
+        if arguments.threshold is not None and arguments.threshold < 1:
+            analyze_parser.error("The threshold must be greater than 0.")
+        try:
+            selected_miner = BatchAnalysis.miner_of(arguments.miner)
+            selected_log_measures = BatchAnalysis.measures_of(arguments.log_measures, LogComplexityMeasures.all_log_complexity_measures, "log")
+            selected_model_measures = BatchAnalysis.measures_of(arguments.model_measures, BatchAnalysis.model_measures_for(selected_miner), "model")
+        except ValueError as error:
+            analyze_parser.error(str(error))
+        run_analysis(arguments, selected_miner, selected_log_measures, selected_model_measures)
     else:
-        raise Exception("Unexpected user-choice: " + mode)
+        print("Welcome to anaLOG: The friendly log and model analyzer.")
+        print("With this tool, you can reproduce the results of the paper ")
+        print("\"Mind the Gap: A Formal Investigation of the Relationship Between Log and Model Complexity\"")
+        print("or analyse your own event logs.")
+        print()
+        paper_mode = "Reproduce the results of the paper"
+        real_log_analysis_mode = "Check what relations can be found in my event log"
+        playground_mode = "Input and analyze an event log via keyboard"
+        mode = questionary.select("What would you like to do?", choices=[paper_mode, real_log_analysis_mode, playground_mode]).ask()
+        if mode == paper_mode:
+            enter_paper_mode()
+        elif mode == real_log_analysis_mode:
+            enter_real_log_analysis_mode(arguments.workers, arguments.stop_when_saturated, arguments.resume, arguments.measure_time_limit)
+        elif mode == playground_mode:
+            enter_playground_mode()
+        else:
+            raise Exception("Unexpected user-choice: " + mode)
@@ -0,0 +1,113 @@
+from __future__ import annotations # for annotating with the Petri net classes of pm4py without importing them
+import numpy # for compact arrays of node ids and degrees
+from typing import TYPE_CHECKING # for importing the Petri net classes of pm4py only for type checkers
+
+import LazyImport # (internal) for importing networkx on first use
+
+if TYPE_CHECKING:
+    from pm4py.objects.petri_net.obj import PetriNet, Marking # for maintaining Petri nets
+
+networkx = LazyImport.lazy_module("networkx") # for graph algorithms that are not implemented on the arrays
+
+
+class CompiledModel:
+    """
+    A representation of a marked Petri net that is built once and shared by all model complexity measures.
+    Each place and transition gets an integer id, where the places come first. The arcs are stored as adjacency
+    arrays in compressed sparse row (CSR) format: the successors of node i are out_targets[out_offsets[i]:out_offsets[i+1]],
+    and its predecessors are in_sources[in_offsets[i]:in_offsets[i+1]]. Both keep the order in which
+    ModelComplexity.transform_to_networkx adds the arcs, so algorithms visiting neighbors in order behave the same.
+    """
+    def __init__(self, model: PetriNet, initial_marking: Marking = None, final_marking: Marking = None):
+        """
+        Compiles the passed Petri net.
+        :param model: A Petri net in pm4py-format
+        :param initial_marking: The initial marking of the Petri net, in pm4py-format
+        :param final_marking: The final marking of the Petri net, in pm4py-format
+        """
+        self.model = model
+        places = list(model.places)
+        transitions = list(model.transitions)
+        self.nodes = places + transitions
+        self.number_of_places = len(places)
+        self.number_of_transitions = len(transitions)
+        self.number_of_nodes = len(self.nodes)
+        node_ids = {node: node_id for node_id, node in enumerate(self.nodes)}
+        self.is_place = numpy.zeros(self.number_of_nodes, dtype=bool)
+        self.is_place[:self.number_of_places] = True
+        self.labels = [transition.label for transition in transitions]
+        # collect the arcs in the order of transform_to_networkx, ignoring arcs that connect the same nodes twice
+        edges = []
+        encountered_edges = set()
+        for transition in transitions:
+            transition_edges = [(node_ids[in_arc.source], node_ids[transition]) for in_arc in transition.in_arcs]
+            transition_edges += [(node_ids[transition], node_ids[out_arc.target]) for out_arc in transition.out_arcs]
+            for edge in transition_edges:
+                if edge not in encountered_edges:
+                    encountered_edges.add(edge)
+                    edges += [edge]
+        self.edges = numpy.array(edges, dtype=numpy.int64).reshape(-1, 2)
+        self.number_of_edges = len(edges)
+        # build the adjacency arrays, where the stable sort keeps the order of the arcs of each node
+        self.out_offsets, self.out_targets = compressed_rows(self.edges[:, 0], self.edges[:, 1], self.number_of_nodes)
+        self.in_offsets, self.in_sources = compressed_rows(self.edges[:, 1], self.edges[:, 0], self.number_of_nodes)
+        self.out_degree = numpy.diff(self.out_offsets)
+        self.in_degree = numpy.diff(self.in_offsets)
+        self.degree = self.out_degree + self.in_degree
+        # connectors are nodes with more than one incoming or outgoing arc
+        self.is_connector = (self.in_degree > 1) | (self.out_degree > 1)
+        self.initial_nodes = [] if initial_marking is None else [node_ids[place] for place in initial_marking.keys()]
+        self.final_nodes = [] if final_marking is None else [node_ids[place] for place in final_marking.keys()]
+        self.has_markings = initial_marking is not None and final_marking is not None
+        self.graphs = {}
+
+    def successors(self, node_id: int):
+        return self.out_targets[self.out_offsets[node_id]:self.out_offsets[node_id + 1]]
+
+    def predecessors(self, node_id: int):
+        return self.in_sources[self.in_offsets[node_id]:self.in_offsets[node_id + 1]]
+
+    def successor_lists(self):
+        # plain lists are faster than slices of the arrays for algorithms that visit the neighbors one by one
+        return adjacency_lists(self.out_offsets, self.out_targets)
+
+    def predecessor_lists(self):
+        return adjacency_lists(self.in_offsets, self.in_sources)
+
+    def graph(self, undirected=False):
+        """
+        Returns a networkx graph on the node ids of this model, which is built once and shared by all measures.
+        :param undirected: A boolean value indicating whether the graph should be undirected
+        :return: The model as a networkx graph, whose nodes are the ids of the places and transitions
+        """
+        if undirected not in self.graphs:
+            model_graph = networkx.Graph() if undirected else networkx.DiGraph()
+            model_graph.add_nodes_from(range(self.number_of_nodes))
+            model_graph.add_edges_from(self.edges.tolist())
+            self.graphs[undirected] = model_graph
+        return self.graphs[undirected]
+
+
+def compressed_rows(rows, columns, number_of_rows: int):
+    order = numpy.argsort(rows, kind="stable")
+    offsets = numpy.zeros(number_of_rows + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(rows, minlength=number_of_rows), out=offsets[1:])
+    return offsets, columns[order]
+
+def adjacency_lists(offsets, columns):
+    offsets = offsets.tolist()
+    columns = columns.tolist()
+    return [columns[offsets[row]:offsets[row + 1]] for row in range(len(offsets) - 1)]
+
+def compile_model(model, initial_marking: Marking = None, final_marking: Marking = None):
+    """
+    Returns the compiled representation of the passed model. If the model is already compiled, it is returned as it
+    is, so that the complexity measures can be called with both Petri nets and compiled models.
+    :param model: A Petri net in pm4py-format, or a CompiledModel
+    :param initial_marking: The initial marking of the Petri net, in pm4py-format
+    :param final_marking: The final marking of the Petri net, in pm4py-format
+    :return: The compiled model
+    """
+    if type(model) == CompiledModel:
+        return model
+    return CompiledModel(model, initial_marking, final_marking)
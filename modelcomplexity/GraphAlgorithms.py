@@ -0,0 +1,311 @@
+from __future__ import annotations # for annotating with the graph classes of networkx without importing networkx
+import heapq # for the priority queue of Dijkstra's algorithm
+from collections import deque # for the queue of breadth first searches
+import math # for the length of paths that do not exist
+from concurrent.futures import ProcessPoolExecutor # for distributing the sources of path searches over several processes
+
+import LazyImport # (internal) for importing networkx on first use
+import TimeBudget # (internal) for reporting the longest path found so far
+
+networkx = LazyImport.lazy_module("networkx") # for the decomposition of graphs into strongly connected components
+
+# the adjacency lists used by the processes of a process pool, set once per process by initialize_worker
+worker_adjacency = None
+
+def initialize_worker(adjacency):
+    global worker_adjacency
+    worker_adjacency = adjacency
+
+def maximum_path_weights_from_worker(source):
+    return maximum_path_weights_from(source, worker_adjacency)
+
+def maximum_path_weights_from(source, adjacency):
+    """
+    Calculates the maximum weight of a path from the source to every node of a graph, where the weight of a path is
+    the product of the weights of its edges. Since all edge weights lie in (0,1], extending a path never increases
+    its weight, so a variant of Dijkstra's algorithm that maximizes products instead of minimizing sums finds these
+    paths. Paths from the source to itself are cycles through the source.
+    :param source: the index of the node where the paths start
+    :param adjacency: a list containing, for each node, the list of pairs (target, weight) of its outgoing edges
+    :return: a list containing, for each node, the maximum weight of a non-empty path from the source to the node, or None if there is no such path
+    """
+    best_weights = [0.0] * len(adjacency)
+    best_weights[source] = 1.0
+    finished = [False] * len(adjacency)
+    best_cycle_weight = None
+    queue = [(-1.0, source)]
+    while len(queue) > 0:
+        _, node = heapq.heappop(queue)
+        if finished[node]:
+            continue
+        finished[node] = True
+        for target, edge_weight in adjacency[node]:
+            candidate_weight = best_weights[node] * edge_weight
+            if target == source:
+                # closing a cycle through the source, which must not be extended any further
+                if best_cycle_weight is None or candidate_weight > best_cycle_weight:
+                    best_cycle_weight = candidate_weight
+            elif not finished[target] and candidate_weight > best_weights[target]:
+                best_weights[target] = candidate_weight
+                heapq.heappush(queue, (-candidate_weight, target))
+    result = [best_weights[node] if finished[node] else None for node in range(len(adjacency))]
+    result[source] = best_cycle_weight
+    return result
+
+def maximum_path_weights(nodes: list, edge_weights: dict, workers=1):
+    """
+    Calculates the maximum weight of a path between any two nodes of a graph, by running one search per source node.
+    The weight of a path is the product of the weights of its edges, and all edge weights must lie in (0,1].
+    Because of this, the maximum weight is always reached by a simple path (or a simple cycle, if both nodes are
+    equal), and this method yields the same values as enumerating all simple paths, but in polynomial time.
+    :param nodes: a list of the nodes of the graph
+    :param edge_weights: a dictionary mapping each edge (u, v) of the graph to its weight
+    :param workers: the number of processes used to distribute the searches, where 1 means that no processes are started
+    :return: a matrix, where entry [i][j] is the maximum weight of a non-empty path from nodes[i] to nodes[j], or None if there is no such path
+    """
+    node_indices = {node: index for index, node in enumerate(nodes)}
+    adjacency = [[] for _ in nodes]
+    for (u, v), weight in edge_weights.items():
+        adjacency[node_indices[u]].append((node_indices[v], weight))
+    return maximum_path_weights_for(adjacency, workers)
+
+def maximum_path_weights_for(adjacency: list, workers=1):
+    """
+    Calculates the maximum weight of a path between any two nodes of a graph given by weighted adjacency lists.
+    :param adjacency: a list containing, for each node, the list of pairs (target, weight) of its outgoing edges
+    :param workers: the number of processes used to distribute the searches, where 1 means that no processes are started
+    :return: a matrix, where entry [i][j] is the maximum weight of a non-empty path from node i to node j, or None if there is no such path
+    """
+    if workers <= 1 or len(adjacency) < 2:
+        return [maximum_path_weights_from(source, adjacency) for source in range(len(adjacency))]
+    with ProcessPoolExecutor(max_workers=workers, initializer=initialize_worker, initargs=(adjacency,)) as executor:
+        chunk_size = max(1, len(adjacency) // (4 * workers))
+        return list(executor.map(maximum_path_weights_from_worker, range(len(adjacency)), chunksize=chunk_size))
+
+def fill_depths(roots: list, adjacency: list, parent_degree: list, node_degree: list, depths: list):
+    """
+    Propagates the depth of the nodes of a graph along the breadth first search tree of each root, as needed by the
+    depth of models. Going from a split to a node that is not a join increases the depth by one, going from a node that
+    is not a split to a join decreases it by one, and the depth of each node is the maximum over all roots. Since the
+    parent of a node is the node that discovers it, each search visits every node and edge once, without building the
+    tree. Neighbors are visited in the order of the adjacency lists, such that the trees equal those of networkx.bfs_tree.
+    :param roots: the nodes where the searches start, whose depth is kept
+    :param adjacency: a list containing, for each node, the list of its neighbors in the direction of the search
+    :param parent_degree: the number of edges leaving each node in the direction of the search
+    :param node_degree: the number of edges entering each node in the direction of the search
+    :param depths: the depth of each node, which is updated in place
+    :return: None
+    """
+    # the root of the search that visited each node last, such that the visited-flags need not be reset per root
+    visited_by = [None] * len(adjacency)
+    for root in roots:
+        visited_by[root] = root
+        queue = deque([root])
+        while len(queue) > 0:
+            parent = queue.popleft()
+            parent_depth = depths[parent]
+            is_split = parent_degree[parent] > 1
+            for node in adjacency[parent]:
+                if visited_by[node] == root:
+                    continue
+                visited_by[node] = root
+                queue.append(node)
+                is_join = node_degree[node] > 1
+                if is_split and not is_join:
+                    depth = parent_depth + 1
+                elif is_join and not is_split:
+                    depth = parent_depth - 1
+                else:
+                    depth = parent_depth
+                if depth > depths[node]:
+                    depths[node] = depth
+
+def nodes_on_cycles(graph: networkx.DiGraph):
+    """
+    Returns the set of nodes of a directed graph that lie on some cycle. A node lies on a cycle if and only if its
+    strongly connected component contains another node, or if it has an edge to itself. Therefore, this method only
+    needs a decomposition into strongly connected components, which takes linear time, instead of enumerating all
+    simple cycles of the graph.
+    :param graph: A networkx directed graph
+    :return: The set of nodes that lie on a cycle in the graph
+    """
+    cyclic_nodes = set()
+    for component in networkx.strongly_connected_components(graph):
+        if len(component) > 1:
+            cyclic_nodes.update(component)
+    cyclic_nodes.update(networkx.nodes_with_selfloops(graph))
+    return cyclic_nodes
+
+def longest_simple_path_length(graph: networkx.DiGraph, sources, targets):
+    """
+    Returns the number of nodes on the longest simple path from one of the sources to one of the targets. If the graph
+    is acyclic, the longest paths are found by dynamic programming over a topological order. Otherwise, the simple
+    paths are searched one at a time by a branch-and-bound search, which is bounded by the strongly connected
+    components that a path can still pass (see longest_simple_path_search). The longest path found so far is reported
+    to TimeBudget, such that a search that exceeds its budget still yields bounds.
+    :param graph: a directed graph
+    :param sources: the nodes where the paths start
+    :param targets: the nodes where the paths end
+    :return: the number of nodes on the longest simple path, or infinity if there is no path between some source and target
+    """
+    nodes = list(graph.nodes)
+    node_ids = {node: node_id for node_id, node in enumerate(nodes)}
+    # self-loops are never part of a simple path
+    adjacency = [[node_ids[successor] for successor in graph.successors(node) if successor != node] for node in nodes]
+    source_ids = [node_ids[source] for source in sources]
+    target_ids = [node_ids[target] for target in targets]
+    order = topological_order(adjacency)
+    if order is not None:
+        return longest_acyclic_path_length(order, adjacency, source_ids, target_ids)
+    # the nodes of a strongly connected component are consecutive in any simple path, and the components are passed
+    # in the topological order of the condensation
+    components = list(networkx.strongly_connected_components(graph))
+    condensation = networkx.condensation(graph, scc=components)
+    component_order = list(networkx.topological_sort(condensation))
+    component_of = [0] * len(nodes)
+    for component, members in enumerate(components):
+        for node in members:
+            component_of[node_ids[node]] = component
+    component_successors = [list(condensation.successors(component)) for component in range(len(components))]
+    component_sizes = [len(members) for members in components]
+    return longest_simple_path_search(adjacency, source_ids, target_ids, component_of, component_successors, component_sizes, component_order)
+
+def topological_order(adjacency: list):
+    """
+    Sorts the nodes of a graph topologically by Kahn's algorithm.
+    :param adjacency: a list containing, for each node, the list of its successors
+    :return: the list of nodes in topological order, or None if the graph contains a cycle
+    """
+    in_degree = [0] * len(adjacency)
+    for successors in adjacency:
+        for successor in successors:
+            in_degree[successor] += 1
+    order = [node for node in range(len(adjacency)) if in_degree[node] == 0]
+    # the order grows while it is traversed, like the queue of a breadth first search
+    for node in order:
+        for successor in adjacency[node]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                order.append(successor)
+    if len(order) < len(adjacency):
+        return None
+    return order
+
+def longest_acyclic_path_length(topological_order: list, adjacency: list, sources: list, targets: list):
+    """
+    Returns the number of nodes on the longest path from one of the sources to one of the targets of an acyclic graph,
+    where every path is simple. For each source, the length of the longest path to each node is the maximum over
+    its predecessors, which are finished before the node in topological order.
+    :param topological_order: the nodes of the graph in topological order
+    :param adjacency: a list containing, for each node, the list of its successors
+    :param sources: the nodes where the paths start
+    :param targets: the nodes where the paths end
+    :return: the number of nodes on the longest path, or infinity if there is no path between some source and target
+    """
+    maximum_path_length = -math.inf
+    position = [0] * len(adjacency)
+    for index, node in enumerate(topological_order):
+        position[node] = index
+    for source in sources:
+        longest_path_lengths = [0] * len(adjacency)
+        longest_path_lengths[source] = 1
+        for node in topological_order[position[source]:]:
+            path_length = longest_path_lengths[node]
+            if path_length == 0:
+                continue
+            for successor in adjacency[node]:
+                if path_length + 1 > longest_path_lengths[successor]:
+                    longest_path_lengths[successor] = path_length + 1
+        for target in targets:
+            if longest_path_lengths[target] == 0:
+                # the target cannot be reached from the source
+                return math.inf
+            maximum_path_length = max(maximum_path_length, longest_path_lengths[target])
+    return maximum_path_length
+
+def longest_simple_path_search(adjacency: list, sources: list, targets: list, component_of: list, component_successors: list, component_sizes: list, component_order: list):
+    """
+    Returns the number of nodes on the longest simple path from one of the sources to one of the targets of a cyclic
+    graph. Since a simple path passes the strongly connected components in topological order and visits each node at
+    most once, it can contain at most the unvisited nodes of its current component and of the components on the
+    heaviest path through the condensation to the component of the target. Paths whose bound does not exceed the
+    longest path found so far are not extended, and paths are extended one node at a time instead of being listed.
+    :param adjacency: a list containing, for each node, the list of its successors
+    :param sources: the nodes where the paths start
+    :param targets: the nodes where the paths end
+    :param component_of: the strongly connected component of each node
+    :param component_successors: a list containing, for each component, the components its nodes have edges to
+    :param component_sizes: the number of nodes of each component
+    :param component_order: the components in topological order
+    :return: the number of nodes on the longest simple path, or infinity if there is no path between some source and target
+    """
+    # remaining_nodes[t][c] is the maximum number of nodes a path to target t can still visit after leaving component
+    # c, where the components that cannot reach the target stay None
+    remaining_nodes = {}
+    for target in targets:
+        remaining_nodes[target] = [None] * len(component_sizes)
+        for component in reversed(component_order):
+            if component == component_of[target]:
+                remaining_nodes[target][component] = 0
+                continue
+            reachable = [component_sizes[successor] + remaining_nodes[target][successor] for successor in component_successors[component]
+                         if remaining_nodes[target][successor] is not None]
+            if len(reachable) > 0:
+                remaining_nodes[target][component] = max(reachable)
+    if any(remaining_nodes[target][component_of[source]] is None for source in sources for target in targets):
+        # some target cannot be reached from some source
+        return math.inf
+    upper_bound = max([component_sizes[component_of[source]] + remaining_nodes[target][component_of[source]]
+                       for source in sources for target in targets], default=None)
+    # like Warnsdorff's rule, successors with few successors are tried first, which tends to find long paths early
+    adjacency = [sorted(successors, key=lambda successor: len(adjacency[successor])) for successors in adjacency]
+    maximum_path_length = -math.inf
+    # the number of nodes in each component that lie on the current path
+    visited_in_component = [0] * len(component_sizes)
+    on_path = [False] * len(adjacency)
+    expansions = 0
+    for target in targets:
+        remaining_nodes_to_target = remaining_nodes[target]
+        for source in sources:
+            if source == target:
+                maximum_path_length = max(maximum_path_length, 1)
+                continue
+            path = [source]
+            on_path[source] = True
+            visited_in_component[component_of[source]] += 1
+            neighbors = [iter(adjacency[source])]
+            while len(neighbors) > 0:
+                extended = False
+                for successor in neighbors[-1]:
+                    successor_component = component_of[successor]
+                    if on_path[successor] or remaining_nodes_to_target[successor_component] is None:
+                        continue
+                    if successor == target:
+                        if len(path) + 1 > maximum_path_length:
+                            maximum_path_length = len(path) + 1
+                            TimeBudget.report_bounds(maximum_path_length, upper_bound)
+                            if maximum_path_length == upper_bound:
+                                # no path can be longer, so the search can stop
+                                return maximum_path_length
+                        continue
+                    # the path can still visit the unvisited nodes of the component and of the components after it
+                    bound = (len(path) + component_sizes[successor_component] - visited_in_component[successor_component]
+                             + remaining_nodes_to_target[successor_component])
+                    if bound <= maximum_path_length:
+                        continue
+                    path.append(successor)
+                    on_path[successor] = True
+                    visited_in_component[successor_component] += 1
+                    neighbors.append(iter(adjacency[successor]))
+                    extended = True
+                    break
+                if not extended:
+                    # all extensions of the path were searched, so the search continues with its prefix
+                    neighbors.pop()
+                    node = path.pop()
+                    on_path[node] = False
+                    visited_in_component[component_of[node]] -= 1
+                expansions += 1
+                if expansions % 1024 == 0:
+                    TimeBudget.report_bounds(maximum_path_length if maximum_path_length > 0 else None, upper_bound)
+    return maximum_path_length
@@ -1,8 +1,16 @@
+from __future__ import annotations # for annotating with the Petri net classes of pm4py without importing them
 import math # for logarithm and infinity value
-import networkx # for easy calculation of graph properties
-from tabulate import tabulate # for printing the connection values for cross-connectivity, if enabled
+import numpy # for calculations on the arrays of compiled models
+from typing import TYPE_CHECKING # for importing the Petri net classes of pm4py only for type checkers
 
-from pm4py.objects.petri_net.obj import PetriNet, Marking # for maintaining Petri nets
+import LazyImport # (internal) for importing networkx on first use
+from modelcomplexity import GraphAlgorithms # (internal) for efficient algorithms on the graphs of models
+from modelcomplexity.CompiledModel import compile_model # (internal) for the representation shared by all measures
+
+if TYPE_CHECKING:
+    from pm4py.objects.petri_net.obj import PetriNet, Marking # for maintaining Petri nets
+
+networkx = LazyImport.lazy_module("networkx") # for easy calculation of graph properties
 
 def transform_to_networkx(model: PetriNet, undirected=False):
     """
@@ -33,10 +41,11 @@ def transform_to_networkx(model: PetriNet, undirected=False):
 def measure_size(model: PetriNet):
     """
     Returns the size of the model, i.e., the number of places and transitions.
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The amount of places plus the amount of transitions in the Petri net
     """
-    return len(model.places) + len(model.transitions)
+    compiled = compile_model(model)
+    return compiled.number_of_nodes
 
 def measure_connector_mismatch(model: PetriNet):
     """
@@ -44,19 +53,16 @@ def measure_connector_mismatch(model: PetriNet):
     This is done by taking the difference of arcs starting a parallel execution
     and the arcs ending a parallel execution, and adding this value to the
     difference of arcs starting a choice and the arcs ending a choice.
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The connector mismatch value of the Petri net
     """
-    def mismatch_value(node_list):
-        mismatch = 0
-        for node in node_list:
-            if len(node.out_arcs) > 1:
-                mismatch += len(node.out_arcs)
-            if len(node.in_arcs) > 1:
-                mismatch -= len(node.in_arcs)
-        return abs(mismatch)
-    and_mismatch = mismatch_value(model.places)
-    xor_mismatch = mismatch_value(model.transitions)
+    compiled = compile_model(model)
+    def mismatch_value(is_node_type):
+        out_degree = compiled.out_degree[is_node_type]
+        in_degree = compiled.in_degree[is_node_type]
+        return abs(int(out_degree[out_degree > 1].sum()) - int(in_degree[in_degree > 1].sum()))
+    and_mismatch = mismatch_value(compiled.is_place)
+    xor_mismatch = mismatch_value(~compiled.is_place)
     return and_mismatch + xor_mismatch
 
 def measure_connector_heterogeneity(model: PetriNet):
@@ -67,17 +73,12 @@ def measure_connector_heterogeneity(model: PetriNet):
     is 0. If the model contains equally many connectors of each type (and / xor),
     its heterogeneity is 1. If the model does not contain any connectors, the
     measure is undefined and this method returns None.
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The connector heterogeneity of the input model
     """
-    def count_connectors(node_list):
-        connectors = 0
-        for node in node_list:
-            if len(node.out_arcs) > 1 or len(node.in_arcs) > 1:
-                connectors += 1
-        return connectors
-    and_connectors = count_connectors(model.places)
-    xor_connectors = count_connectors(model.transitions)
+    compiled = compile_model(model)
+    and_connectors = int((compiled.is_connector & compiled.is_place).sum())
+    xor_connectors = int((compiled.is_connector & ~compiled.is_place).sum())
     all_connectors = and_connectors + xor_connectors
     if all_connectors == 0:
         return None
@@ -87,7 +88,7 @@ def measure_connector_heterogeneity(model: PetriNet):
         return 0
     return -(and_ratio * math.log2(and_ratio) + xor_ratio * math.log2(xor_ratio))
 
-def measure_cross_connectivity(model: PetriNet, detailed=False):
+def measure_cross_connectivity(model: PetriNet, detailed=False, reference=False, workers=1):
     """
     Returns the cross connectivity metric for the input model. This metric evaluates
     how strong the connections between nodes are. A connection is considered strong
@@ -97,27 +98,65 @@ def measure_cross_connectivity(model: PetriNet, detailed=False):
     nodes have weight 1. The weight of an edge (u,v) is w(u) * w(v). The weight of
     a path v1,...,vk is w(v1)*...*w(vk). The value of a connection between two nodes
     u and v is the maximum weight of a path between u and v. The cross connectivity
-    is one minus the mean value of any connection. This algorithm calculates the
-    cross connectivity metric by calculating all simple paths and finding the length
-    of the longest one and is therefore runtime-heavy, as this must be done for all
-    pairs of nodes in the model. Using Dijkstra instead would not work because the
-    logarithm of all edge weights is <= 0. Bellman-Ford would also not work, because
-    it is possible to have loops with negative total weight.
-    :param model: A Petri net in pm4py-format
+    is one minus the mean value of any connection. Since all weights lie in (0,1],
+    extending a path never increases its weight, so the value of all connections
+    starting in a node can be found by a single run of Dijkstra's algorithm that
+    maximizes the product of the weights. If reference is set, this method instead
+    calculates all simple paths and finds the one with the highest weight, which is
+    runtime-heavy, as this must be done for all pairs of nodes in the model.
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :param detailed: A boolean deciding whether to print the whole value table
+    :param reference: A boolean deciding whether to enumerate all simple paths instead of using Dijkstra
+    :param workers: The number of processes used to distribute the runs of Dijkstra's algorithm
     :return: The cross connectivity metric for the net
     """
-    model_graph = transform_to_networkx(model)
+    compiled = compile_model(model)
     # calculate the weights of nodes in the graph
-    node_weights = {}
-    for node in model_graph.nodes:
-        node_weights[node] = 1
-        # check if the node n is a xor-split. If so, its weight is 1 / deg(n)
-        if type(node) is PetriNet.Place and (len(node.in_arcs) > 1 or len(node.out_arcs) > 1):
-            node_weights[node] = 1 / (len(node.in_arcs) + len(node.out_arcs))
+    # a place n that is a xor-connector has weight 1 / deg(n), all other nodes have weight 1
+    node_weights = numpy.ones(compiled.number_of_nodes)
+    xor_connectors = compiled.is_place & compiled.is_connector
+    node_weights[xor_connectors] = 1 / compiled.degree[xor_connectors]
     # calculate the weights of edges in the graph
-    for edge in model_graph.edges:
-        model_graph.edges[edge]['weight'] = node_weights[edge[0]] * node_weights[edge[1]]
+    edge_weights = (node_weights[compiled.edges[:, 0]] * node_weights[compiled.edges[:, 1]]).tolist()
+    if reference:
+        model_graph = compiled.graph().copy()
+        for (u, v), weight in zip(compiled.edges.tolist(), edge_weights):
+            model_graph.edges[u, v]['weight'] = weight
+        highest_path_weights = reference_highest_path_weights(model_graph)
+    else:
+        adjacency = [[] for _ in range(compiled.number_of_nodes)]
+        for (u, v), weight in zip(compiled.edges.tolist(), edge_weights):
+            adjacency[u].append((v, weight))
+        highest_path_weights = GraphAlgorithms.maximum_path_weights_for(adjacency, workers)
+    # sum the maximum weights of each path
+    sum_of_path_weights = 0
+    values = [["V(u,v)"] + [str(u) for u in compiled.nodes]]
+    for i in range(compiled.number_of_nodes):
+        u_val = [str(compiled.nodes[i])]
+        for j in range(compiled.number_of_nodes):
+            # find the highest weight of a path from u to v
+            highest_path_weight = highest_path_weights[i][j]
+            if highest_path_weight is not None:
+                u_val += [str(round(highest_path_weight, 5))]
+                sum_of_path_weights += highest_path_weight
+            else:
+                u_val += ["0"]
+        values += [u_val]
+    if detailed:
+        from tabulate import tabulate
+        print(tabulate(values, headers='firstrow', tablefmt='fancy_grid'))
+    maximum_sum_of_path_weights = compiled.number_of_nodes * (compiled.number_of_nodes - 1)
+    cross_connectivity = 1 - (sum_of_path_weights / maximum_sum_of_path_weights)
+    return cross_connectivity
+
+def reference_highest_path_weights(model_graph: networkx.DiGraph):
+    """
+    Calculates the highest weight of a path between any two nodes of a graph with weighted edges, by enumerating all
+    simple paths between the nodes. This is exponential in the size of the graph, but closely follows the definition
+    of cross connectivity, so it can be used to verify the results of faster methods.
+    :param model_graph: A networkx graph, whose edges have the attribute 'weight'
+    :return: A matrix, where entry [i][j] is the highest weight of a non-empty path from the i-th to the j-th node, or None if there is no such path
+    """
     # define a method for calculating paths starting and ending at the same node
     def get_all_cyclic_paths(start):
         # calculate all simple paths from start to any other node
@@ -134,7 +173,7 @@ def measure_cross_connectivity(model: PetriNet, detailed=False):
         return single_loop_iterations
     # define a method for calculating all paths
     def get_all_paths(start, end):
-        # calculate all simple paths from start to end, as Dijkstra and Bellman-Ford are not applicable here
+        # calculate all simple paths from start to end
         all_simple_paths = list(networkx.all_simple_paths(model_graph, start, end))
         # remove path that consist of only a single node
         all_simple_paths = [path for path in all_simple_paths if len(path) > 1]
@@ -147,27 +186,17 @@ def measure_cross_connectivity(model: PetriNet, detailed=False):
         for i in range(len(simple_path)-1):
             weight *= model_graph.edges[simple_path[i], simple_path[i+1]]['weight']
         return weight
-    # sum the maximum weights of each path
-    sum_of_path_weights = 0
-    values = [["V(u,v)"] + [str(u) for u in model_graph.nodes]]
+    highest_path_weights = []
     for u in model_graph.nodes:
-        u_val = [str(u)]
+        u_weights = []
         for v in model_graph.nodes:
-            # calculate all paths from u to v
             all_paths = get_all_paths(u, v)
-            # find the longest path of the ones found
             if len(all_paths) > 0:
-                highest_path_weight = max([path_weight(path) for path in all_paths])
-                u_val += [str(round(highest_path_weight, 5))]
-                sum_of_path_weights += highest_path_weight
+                u_weights += [max([path_weight(path) for path in all_paths])]
             else:
-                u_val += ["0"]
-        values += [u_val]
-    if detailed:
-        print(tabulate(values, headers='firstrow', tablefmt='fancy_grid'))
-    maximum_sum_of_path_weights = len(model_graph.nodes) * (len(model_graph.nodes) - 1)
-    cross_connectivity = 1 - (sum_of_path_weights / maximum_sum_of_path_weights)
-    return cross_connectivity
+                u_weights += [None]
+        highest_path_weights += [u_weights]
+    return highest_path_weights
 
 
 def measure_token_split(model: PetriNet):
@@ -176,14 +205,12 @@ def measure_token_split(model: PetriNet):
     tokens. For example, if a transition has three out-going arcs, its impact on this
     complexity measure is 2, since 2 of the arcs create new tokens, while one arc
     can 'reuse' the already existing token.
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The sum of arcs leaving transitions minus the amount of transitions
     """
-    token_split = 0
-    for transition in model.transitions:
-        if len(transition.out_arcs) > 1:
-            token_split += len(transition.out_arcs) - 1
-    return token_split
+    compiled = compile_model(model)
+    out_degree = compiled.out_degree[~compiled.is_place]
+    return int((out_degree[out_degree > 1] - 1).sum())
 
 def measure_control_flow_complexity(model: PetriNet):
     """
@@ -193,92 +220,68 @@ def measure_control_flow_complexity(model: PetriNet):
     flows, so their impact on complexity is 1 each. Exclusive choice splits, on the
     other hand, add one possible control flow per arc, so their impact on complexity
     is the number of leaving arcs.
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The amount of parallel splits plus the amount of arcs leaving exclusive choice splits
     """
-    and_connector_impact = 0
-    for transition in model.transitions:
-        if len(transition.out_arcs) > 1:
-            and_connector_impact += 1
-    xor_connector_impact = 0
-    for place in model.places:
-        if len(place.out_arcs) > 1:
-            xor_connector_impact += len(place.out_arcs)
+    compiled = compile_model(model)
+    transition_out_degree = compiled.out_degree[~compiled.is_place]
+    and_connector_impact = int((transition_out_degree > 1).sum())
+    place_out_degree = compiled.out_degree[compiled.is_place]
+    xor_connector_impact = int(place_out_degree[place_out_degree > 1].sum())
     return and_connector_impact + xor_connector_impact
 
 def measure_separability(model: PetriNet):
     """
     Returns the ratio of nodes that are no articulation points
     if we interpret the model as an undirected graph.
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The ratio of nodes that aren't articulation points in the net
     """
-    model_graph = transform_to_networkx(model, undirected=True)
+    compiled = compile_model(model)
+    model_graph = compiled.graph(undirected=True)
     number_of_cut_vertices = len(list(networkx.articulation_points(model_graph)))
-    return 1 - (number_of_cut_vertices / (len(model.places) + len(model.transitions) - 2))
+    return 1 - (number_of_cut_vertices / (compiled.number_of_nodes - 2))
 
 def measure_average_connector_degree(model: PetriNet):
     """
     Returns the average degree of connectors in the Petri net.
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The average number of incoming and outgoing arcs of a connector in the net
     """
-    sum_of_degrees = 0
-    number_of_connectors = 0
-    for place in model.places:
-        if len(place.in_arcs) > 1 or len(place.out_arcs) > 1:
-            sum_of_degrees += len(place.in_arcs) + len(place.out_arcs)
-            number_of_connectors += 1
-    for transition in model.transitions:
-        if len(transition.in_arcs) > 1 or len(transition.out_arcs) > 1:
-            sum_of_degrees += len(transition.in_arcs) + len(transition.out_arcs)
-            number_of_connectors += 1
+    compiled = compile_model(model)
+    number_of_connectors = int(compiled.is_connector.sum())
     if number_of_connectors == 0:
         return None
+    sum_of_degrees = int(compiled.degree[compiled.is_connector].sum())
     return sum_of_degrees / number_of_connectors
 
 def measure_maximum_connector_degree(model: PetriNet):
     """
     Returns the maximum degree of a connector in the model.
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The maximum degree of a connector in the Petri net
     """
-    maximum_degree = 0
-    for place in model.places:
-        if len(place.in_arcs) > 1 or len(place.out_arcs) > 1:
-            degree = len(place.in_arcs) + len(place.out_arcs)
-            if degree > maximum_degree:
-                maximum_degree = degree
-    for transition in model.transitions:
-        if len(transition.in_arcs) > 1 or len(transition.out_arcs) > 1:
-            degree = len(transition.in_arcs) + len(transition.out_arcs)
-            if degree > maximum_degree:
-                maximum_degree = degree
-    return maximum_degree
+    compiled = compile_model(model)
+    if not compiled.is_connector.any():
+        return 0
+    return int(compiled.degree[compiled.is_connector].max())
 
 def measure_sequentiality(model: PetriNet):
     """
     Returns the sequentiality of the model, which is the amount of arcs
     between nodes out of which at least one is a connector node, divided
     by the total amount of arcs in the model.
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The ratio of sequential arcs in the net
     """
-    sequentiality = 0
-    connectors = set()
-    for place in model.places:
-        if len(place.in_arcs) > 1 or len(place.out_arcs) > 1:
-            connectors.add(place)
-    for transition in model.transitions:
-        if len(transition.in_arcs) > 1 or len(transition.out_arcs) > 1:
-            connectors.add(transition)
-    for arc in model.arcs:
-        if arc.source not in connectors and arc.target not in connectors:
-            sequentiality += 1
-    sequentiality = 1 - (sequentiality / len(model.arcs))
+    compiled = compile_model(model)
+    source_is_connector = compiled.is_connector[compiled.edges[:, 0]]
+    target_is_connector = compiled.is_connector[compiled.edges[:, 1]]
+    sequentiality = int((~source_is_connector & ~target_is_connector).sum())
+    sequentiality = 1 - (sequentiality / compiled.number_of_edges)
     return sequentiality
 
-def measure_depth(model: PetriNet, initial_marking: Marking, final_marking: Marking):
+def measure_depth(model: PetriNet, initial_marking: Marking = None, final_marking: Marking = None):
     """
     Calculates the maximum depth of a node in the model. The depth of a node
     is the minimum of its in-depth and its out-depth. The in-depth of a node
@@ -288,63 +291,30 @@ def measure_depth(model: PetriNet, initial_marking: Marking, final_marking: Mark
     encountered in a path from the node to a final node (one that contains a
     token in the final marking) that without a preceding split-node in the
     same path.
-    :param model: A Petri net in pm4py-format
-    :param initial_marking: The initial marking of the Petri net, in pm4py-format
-    :param final_marking: The final marking of the Petri net, in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
+    :param initial_marking: The initial marking of the Petri net, in pm4py-format (not needed for a CompiledModel)
+    :param final_marking: The final marking of the Petri net, in pm4py-format (not needed for a CompiledModel)
     :return: The maximum depth of a node in the net
     """
-    model_graph = transform_to_networkx(model)
+    compiled = compile_model(model, initial_marking, final_marking)
     # initialize the in_depth and the out_depth of each node with 0
-    in_depth = {}
-    out_depth = {}
-    for node in model_graph.nodes:
-        in_depth[node] = 0
-        out_depth[node] = 0
+    in_depth = [0] * compiled.number_of_nodes
+    out_depth = [0] * compiled.number_of_nodes
+    in_degree = compiled.in_degree.tolist()
+    out_degree = compiled.out_degree.tolist()
     # go through all nodes in a breadth first search, starting from a start node, and update the in_depth
-    for start_node in initial_marking.keys():
-        bfs_tree = networkx.bfs_tree(model_graph, start_node)
-        queue = [start_node]
-        while len(queue) > 0:
-            current_node = queue.pop(0)
-            # add all neighbors of the current node to the queue
-            queue += [neighbor for neighbor in bfs_tree[current_node]]
-            # get the parent nodes, of which there can be only 0 (if the current node is the root) or 1 (otherwise)
-            parents = [edge[0] for edge in bfs_tree.in_edges(current_node)]
-            if len(parents) != 0:
-                parent = parents[0] # in a tree each node, except for the root, has exactly one parent
-                if len(parent.out_arcs) > 1 >= len(current_node.in_arcs):
-                    in_depth[current_node] = max(in_depth[current_node], in_depth[parent] + 1)
-                elif len(current_node.in_arcs) > 1 >= len(parent.out_arcs):
-                    in_depth[current_node] = max(in_depth[current_node], in_depth[parent] - 1)
-                else:
-                    in_depth[current_node] = max(in_depth[current_node], in_depth[parent])
+    GraphAlgorithms.fill_depths(compiled.initial_nodes, compiled.successor_lists(), out_degree, in_degree, in_depth)
     # go through all nodes in a reversed breadth first search, starting from a final node, and update the out_depth
-    for final_node in final_marking.keys():
-        bfs_tree = networkx.bfs_tree(model_graph, final_node, reverse=True)
-        queue = [final_node]
-        while len(queue) > 0:
-            current_node = queue.pop(0)
-            # add all neighbors of the current node to the queue
-            queue += [neighbor for neighbor in bfs_tree[current_node]]
-            # get the parent nodes, of which there can be only 0 (if the current node is the root) or 1 (otherwise)
-            parents = [edge[0] for edge in bfs_tree.in_edges(current_node)]
-            if len(parents) != 0:
-                parent = parents[0] # in a tree each node, except for the root, has exactly one parent
-                if len(parent.in_arcs) > 1 >= len(current_node.out_arcs):
-                    out_depth[current_node] = max(out_depth[current_node], out_depth[parent] + 1)
-                elif len(current_node.out_arcs) > 1 >= len(parent.in_arcs):
-                    out_depth[current_node] = max(out_depth[current_node], out_depth[parent] - 1)
-                else:
-                    out_depth[current_node] = max(out_depth[current_node], out_depth[parent])
+    GraphAlgorithms.fill_depths(compiled.final_nodes, compiled.predecessor_lists(), in_degree, out_degree, out_depth)
     # calculate the depth of each node
     maximum_depth = -math.inf
-    for node in model_graph.nodes:
+    for node in range(compiled.number_of_nodes):
         depth = min(in_depth[node], out_depth[node])
         if depth > maximum_depth:
             maximum_depth = depth
     return maximum_depth
 
-def measure_diameter(model: PetriNet, initial_marking: Marking, final_marking: Marking):
+def measure_diameter(model: PetriNet, initial_marking: Marking = None, final_marking: Marking = None):
     """
     Returns the diameter of the PetriNet, if interpreted as a directed graph.
     In other words, if we consider all places and transitions to be nodes in the
@@ -352,54 +322,49 @@ def measure_diameter(model: PetriNet, initial_marking: Marking, final_marking: M
     of the longest acyclic path from a start node to an end node.
     Start nodes are all nodes that are marked in the initial marking, end nodes
     are all nodes that contain a token in the final marking.
-    :param model: A Petri net in pm4py-format
-    :param initial_marking: The initial marking of the Petri net in pm4py-format
-    :param final_marking: The final marking of the Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
+    :param initial_marking: The initial marking of the Petri net in pm4py-format (not needed for a CompiledModel)
+    :param final_marking: The final marking of the Petri net in pm4py-format (not needed for a CompiledModel)
     :return: The longest acyclic path from an initially marked place to a finally marked place
     """
-    # Create a networkx graph that represents the Petri net
-    model_graph = transform_to_networkx(model)
-    # calculate the longest path-length between a start and end node
-    maximum_path_length = -math.inf
-    # a start node is a node that is marked initially
-    for start_node in initial_marking.keys():
-        # an end node is a node that contains a token in the final marking
-        for end_node in final_marking.keys():
-            all_paths = list(networkx.all_simple_paths(model_graph, start_node, end_node))
-            if len(all_paths) == 0:
-                longest_acyclic_path_length = math.inf
-            else:
-                longest_acyclic_path_length = len(max(all_paths, key=lambda path: len(path)))
-            if longest_acyclic_path_length > maximum_path_length:
-                maximum_path_length = longest_acyclic_path_length
-    return maximum_path_length
+    compiled = compile_model(model, initial_marking, final_marking)
+    # a start node is a node that is marked initially, an end node is a node that contains a token in the final marking
+    return GraphAlgorithms.longest_simple_path_length(compiled.graph(), compiled.initial_nodes, compiled.final_nodes)
 
-def measure_cyclicity(model: PetriNet):
+def measure_cyclicity(model: PetriNet, reference=False):
     """
     Returns the cyclicity of the input model, i.e. the ratio of
-    nodes in the model that lie on a cycle.
-    :param model: A Petri net in pm4py-format
+    nodes in the model that lie on a cycle. The nodes on cycles are
+    found by a decomposition into strongly connected components. If
+    reference is set, this method instead enumerates all simple cycles,
+    which takes exponential time.
+    :param model: A Petri net in pm4py-format, or its CompiledModel
+    :param reference: A boolean deciding whether to enumerate all simple cycles
     :return: The ratio of nodes that lie on a cycle in the net
     """
-    # Create a networkx graph that represents the Petri net
-    model_graph = transform_to_networkx(model)
-    # Calculate all cycles in the model graph
-    cycles = networkx.simple_cycles(model_graph)
-    # Create a set of nodes that lie on cycles
-    nodes_on_cycles = set()
-    for cycle in cycles:
-        for node in cycle:
-            nodes_on_cycles.add(node)
-    return len(nodes_on_cycles) / (len(model.places) + len(model.transitions) - 2)
+    compiled = compile_model(model)
+    model_graph = compiled.graph()
+    if reference:
+        # Calculate all cycles in the model graph
+        cycles = networkx.simple_cycles(model_graph)
+        # Create a set of nodes that lie on cycles
+        nodes_on_cycles = set()
+        for cycle in cycles:
+            for node in cycle:
+                nodes_on_cycles.add(node)
+    else:
+        nodes_on_cycles = GraphAlgorithms.nodes_on_cycles(model_graph)
+    return len(nodes_on_cycles) / (compiled.number_of_nodes - 2)
 
 def measure_coefficient_of_network_connectivity(model: PetriNet):
     """
     Returns the coefficient of network connectivity of the model, which is
     the amount of arcs divided by the amount of nodes in the model.
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The amount of arcs divided by the amount of nodes in the net
     """
-    return len(model.arcs) / (len(model.places) + len(model.transitions))
+    compiled = compile_model(model)
+    return compiled.number_of_edges / compiled.number_of_nodes
 
 def measure_density(model: PetriNet):
     """
@@ -407,11 +372,12 @@ def measure_density(model: PetriNet):
     by the total possible amount of arcs. Since a Petri net is a bipartite
     graph, there can be at most 2 * |T| * |P| directed edges (where T is the
     set of transitions and P is the set of places).
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The amount of arcs divided by 2 * |T| * |P|, where T is the set of transitions and P the set of places
     """
-    number_of_arcs = len(model.arcs)
-    maximum_number_of_arcs = 2 * len(model.transitions) * (len(model.places) - 1)
+    compiled = compile_model(model)
+    number_of_arcs = compiled.number_of_edges
+    maximum_number_of_arcs = 2 * compiled.number_of_transitions * (compiled.number_of_places - 1)
     return number_of_arcs / maximum_number_of_arcs
 
 def measure_number_of_duplicate_tasks(model: PetriNet):
@@ -420,15 +386,16 @@ def measure_number_of_duplicate_tasks(model: PetriNet):
     For example, if the transition label "a" occurs three times in the
     net, and all other transition labels occur once, this method returns 2,
     because the label "a" was repeated two times.
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The number of repetitions of transition labels in the net
     """
+    compiled = compile_model(model)
     encountered_transition_labels = set()
     duplicates = 0
-    for transition in model.transitions:
-        if transition.label in encountered_transition_labels:
+    for label in compiled.labels:
+        if label in encountered_transition_labels:
             duplicates += 1
-        encountered_transition_labels.add(transition.label)
+        encountered_transition_labels.add(label)
     return duplicates
 
 def measure_empty_sequence_flows(model: PetriNet):
@@ -436,19 +403,13 @@ def measure_empty_sequence_flows(model: PetriNet):
     Returns the number of empty sequence flows, which is the
     number of places that have just parallel splits in their
     preset and parallel joins in their postset.
-    :param model: A Petri net in pm4py-format
+    :param model: A Petri net in pm4py-format, or its CompiledModel
     :return: The number of places with just parallel splits in their preset and parallel joins in their postset
     """
-    empty_sequence_flows = 0
-    for place in model.places:
-        are_all_previous_and_splits = True
-        for in_arc in place.in_arcs:
-            if len(in_arc.source.out_arcs) <= 1:
-                are_all_previous_and_splits = False
-        are_all_next_and_joins = True
-        for out_arc in place.out_arcs:
-            if len(out_arc.target.in_arcs) <= 1:
-                are_all_next_and_joins = False
-        if are_all_previous_and_splits and are_all_next_and_joins:
-            empty_sequence_flows += 1
-    return empty_sequence_flows
+    compiled = compile_model(model)
+    # a place counts if all nodes in its preset are parallel splits and all nodes in its postset are parallel joins
+    previous_is_and_split = compiled.out_degree[compiled.edges[:, 0]] > 1
+    next_is_and_join = compiled.in_degree[compiled.edges[:, 1]] > 1
+    has_other_previous = numpy.bincount(compiled.edges[~previous_is_and_split, 1], minlength=compiled.number_of_nodes) > 0
+    has_other_next = numpy.bincount(compiled.edges[~next_is_and_join, 0], minlength=compiled.number_of_nodes) > 0
+    return int((compiled.is_place & ~has_other_previous & ~has_other_next).sum())
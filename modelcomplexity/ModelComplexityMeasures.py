@@ -1,4 +1,5 @@
 from modelcomplexity import ModelComplexity
+from modelcomplexity.CompiledModel import CompiledModel, compile_model
 from discovery.DirectlyFollowsGraph import DirectlyFollowsGraph
 
 class Size:
@@ -142,9 +143,10 @@ class Depth:
         if type(model) == DirectlyFollowsGraph:
             return model.depth()
         else:
-            if initial_marking is None or final_marking is None:
+            model = compile_model(model, initial_marking, final_marking)
+            if not model.has_markings:
                 raise Exception("Cannot calculate the Depth of the model without an initial and final marking.")
-            return ModelComplexity.measure_depth(model, initial_marking, final_marking)
+            return ModelComplexity.measure_depth(model)
 
 class Diameter:
     name = "Diameter"
@@ -157,9 +159,10 @@ class Diameter:
         if type(model) == DirectlyFollowsGraph:
             return model.diameter()
         else:
-            if initial_marking is None or final_marking is None:
+            model = compile_model(model, initial_marking, final_marking)
+            if not model.has_markings:
                 raise Exception("Cannot calculate the Diameter of the model without an initial and final marking.")
-            return ModelComplexity.measure_diameter(model, initial_marking, final_marking)
+            return ModelComplexity.measure_diameter(model)
 
 class Cyclicity:
     name = "Cyclicity"
@@ -232,6 +235,7 @@ class NumberOfEmptySequenceFlows:
 #    which is a short name for the measure shown in the tables of the analysis. Furthermore, your class must
 #    implement the functions __str__ (returning the name of the measure) and calculate_for, which takes a
 #    process model (possibly a Directly Follows Graph) and calculates the result of your measure for this model.
+#    Petri nets are passed as a CompiledModel, which is built once per model and shared by all measures.
 # 2. Add an instance of your new class to the following list of all model complexity measures.
 #    If your measure is also applicable to directly follows graphs, add it also to the list of all
 #    complexity measures for DFGs.
@@ -244,4 +248,18 @@ all_model_complexity_measures = [Size(), ConnectorMismatch(), ConnectorHeterogen
 
 dfg_model_complexity_measures = [Size(), ConnectorMismatch(), CrossConnectivity(), ControlFlowComplexity(),
                                  Separability(), AverageConnectorDegree(), MaximumConnectorDegree(), Sequentiality(),
-                                 Depth(), Diameter(), Cyclicity(), CoefficientOfNetworkConnectivity(), Density()]
\ No newline at end of file
+                                 Depth(), Diameter(), Cyclicity(), CoefficientOfNetworkConnectivity(), Density()]
+
+
+def prepare_model(net, initial_marking, final_marking):
+    """
+    Prepares a discovered model for the calculation of complexity scores. Petri nets are compiled once, so that all
+    complexity measures can share the compiled representation, while directly follows graphs are kept as they are.
+    :param net: a discovered model, i.e., a Petri net in pm4py-format or a DirectlyFollowsGraph
+    :param initial_marking: the initial marking of the Petri net, or None
+    :param final_marking: the final marking of the Petri net, or None
+    :return: the model that should be passed to the calculate_for functions of the complexity measures
+    """
+    if type(net) == DirectlyFollowsGraph:
+        return net
+    return CompiledModel(net, initial_marking, final_marking)
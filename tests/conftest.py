@@ -0,0 +1,6 @@
+import os # for the path of the repository
+import sys # for importing the modules of the repository
+
+# the root folder of the repository, which contains the packages of anaLOG
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_PATH)
@@ -0,0 +1,32 @@
+import os # for exiting processes on purpose
+
+from analysis import BatchAnalysis # (internal) for running event logs in separate processes
+
+
+def exit_on_purpose(number: int, marker_filename=None):
+    """
+    A stand-in for the analysis of an event log, which kills its process if the number is 1. If a marker file is
+    passed, the process is only killed the first time, when the marker file does not exist yet.
+    :param number: the number of the job
+    :param marker_filename: the file-path of the marker file, or None
+    :return: the doubled number
+    """
+    if number == 1:
+        if marker_filename is None:
+            os._exit(1)
+        if not os.path.exists(marker_filename):
+            open(marker_filename, "w").close()
+            os._exit(1)
+    return 2 * number
+
+
+def test_killed_process_only_affects_its_own_job():
+    arguments_of = {number: (number,) for number in range(6)}
+    results = BatchAnalysis.run_in_separate_processes(exit_on_purpose, arguments_of, 2)
+    assert results == {0: 0, 1: None, 2: 4, 3: 6, 4: 8, 5: 10}
+
+def test_job_whose_process_was_killed_once_is_retried(tmp_path):
+    marker_filename = str(tmp_path / "killed-once")
+    arguments_of = {number: (number, marker_filename) for number in range(4)}
+    results = BatchAnalysis.run_in_separate_processes(exit_on_purpose, arguments_of, 2)
+    assert results == {0: 0, 1: 2, 2: 4, 3: 6}
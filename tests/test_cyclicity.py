@@ -0,0 +1,97 @@
+import random # for generating seeded random models
+import functools # for collecting the example event logs only once
+
+import pytest # for parametrizing the tests
+from pm4py.objects.petri_net.obj import PetriNet # for building random Petri nets
+from pm4py.objects.petri_net.utils import petri_utils # for adding arcs to random Petri nets
+
+import Constants # (internal) for the markers of the start and the end of traces
+from analysis import EventLogHandler, ModelHandler, PaperResults # (internal) for the example event logs of the paper
+from discovery import DiscoveryAlgorithms, DirectlyFollowsGraph # (internal) for discovering the models to compare
+from logcomplexity import DirectlyFollowsMatrix # (internal) for building random directly follows graphs
+from modelcomplexity import ModelComplexity, ModelComplexityMeasures # (internal) for the cyclicity measure
+
+
+def cyclicity_pair(model):
+    """
+    Calculates the cyclicity of a model both from strongly connected components and by enumerating all simple cycles.
+    :param model: a Petri net in pm4py-format, or a DirectlyFollowsGraph
+    :return: the cyclicity found by the default method, and the cyclicity found by the reference method
+    """
+    if type(model) == DirectlyFollowsGraph.DirectlyFollowsGraph:
+        return model.cyclicity(), model.cyclicity(reference=True)
+    return ModelComplexity.measure_cyclicity(model), ModelComplexity.measure_cyclicity(model, reference=True)
+
+@functools.cache
+def paper_event_logs():
+    """
+    Collects the event logs that the analyses of the paper show for any pair of miner and model complexity measure,
+    without printing tables, discovering models or storing files.
+    :return: a list of distinct event logs, each given as a list of strings
+    """
+    event_logs = []
+    def record_event_logs(languages, measures, logname_prefix=""):
+        for language in languages:
+            if language not in event_logs:
+                event_logs.append(language)
+        return []
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(EventLogHandler, "show_event_log_comparison", record_event_logs)
+        monkeypatch.setattr(ModelHandler, "show_model_comparison", lambda *arguments, **keywords: None)
+        monkeypatch.setattr("builtins.print", lambda *arguments, **keywords: None)
+        for miner in DiscoveryAlgorithms.all_discovery_algorithms:
+            # the paper only analyzes directly follows graphs for the measures that apply to them
+            if type(miner) == DiscoveryAlgorithms.DirectlyFollowsGraphMiner:
+                measures = ModelComplexityMeasures.dfg_model_complexity_measures
+            else:
+                measures = ModelComplexityMeasures.all_model_complexity_measures
+            for measure in measures:
+                PaperResults.show_analysis_for(measure, miner)
+    return tuple(event_logs)
+
+def random_petri_net(seed: int):
+    generator = random.Random(seed)
+    net = PetriNet("random net " + str(seed))
+    places = [PetriNet.Place("p" + str(i)) for i in range(generator.randint(2, 8))]
+    transitions = [PetriNet.Transition("t" + str(i), "t" + str(i)) for i in range(generator.randint(1, 8))]
+    net.places.update(places)
+    net.transitions.update(transitions)
+    for transition in transitions:
+        for place in generator.sample(places, generator.randint(0, min(3, len(places)))):
+            petri_utils.add_arc_from_to(place, transition, net)
+        for place in generator.sample(places, generator.randint(0, min(3, len(places)))):
+            petri_utils.add_arc_from_to(transition, place, net)
+    return net
+
+def random_directly_follows_graph(seed: int):
+    generator = random.Random(seed)
+    activities = [chr(ord("a") + i) for i in range(generator.randint(1, 8))]
+    traces = [tuple(generator.choices(activities, k=generator.randint(1, 6))) for _ in range(generator.randint(1, 6))]
+    directly_follows_counts = {}
+    for trace in traces:
+        for pair in zip((Constants.start_marker,) + trace, trace + (Constants.end_marker,)):
+            directly_follows_counts[pair] = directly_follows_counts.get(pair, 0) + 1
+    # the activities get their ids in the order of their first occurrence, like in a ColumnarLog
+    activity_names = list(dict.fromkeys(activity for trace in traces for activity in trace))
+    directly_follows_matrix = DirectlyFollowsMatrix.from_directly_follows_counts(activity_names, directly_follows_counts)
+    return DirectlyFollowsGraph.from_directly_follows_matrix(directly_follows_matrix)
+
+
+@pytest.mark.parametrize("miner", DiscoveryAlgorithms.all_discovery_algorithms, ids=str)
+def test_cyclicity_of_paper_models(miner):
+    event_logs = paper_event_logs()
+    assert len(event_logs) > 0
+    for language in event_logs:
+        model, _, _ = miner.discover_for(EventLogHandler.convert_language_to_event_log(language))
+        cyclicity, reference_cyclicity = cyclicity_pair(model)
+        assert cyclicity == reference_cyclicity, language
+
+@pytest.mark.parametrize("seed", range(200))
+def test_cyclicity_of_random_petri_nets(seed):
+    cyclicity, reference_cyclicity = cyclicity_pair(random_petri_net(seed))
+    assert cyclicity == reference_cyclicity
+
+@pytest.mark.parametrize("seed", range(200))
+def test_cyclicity_of_random_directly_follows_graphs(seed):
+    cyclicity, reference_cyclicity = cyclicity_pair(random_directly_follows_graph(seed))
+    assert cyclicity == reference_cyclicity
@@ -0,0 +1,37 @@
+import os # for listing the folders of a cached event log
+import json # for writing an entry in the layout of earlier versions
+
+import pytest # for expecting errors
+
+from logcomplexity import ColumnarLog, LogCache # (internal) for storing and loading columnar logs
+
+
+def columnar_log_of(traces: list):
+    activity_names = sorted({activity for trace in traces for activity in trace})
+    activities = [activity_names.index(activity) for trace in traces for activity in trace]
+    offsets = [0]
+    for trace in traces:
+        offsets += [offsets[-1] + len(trace)]
+    return ColumnarLog.from_arrays(activity_names, activities, offsets, case_ids=[str(i) for i in range(len(traces))])
+
+def array_folders_of(entry_path: str):
+    return [folder for folder in os.listdir(entry_path) if folder.startswith(LogCache.ARRAYS_PREFIX)]
+
+
+def test_stored_log_replaces_the_arrays_of_the_earlier_import(tmp_path):
+    entry_path = str(tmp_path)
+    LogCache.store_columnar_log(entry_path, columnar_log_of([("a", "b"), ("a", "c")]), False)
+    LogCache.store_columnar_log(entry_path, columnar_log_of([("a", "b"), ("a", "c"), ("b", "c", "d")]), True)
+    metadata, columnar_log = LogCache.load_columnar_log(entry_path)
+    assert metadata["complete"] and metadata["number of traces"] == 3
+    assert [columnar_log.variant(i) for i in range(len(columnar_log))] == [("a", "b"), ("a", "c"), ("b", "c", "d")]
+    assert array_folders_of(entry_path) == [metadata["arrays"]]
+
+def test_entry_without_folder_of_arrays_is_not_loaded(tmp_path):
+    entry_path = str(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        LogCache.load_columnar_log(entry_path)
+    with open(os.path.join(entry_path, "log.json"), "w") as metadata_file:
+        json.dump({"number of traces": 1, "complete": True, "activity names": ["a"], "case ids": ["0"]}, metadata_file)
+    with pytest.raises(FileNotFoundError):
+        LogCache.load_columnar_log(entry_path)
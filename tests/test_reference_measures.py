@@ -0,0 +1,175 @@
+import math # for infinite diameters
+import random # for generating seeded random graphs and markings
+
+import networkx # for enumerating simple paths and building breadth first search trees
+import pytest # for parametrizing the tests
+from pm4py.objects.petri_net.obj import Marking # for marking random Petri nets
+
+from analysis import EventLogHandler # (internal) for converting the example event logs of the paper
+from discovery import DiscoveryAlgorithms, DirectlyFollowsGraph # (internal) for discovering the models to compare
+from logcomplexity import MoreLogComplexity # (internal) for the number of transition paths
+from modelcomplexity import CompiledModel, GraphAlgorithms, ModelComplexity # (internal) for the measures
+from test_cyclicity import paper_event_logs, random_petri_net, random_directly_follows_graph # for the models to compare
+
+# the number of nodes up to which the cross-connectivity of a model is compared to the reference, which enumerates the
+# simple paths between all pairs of nodes and takes seconds for the larger models of the paper
+MAXIMUM_NODES_FOR_REFERENCE_CROSS_CONNECTIVITY = 30
+
+
+def reference_diameter(graph: networkx.DiGraph, sources: list, targets: list):
+    """
+    Finds the longest simple path between any source and any target by enumerating all simple paths, like the
+    diameter did before it searched the paths by branch and bound.
+    :param graph: a directed graph
+    :param sources: the nodes where the paths start
+    :param targets: the nodes where the paths end
+    :return: the number of nodes on the longest simple path, or infinity if there is no path between some source and target
+    """
+    maximum_path_length = -math.inf
+    for source in sources:
+        for target in targets:
+            all_paths = list(networkx.all_simple_paths(graph, source, target))
+            if len(all_paths) == 0:
+                longest_path_length = math.inf
+            else:
+                longest_path_length = len(max(all_paths, key=lambda path: len(path)))
+            maximum_path_length = max(maximum_path_length, longest_path_length)
+    return maximum_path_length
+
+def reference_fill_depths(graph: networkx.DiGraph, roots: list, depths: dict):
+    # the depth is propagated along the breadth first search tree of each root, like before GraphAlgorithms.fill_depths
+    for root in roots:
+        bfs_tree = networkx.bfs_tree(graph, root)
+        queue = [root]
+        while len(queue) > 0:
+            current_node = queue.pop(0)
+            queue += [neighbor for neighbor in bfs_tree[current_node]]
+            parents = [edge[0] for edge in bfs_tree.in_edges(current_node)]
+            if len(parents) != 0:
+                parent = parents[0]
+                if graph.out_degree(parent) > 1 >= graph.in_degree(current_node):
+                    depths[current_node] = max(depths[current_node], depths[parent] + 1)
+                elif graph.in_degree(current_node) > 1 >= graph.out_degree(parent):
+                    depths[current_node] = max(depths[current_node], depths[parent] - 1)
+                else:
+                    depths[current_node] = max(depths[current_node], depths[parent])
+
+def reference_depth(graph: networkx.DiGraph, reversed_graph: networkx.DiGraph, sources: list, targets: list):
+    """
+    Calculates the depth of a model by building the breadth first search trees of the sources and the targets.
+    :param graph: the model as a directed graph
+    :param reversed_graph: the reversed graph, whose order of neighbors decides the trees of the targets
+    :param sources: the nodes where the in-depth is propagated from
+    :param targets: the nodes where the out-depth is propagated from
+    :return: the maximum depth of a node in the model
+    """
+    in_depth = {node: 0 for node in graph.nodes}
+    out_depth = {node: 0 for node in graph.nodes}
+    reference_fill_depths(graph, sources, in_depth)
+    reference_fill_depths(reversed_graph, targets, out_depth)
+    return max(min(in_depth[node], out_depth[node]) for node in graph.nodes)
+
+def measure_pairs(model, initial_marking=None, final_marking=None):
+    """
+    Calculates the cross-connectivity, the diameter and the depth of a model both by the default and by the
+    reference method, where the cross-connectivity is only compared for models with at most
+    MAXIMUM_NODES_FOR_REFERENCE_CROSS_CONNECTIVITY nodes.
+    :param model: a marked Petri net in pm4py-format, or a DirectlyFollowsGraph
+    :param initial_marking: the initial marking of the Petri net
+    :param final_marking: the final marking of the Petri net
+    :return: a dictionary mapping the name of each measure to its default and its reference result
+    """
+    if type(model) == DirectlyFollowsGraph.DirectlyFollowsGraph:
+        pairs = {"diameter": (model.diameter(), reference_diameter(model.graph, [model.start], [model.end])),
+                 "depth": (model.depth(), reference_depth(model.graph, model.graph.reverse(), [model.start], [model.end]))}
+        if len(model.graph.nodes) <= MAXIMUM_NODES_FOR_REFERENCE_CROSS_CONNECTIVITY:
+            pairs["cross-connectivity"] = (model.cross_connectivity(), model.cross_connectivity(reference=True))
+        return pairs
+    compiled = CompiledModel.compile_model(model, initial_marking, final_marking)
+    graph = compiled.graph()
+    # the pm4py-version of the depth built the trees of the final places on the predecessors of each node
+    reversed_graph = graph.reverse(copy=False)
+    pairs = {"diameter": (ModelComplexity.measure_diameter(compiled),
+                          reference_diameter(graph, compiled.initial_nodes, compiled.final_nodes)),
+             "depth": (ModelComplexity.measure_depth(compiled),
+                       reference_depth(graph, reversed_graph, compiled.initial_nodes, compiled.final_nodes))}
+    if compiled.number_of_nodes <= MAXIMUM_NODES_FOR_REFERENCE_CROSS_CONNECTIVITY:
+        pairs["cross-connectivity"] = (ModelComplexity.measure_cross_connectivity(compiled),
+                                       ModelComplexity.measure_cross_connectivity(compiled, reference=True))
+    return pairs
+
+def random_markings(net, seed: int):
+    # the markings may share places and may be unreachable from each other
+    generator = random.Random(seed)
+    places = sorted(net.places, key=lambda place: place.name)
+    initial_marking = Marking({place: 1 for place in generator.sample(places, generator.randint(1, 2))})
+    final_marking = Marking({place: 1 for place in generator.sample(places, generator.randint(1, 2))})
+    return initial_marking, final_marking
+
+def random_graph(seed: int):
+    generator = random.Random(seed)
+    graph = networkx.gnp_random_graph(generator.randint(1, 8), generator.uniform(0.1, 0.5), seed=seed, directed=True)
+    for node in list(graph.nodes):
+        if generator.random() < 0.1:
+            graph.add_edge(node, node)
+    return graph
+
+def reference_number_of_paths(edges, start, end):
+    graph = networkx.DiGraph(list(edges))
+    graph.add_nodes_from([start, end])
+    return len(list(networkx.all_simple_paths(graph, start, end)))
+
+
+@pytest.mark.parametrize("miner", DiscoveryAlgorithms.all_discovery_algorithms, ids=str)
+def test_measures_of_paper_models(miner):
+    for language in paper_event_logs():
+        model, initial_marking, final_marking = miner.discover_for(EventLogHandler.convert_language_to_event_log(language))
+        for measure, (result, reference_result) in measure_pairs(model, initial_marking, final_marking).items():
+            assert result == reference_result, (measure, language)
+
+@pytest.mark.parametrize("seed", range(200))
+def test_measures_of_random_petri_nets(seed):
+    net = random_petri_net(seed)
+    for measure, (result, reference_result) in measure_pairs(net, *random_markings(net, seed)).items():
+        assert result == reference_result, measure
+
+@pytest.mark.parametrize("seed", range(200))
+def test_measures_of_random_directly_follows_graphs(seed):
+    for measure, (result, reference_result) in measure_pairs(random_directly_follows_graph(seed)).items():
+        assert result == reference_result, measure
+
+@pytest.mark.parametrize("seed", range(200))
+def test_longest_simple_paths_of_random_graphs(seed):
+    graph = random_graph(seed)
+    generator = random.Random(seed)
+    # the sources and targets may overlap, and some targets may be unreachable
+    sources = generator.sample(list(graph.nodes), generator.randint(1, min(2, len(graph.nodes))))
+    targets = generator.sample(list(graph.nodes), generator.randint(1, min(2, len(graph.nodes))))
+    assert GraphAlgorithms.longest_simple_path_length(graph, sources, targets) == reference_diameter(graph, sources, targets)
+
+def test_diameter_of_unreachable_and_equal_nodes():
+    graph = networkx.DiGraph([(0, 1), (1, 2), (2, 1)])
+    graph.add_node(3)
+    assert GraphAlgorithms.longest_simple_path_length(graph, [0], [3]) == math.inf
+    assert GraphAlgorithms.longest_simple_path_length(graph, [0], [2, 3]) == math.inf
+    assert GraphAlgorithms.longest_simple_path_length(graph, [1], [1]) == reference_diameter(graph, [1], [1]) == 1
+
+@pytest.mark.parametrize("seed", range(200))
+def test_number_of_transition_paths_of_random_directly_follows_graphs(seed):
+    model = random_directly_follows_graph(seed)
+    edges = list(model.graph.edges)
+    assert MoreLogComplexity.count_transition_paths(edges, model.start, model.end) == reference_number_of_paths(edges, model.start, model.end)
+
+@pytest.mark.parametrize("seed", range(200))
+def test_number_of_simple_paths_of_random_graphs(seed):
+    graph = random_graph(seed)
+    generator = random.Random(seed)
+    # start and end may be equal or unreachable from each other, and the graphs may contain cycles and self-loops
+    start, end = generator.choice(list(graph.nodes)), generator.choice(list(graph.nodes))
+    assert MoreLogComplexity.count_simple_paths(graph.edges, start, end) == reference_number_of_paths(graph.edges, start, end)
+
+def test_number_of_transition_paths_of_paper_logs():
+    for language in paper_event_logs():
+        model = DirectlyFollowsGraph.DirectlyFollowsGraph(EventLogHandler.convert_language_to_event_log(language))
+        edges = list(model.graph.edges)
+        assert MoreLogComplexity.count_transition_paths(edges, model.start, model.end) == reference_number_of_paths(edges, model.start, model.end), language
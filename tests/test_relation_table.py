@@ -0,0 +1,61 @@
+import itertools # for all orders of the observed changes
+
+import pytest # for parametrizing the tests
+
+from analysis import RelationTable # (internal) for the relations between log and model complexity
+
+# the model complexity scores before and after an increase of log complexity, which yield <, = and >
+changes = {"<": (1, 2), "=": (2, 2), ">": (2, 1)}
+
+
+def relation_after(observed_changes):
+    """
+    Builds a relation table with a single entry and observes the passed changes of model complexity in order, each
+    while log complexity increases.
+    :param observed_changes: a sequence of the symbols <, = and >
+    :return: the plain symbol of the entry afterwards
+    """
+    relation_table = RelationTable.RelationTable(["log"], ["model"])
+    for change in observed_changes:
+        previous_model_score, model_score = changes[change]
+        relation_table.update([1], [2], [previous_model_score], [model_score])
+    return relation_table.to_dict()["symbols"][0][0]
+
+
+@pytest.mark.parametrize("observed_changes, expected_symbol", [
+    (["<"], "<"), (["="], "="), ([">"], ">"),
+    (["<", "="], "≤"), (["=", "<"], "≤"), ([">", "="], "≥"), (["=", ">"], "≥"),
+    (["<", ">"], "X"), ([">", "<"], "X"),
+])
+def test_relation_of_changes(observed_changes, expected_symbol):
+    assert relation_after(observed_changes) == expected_symbol
+
+@pytest.mark.parametrize("observed_changes", list(itertools.permutations(["<", "=", ">"])))
+def test_relation_is_independent_of_order(observed_changes):
+    # ≤ and ≥ are not absorbing, so a later change in the opposite direction always leads to X
+    assert relation_after(observed_changes) == "X"
+
+def test_unchanged_log_complexity_is_ignored():
+    relation_table = RelationTable.RelationTable(["log"], ["model"])
+    relation_table.update([2], [2], [1], [2])
+    relation_table.update([2], [1], [2], [1])
+    relation_table.update([None], [2], [2], [1])
+    assert relation_table.to_dict()["symbols"] == [[""]]
+
+@pytest.mark.parametrize("observed_changes", list(itertools.product(changes.keys(), repeat=3)))
+def test_merge_equals_sequential_updates(observed_changes):
+    merged_table = RelationTable.RelationTable(["log"], ["model"])
+    for change in observed_changes:
+        relation_table = RelationTable.RelationTable(["log"], ["model"])
+        previous_model_score, model_score = changes[change]
+        relation_table.update([1], [2], [previous_model_score], [model_score])
+        merged_table.merge(relation_table)
+    assert merged_table.to_dict()["symbols"][0][0] == relation_after(observed_changes)
+
+def test_round_trip_through_dictionary():
+    relation_table = RelationTable.RelationTable(["log 1", "log 2"], ["model 1", "model 2"])
+    relation_table.update([1, 1], [2, 1], [1, 2], [2, 2])
+    relation_table.update([1, 1], [2, 2], [2, 2], [1, 2])
+    restored_table = RelationTable.from_dict(relation_table.to_dict())
+    assert restored_table.to_dict() == relation_table.to_dict()
+    assert restored_table.to_dict()["symbols"] == [["X", "="], [">", "="]]